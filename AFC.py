@@ -1,7 +1,25 @@
 from manim import *
 import numpy as np
 
+from afc_echo import echo_trace
+from afc_ensemble import PhasorEnsemble
+from baked_trackers import TrackerTimeline
+from hole_burning import HoleBurning, comb_metrics, lorentzian_dose
+from live_plot import LivePlot
+from phase_clock import PhaseClock
+
+# Comb burned into a flat line: 7 teeth, spacing Delta = 1, pump swept
+# across the 8 holes between and around them
+COMB_SPACING = 1.0
+COMB_OD = 4.0          # optical depth of the bare line (the plot shows d / COMB_OD)
+PUMP_SPAN = 0.6        # sweep width around every hole centre
+PUMP_STRENGTH = 0.5    # pump dose per sweep step (units of the saturation dose)
+PUMP_CYCLES = 60
+CLOCK_SPEED = 2.0      # clock detuning per unit of plotted frequency (visual speed)
+
 class AFCEchoSideBySide(Scene):
+    bake_trackers = True
+
     def construct(self):
         # ==========================================
         # LAYOUT SETUP
@@ -29,25 +47,48 @@ class AFCEchoSideBySide(Scene):
         
         freq_label = axes_freq.get_axis_labels(x_label="Frequency", y_label="Absorption")
         
-        # 1.2 The Comb Function
+        # 1.2 The Comb: optically pumped into a flat inhomogeneous line
+        burn_freq = np.linspace(-4, 4, 2**13)
+        dose = PUMP_STRENGTH * lorentzian_dose(
+            burn_freq, np.arange(-4, 4) + 0.5, span=PUMP_SPAN, steps=60, linewidth=0.005,
+            period=COMB_SPACING
+        )
+        x_plot = np.linspace(-3.5, 3.5, 701)
+        burn = HoleBurning(burn_freq, line=1.0).run(dose, PUMP_CYCLES, record_freq=x_plot)
+        metrics = comb_metrics(burn_freq, burn.absorption, COMB_SPACING, np.arange(-3, 4))
+
         def comb_func(x):
-            y = 0.1 # Base absorption
-            for i in range(-3, 4): 
-                y += np.exp(-20 * (x - i)**2) 
-            return y
+            return np.interp(x, burn_freq, burn.absorption)
 
-        comb_graph = axes_freq.plot(comb_func, color=BLUE, x_range=[-3.5, 3.5])
+        # Echo response of the burned comb (FFT of its transmission), computed once
+        freq = (np.arange(8192) - 4096) / 256
+        comb = comb_func(freq)
+        echo = echo_trace(freq, COMB_OD * comb, COMB_SPACING, pulse_bandwidth=1.0)
+        efficiencies = echo.efficiencies(orders=3)
+
+        # Carving animation: one recorded frame per pump cycle
+        burn_cycle = ValueTracker(0)
+        timeline = TrackerTimeline(burn_cycle, baked=self.bake_trackers)
+        carve = timeline.animate(burn_cycle, PUMP_CYCLES, run_time=3, rate_func=linear)
+        comb_y = timeline.bake(lambda c: burn.frame(c[:, 0]))
+
+        comb_graph = LivePlot(axes_freq, lambda x: comb_y(), x=x_plot, color=BLUE)
         
         # 1.3 The "Engineered" Indicator
         # We point to the "holes" or the structure to show it's made by humans
-        eng_text = Text("Engineered Structure\n(Laser Carved)", color=YELLOW, font_size=24)
+        eng_text = Text(
+            "Engineered Structure\n(Laser Carved)\n"
+            f"F = {metrics['finesse']:.1f}, background {metrics['background']:.0%}",
+            color=YELLOW, font_size=24
+        )
         eng_text.next_to(comb_graph, UP + RIGHT, buff=1)
         
         eng_arrow = Arrow(start=eng_text.get_bottom(), end=axes_freq.c2p(0.5, 0.2), color=YELLOW)
         
         # ANIMATION: Show the Crystal
         self.play(Create(axes_freq), Write(freq_label))
-        self.play(Create(comb_graph), run_time=2)
+        self.play(Create(comb_graph), run_time=1)
+        self.play(carve)
         self.play(FadeIn(eng_text), GrowArrow(eng_arrow))
         self.wait(2)
         
@@ -72,18 +113,16 @@ class AFCEchoSideBySide(Scene):
         
         clock_label = Text("Atomic Phase Evolution", font_size=24).next_to(circle, UP)
         
-        # 2.2 Create Vectors
-        vectors = VGroup()
-        indices = range(-3, 4) 
-        for i in indices:
-            vec = Arrow(
-                start=circle.get_center(),
-                end=circle.get_top(),
-                buff=0,
-                color=RED_A if i == 0 else RED_B,
-                stroke_width=3
-            )
-            vectors.add(vec)
+        # 2.2 Atom ensemble: 10^5 atoms sampled from the drawn comb; the clock
+        # draws one per tooth plus the collective dipole
+        drawn = np.abs(freq) <= 3.5
+        ensemble = PhasorEnsemble.from_profile(
+            freq[drawn], comb[drawn], n_atoms=100_000, spacing=COMB_SPACING, scale=CLOCK_SPEED
+        )
+        vectors = PhaseClock(
+            ensemble, circle,
+            colors=[RED_A if i == 0 else RED_B for i in ensemble.tooth[ensemble.shown]]
+        )
 
         self.play(Create(circle), Create(center_dot), Write(clock_label))
         
@@ -106,16 +145,7 @@ class AFCEchoSideBySide(Scene):
         t = ValueTracker(0)
         
         def update_vectors(mob):
-            time = t.get_value()
-            for i, vec in zip(indices, mob):
-                # Speed = index * Delta * 2 (multiplier for visual speed)
-                angle = (np.pi / 2) - (i * 2 * time) 
-                new_end = circle.get_center() + np.array([
-                    1.8 * np.cos(angle),
-                    1.8 * np.sin(angle),
-                    0
-                ])
-                vec.put_start_and_end_on(circle.get_center(), new_end)
+            mob.set_time(t.get_value())
 
         vectors.add_updater(update_vectors)
         
@@ -123,7 +153,7 @@ class AFCEchoSideBySide(Scene):
         self.add(status_text)
         
         # Run to 50% (Destructive Interference/Dephasing)
-        target_time = np.pi 
+        target_time = echo.echo_time / CLOCK_SPEED  # 2 pi / Delta in clock time
         self.play(t.animate.set_value(target_time / 2), run_time=3, rate_func=linear)
         
         status_text.become(Text("Signal Lost (Destructive)", color=GRAY, font_size=24).next_to(circle, DOWN))
@@ -140,7 +170,11 @@ class AFCEchoSideBySide(Scene):
         
         # Echo Event
         status_text.become(Text("ECHO!", color=GREEN, font_size=36).next_to(circle, DOWN))
-        self.play(Indicate(vectors, color=GREEN, scale_factor=1.2))
+        efficiency_text = Text(
+            f"Echo efficiency {efficiencies[1]:.0%}  (2nd echo {efficiencies[2]:.1%})",
+            color=GREEN, font_size=20
+        ).next_to(status_text, DOWN, buff=0.15)
+        self.play(Indicate(vectors, color=GREEN, scale_factor=1.2), FadeIn(efficiency_text))
         
         # Photon flies out (Left Side)
         echo_pulse = MathTex(r"\gamma_{echo}").set_color(GREEN).move_to(axes_freq.c2p(0, 0.5))
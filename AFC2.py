@@ -1,6 +1,18 @@
+from pathlib import Path
+
 from manim import *
 import numpy as np
 
+from afc_ensemble import PhasorEnsemble
+from afc_three_level import ThreeLevelAFC
+from phase_clock import PhaseClock
+
+# Sequence in clock time (echo at 2 pi / Delta = pi of time spent in |e>)
+WRITE_AT = 1.0         # write pi-pulse starts
+PI_PULSE = 0.1         # duration of each control pi-pulse
+STORAGE = 1.0          # time in the spin level |s>
+SPIN_WIDTH = 0.6       # inhomogeneous spin linewidth (FWHM)
+
 class AFCThreeLevel(Scene):
     def construct(self):
         # ==========================================
@@ -35,12 +47,34 @@ class AFCThreeLevel(Scene):
         center_dot = Dot(circle.get_center())
         clock_label = Text("Phase Evolution", font_size=24).next_to(circle, UP)
         
-        vectors = VGroup()
-        indices = range(-3, 4)
-        for i in indices:
-            vec = Arrow(start=circle.get_center(), end=circle.get_top(), buff=0, color=RED, stroke_width=3)
-            vectors.add(vec)
-            
+        # 5000 atoms through the full write / store / read sequence, simulated
+        # once; the clock replays one atom per tooth plus the collective dipole
+        ensemble = PhasorEnsemble(n_atoms=5000, spacing=2.0, tooth_width=0.2)
+        afc = ThreeLevelAFC(ensemble.detuning, spin_width=SPIN_WIDTH, pi_pulse=PI_PULSE, shown=ensemble.shown)
+        read_end = WRITE_AT + 2*PI_PULSE + STORAGE
+        trajectory = afc.trajectory(
+            afc.sequence(WRITE_AT, STORAGE, ensemble.echo_time - WRITE_AT + 0.3), samples=1500
+        )
+        echo_time = trajectory.echo_time(after=read_end)
+
+        # Retrieval efficiency vs storage time (cached on disk between renders)
+        storage_times = np.linspace(0, 8, 81)
+        efficiency = afc.retrieval_efficiency(
+            storage_times, WRITE_AT, ensemble.echo_time, cache_dir=Path(config.media_dir) / "afc_cache"
+        )
+        # First drop below 1/e of the initial efficiency (it can rise before it decays),
+        # interpolated between that sample and the one before it
+        threshold = efficiency[0] / np.e
+        below = np.flatnonzero(efficiency < threshold)
+        if len(below):
+            k = below[0]    # >= 1, efficiency[0] is above its own 1/e
+            storage_1e = np.interp(threshold, efficiency[[k, k - 1]], storage_times[[k, k - 1]])
+            storage_1e_text = f"{storage_1e:.1f}"
+        else:
+            storage_1e_text = f"> {storage_times[-1]:g}"
+
+        vectors = PhaseClock(trajectory, circle, colors=RED)
+
         self.play(Create(circle), Create(center_dot), Write(clock_label), FadeIn(vectors))
 
        # ==========================================
@@ -102,34 +136,30 @@ class AFCThreeLevel(Scene):
         # 2. DEPHASING STARTS
         t = ValueTracker(0)
         
-        # Updater for vectors (Standard dephasing)
+        # Updater for vectors: replay the simulated sequence at time t
         def update_vectors(mob):
-            time = t.get_value()
-            for i, vec in zip(indices, mob):
-                angle = (np.pi / 2) - (i * 2 * time) 
-                new_end = circle.get_center() + np.array([1.8 * np.cos(angle), 1.8 * np.sin(angle), 0])
-                vec.put_start_and_end_on(circle.get_center(), new_end)
+            mob.set_time(t.get_value())
         
         vectors.add_updater(update_vectors)
         
         # Run briefly (Phase 1)
-        self.play(t.animate.set_value(1.0), run_time=1.5, rate_func=linear)
+        self.play(t.animate.set_value(WRITE_AT), run_time=1.5, rate_func=linear)
         
         # 3. WRITE PULSE (Control Laser 1)
-        # Stop the updater! (Freeze time)
-        vectors.remove_updater(update_vectors)
-        current_time = t.get_value() # Save where we stopped
-        
         # Visual: Strong Red Pulse connecting |e> and |s>
         control_arrow = DoubleArrow(start=e_pos + DOWN*0.2, end=s_pos + UP*0.2, color=RED, buff=0)
         pulse_text = Text("WRITE PULSE", color=RED, font_size=24).next_to(control_arrow, RIGHT)
         
         self.play(GrowArrow(control_arrow), Write(pulse_text), run_time=0.5)
         
-        # Move population dot to |s> (The Shelf)
-        self.play(pop_dot.animate.move_to(level_s.get_center()), run_time=0.5)
+        # Move population dot to |s> (The Shelf) while the pi-pulse runs
+        self.play(
+            pop_dot.animate.move_to(level_s.get_center()),
+            t.animate.set_value(WRITE_AT + PI_PULSE),
+            run_time=0.5
+        )
         
-        # "Freeze" visual on the clock (Turn vectors Grey to show storage)
+        # Optical dipole is gone: turn vectors Grey to show storage
         self.play(vectors.animate.set_color(GRAY))
         
         # Remove pulse
@@ -141,7 +171,8 @@ class AFCThreeLevel(Scene):
         wait_text = Text("STORING... (Spin Wave)", font_size=36, color=BLUE).move_to(LEFT*4 + UP*0)
         
         self.play(FadeIn(wait_text), Write(lock_text))
-        self.wait(2) 
+        # Only the (slow) spin inhomogeneity acts on the phases now
+        self.play(t.animate.set_value(read_end - PI_PULSE), run_time=2, rate_func=linear)
         self.play(FadeOut(wait_text), FadeOut(lock_text))
 
         
@@ -152,8 +183,12 @@ class AFCThreeLevel(Scene):
         
         self.play(GrowArrow(control_arrow_2), Write(pulse_text_2), run_time=0.5)
         
-        # Move population back to |e>
-        self.play(pop_dot.animate.move_to(level_e.get_center()), run_time=0.5)
+        # Move population back to |e> while the pi-pulse runs
+        self.play(
+            pop_dot.animate.move_to(level_e.get_center()),
+            t.animate.set_value(read_end),
+            run_time=0.5
+        )
         
         # Unfreeze clock (Turn vectors Red again)
         self.play(vectors.animate.set_color(RED))
@@ -162,20 +197,19 @@ class AFCThreeLevel(Scene):
         self.play(FadeOut(control_arrow_2), FadeOut(pulse_text_2))
         
         # 6. REPHASING RESUMES
-        # Re-attach updater, starting from where we left off
-        vectors.add_updater(update_vectors)
-        
-        # Calculate target time for rephasing (Pi)
-        target_time = np.pi
-        
-        # Animate the rest of the way
-        self.play(t.animate.set_value(target_time), run_time=1.5, rate_func=linear)
+        # Animate the rest of the way to the simulated echo
+        self.play(t.animate.set_value(echo_time), run_time=1.5, rate_func=linear)
         
         # 7. ECHO
-        vectors.remove_updater(update_vectors) # Stop at perfect alignment
+        vectors.remove_updater(update_vectors) # Hold the echo for the highlight
         
         echo_text = Text("ECHO ON DEMAND!", color=GREEN, font_size=36).next_to(circle, DOWN)
-        self.play(Indicate(vectors, color=GREEN, scale_factor=1.2), Write(echo_text))
+        efficiency_text = Text(
+            f"Retrieved {np.interp(STORAGE, storage_times, efficiency):.0%}, "
+            f"1/e storage time {storage_1e_text}",
+            color=GREEN, font_size=20
+        ).next_to(echo_text, DOWN, buff=0.15)
+        self.play(Indicate(vectors, color=GREEN, scale_factor=1.2), Write(echo_text), FadeIn(efficiency_text))
         
         # Photon leaves |e> to |g>
         emit_arrow = Arrow(start=e_pos + DOWN*0.2, end=g_pos + UP*0.2, color=GREEN, buff=0)
@@ -0,0 +1,102 @@
+from manim import *
+import numpy as np
+
+from afc_design import comb_designs
+from baked_trackers import TrackerTimeline
+from live_plot import LivePlot
+from text_cache import text_cache
+
+# Design grid: every tooth shape x peak OD x finesse x number of teeth
+PEAK_OD = np.linspace(1, 60, 60)
+FINESSE = np.linspace(1.2, 20, 100)
+N_TEETH = np.arange(3, 601)
+BANDWIDTH = 100.0          # usable comb bandwidth (angular)
+HOMOGENEOUS_WIDTH = 0.002  # optical homogeneous linewidth
+MIN_TOOTH_WIDTH = 0.05     # narrowest tooth the hole burning can carve
+TARGET_MODES = 50
+
+class AFCParetoFront(Scene):
+    bake_trackers = True
+
+    def construct(self):
+        # ==========================================
+        # LAYOUT SETUP
+        # ==========================================
+        title = Text("AFC Design: Efficiency vs Multimode Capacity", font_size=36).to_edge(UP)
+        self.add(title)
+
+        axes = Axes(
+            x_range=[0, 200, 50],
+            y_range=[0, 0.6, 0.1],
+            x_length=9,
+            y_length=5,
+            axis_config={"include_tip": True, "tip_length": 0.2},
+            x_axis_config={"numbers_to_include": [50, 100, 150, 200]},
+            y_axis_config={"numbers_to_include": [0.2, 0.4, 0.6]},
+        ).shift(DOWN*0.5 + LEFT*1)
+        labels = axes.get_axis_labels(x_label="Modes", y_label=r"\eta")
+
+        self.play(Create(axes), Write(labels))
+
+        # ==========================================
+        # DESIGN SPACE (computed once, ~10^7 combs)
+        # ==========================================
+        designs = comb_designs(
+            PEAK_OD, FINESSE, N_TEETH, bandwidth=BANDWIDTH,
+            homogeneous_width=HOMOGENEOUS_WIDTH, min_tooth_width=MIN_TOOTH_WIDTH,
+        )
+        mode_grid = np.linspace(0, 200, 401)
+        fronts = np.maximum(designs.front_by_od(mode_grid), 0)
+        optimum = designs.optimal(TARGET_MODES)
+
+        # Forward-recall ceiling 4 / e^2 (square teeth, d_eff = 2)
+        ceiling = DashedLine(axes.c2p(0, 4 / np.e**2), axes.c2p(200, 4 / np.e**2), color=GRAY)
+        ceiling_label = MathTex(r"4/e^2", font_size=28, color=GRAY).next_to(ceiling, RIGHT, buff=0.1)
+        self.play(Create(ceiling), FadeIn(ceiling_label))
+
+        # ==========================================
+        # PARETO FRONT GROWING WITH THE AVAILABLE OPTICAL DEPTH
+        # ==========================================
+        od_index = ValueTracker(0)
+        timeline = TrackerTimeline(od_index, baked=self.bake_trackers)
+        grow = timeline.animate(od_index, len(PEAK_OD) - 1, run_time=5, rate_func=smooth)
+        front_y = timeline.bake(lambda k: fronts[np.round(k[:, 0]).astype(int)])
+
+        front = LivePlot(axes, lambda x: front_y(), x=mode_grid, color=BLUE, stroke_width=4)
+
+        od_label = always_redraw(lambda: text_cache.math_tex(
+            rf"d \leq {PEAK_OD[int(round(od_index.get_value()))]:.0f}", font_size=32, color=BLUE
+        ).to_corner(UR, buff=1).shift(DOWN*0.8))
+
+        self.play(Create(front), FadeIn(od_label))
+        self.play(grow)
+        od_label.clear_updaters()
+
+        # Beyond the OD ceiling the front is set by the bandwidth: more teeth
+        # means narrower teeth (lower finesse) and longer coherence loss
+        tradeoff = Text(
+            "More modes: narrower spacing,\nlower finesse, longer storage",
+            font_size=22, color=YELLOW
+        ).next_to(axes.c2p(150, 0.3), DOWN)
+        self.play(FadeIn(tradeoff))
+        self.wait(1)
+
+        # ==========================================
+        # OPTIMAL COMB FOR THE TARGET MODE COUNT
+        # ==========================================
+        target = DashedLine(axes.c2p(TARGET_MODES, 0), axes.c2p(TARGET_MODES, 0.6), color=GREEN)
+        best_dot = Dot(axes.c2p(optimum["modes"], optimum["efficiency"]), color=GREEN, radius=0.1)
+        best_text = Text(
+            f"{TARGET_MODES} modes: {optimum['shape']} teeth\n"
+            f"d = {optimum['peak_od']:.0f}, F = {optimum['finesse']:.1f}, "
+            f"N = {optimum['n_teeth']}\n"
+            f"efficiency {optimum['efficiency']:.0%}",
+            font_size=22, color=GREEN
+        ).to_corner(DR, buff=0.5)
+
+        self.play(FadeOut(tradeoff), Create(target))
+        self.play(GrowFromCenter(best_dot), Write(best_text))
+        self.play(Indicate(best_dot, color=GREEN, scale_factor=1.5))
+
+        self.wait(2)
+        text_cache.log_stats()
@@ -1,15 +1,28 @@
 from manim import *
 import numpy as np
 
+from lineshapes import voigt
+from lambda_system import doppler_susceptibility
+from baked_trackers import TrackerTimeline
+from mutable_mobjects import MutableArrow, MutableDot
+from text_cache import text_cache
+
+# Warm vapour: rms Doppler shift of the probe (co-propagating control, so
+# the two-photon resonance, and with it the transparency, stays Doppler-free)
+DOPPLER = 0.4
+
 class EIT_Final_Fixed(Scene):
+    bake_trackers = True
+
     def construct(self):
         # --- SETUP & HELPERS ---
-        def lorentzian(x, center, width, height):
-            return height * (width**2 / ((x - center)**2 + width**2))
-        
-        # EIT Profile for Phase 3
+        # EIT Profile for Phase 3: steady-state Lambda-system absorption,
+        # Autler-Townes peaks at +-Omega_c/2 = +-0.8 with half-width Gamma_31/4 = 0.4,
+        # averaged over the thermal velocity classes
         def eit_profile(x):
-            return lorentzian(x, 2.5 - 0.8, 0.4, 0.6) + lorentzian(x, 2.5 + 0.8, 0.4, 0.6)
+            return 0.6 * np.imag(doppler_susceptibility(
+                x - 2.5, omega_c=1.6, doppler=DOPPLER, gamma_31=1.6, gamma_21=1e-3
+            ))
 
         # --- LAYOUT CONSTANTS ---
         atom_center = LEFT * 3.5
@@ -48,8 +61,8 @@ class EIT_Final_Fixed(Scene):
         x_lbl = Text("Frequency", font_size=16).next_to(axes.x_axis, RIGHT)
         y_lbl = Text("Absorption", font_size=16).next_to(axes.y_axis, UP)
 
-        curve_data_1 = lambda x: lorentzian(x, 2.5, 0.6, 1.0)
-        curve_single = axes.plot(curve_data_1, color=RED)
+        curve_data_1 = lambda x: voigt(x, 2.5, DOPPLER, 0.6, 1.0)
+        curve_single = axes.plot(curve_data_1, color=RED, use_vectorized=True)
 
         # --- ANIMATION PHASE 1 ---
         self.play(Write(title))
@@ -117,7 +130,7 @@ class EIT_Final_Fixed(Scene):
         # ==========================================
 
         title_phase3 = Text("Phase 3: EIT Electromagnetically Induced Transparency", font_size=28, color=GREEN).to_edge(UP)
-        curve_split = axes.plot(eit_profile, color=GREEN)
+        curve_split = axes.plot(eit_profile, color=GREEN, use_vectorized=True)
 
         # --- LABEL CHANGE LOGIC ---
         # Create the new Detuning label at the same position as the old Frequency label
@@ -130,35 +143,47 @@ class EIT_Final_Fixed(Scene):
         # --- DYNAMIC OBJECTS DEFINITION ---
         freq_tracker = ValueTracker(4.0) # Start High
 
-        # Dynamic Arrow
-        dynamic_arrow = always_redraw(lambda: Arrow(
+        # Script the scan up front: High -> Center, then Center -> Low
+        timeline = TrackerTimeline(freq_tracker, baked=self.bake_trackers)
+        scan_to_center = timeline.animate(freq_tracker, 2.5, run_time=4, rate_func=linear)
+        scan_to_low = timeline.animate(freq_tracker, 1.0, run_time=4, rate_func=linear)
+
+        arrow_end = timeline.bake(lambda f: atom_center + UP * (1.5 + (f - 2.5) * energy_scale))
+        dot_point = timeline.bake(lambda f: axes.c2p(f.ravel(), eit_profile(f.ravel())).T)
+        at_resonance = timeline.bake(lambda f: (2.4 <= f) & (f <= 2.6))
+
+        # Dynamic Arrow (built once, endpoints rewritten in place)
+        dynamic_arrow = MutableArrow(
             start=g1_target.get_center(), 
-            end=atom_center + UP * (1.5 + (freq_tracker.get_value() - 2.5) * energy_scale),
+            end=arrow_end(),
             color=RED, 
             buff=0, 
             stroke_width=4,
             max_tip_length_to_length_ratio=0.15
-        ))
+        )
+        dynamic_arrow.add_updater(lambda m: m.set_start_and_end(g1_target.get_center(), arrow_end()))
         
-        # Dynamic Label on Arrow
-        dynamic_lbl = always_redraw(lambda: Text(
+        # Dynamic Label on Arrow (the text never changes, only its position)
+        dynamic_lbl = Text(
             "Scanning...", color=RED, font_size=16
-        ).next_to(dynamic_arrow, LEFT, buff=0.1))
+        ).next_to(dynamic_arrow, LEFT, buff=0.1)
+        dynamic_lbl.add_updater(lambda m: m.next_to(dynamic_arrow, LEFT, buff=0.1))
 
         # Dynamic Dot on Graph
-        dynamic_dot = always_redraw(lambda: Dot(
-            point=axes.c2p(freq_tracker.get_value(), eit_profile(freq_tracker.get_value())),
+        dynamic_dot = MutableDot(
+            point=dot_point(),
             color=YELLOW,
             radius=0.1
-        ))
+        )
+        dynamic_dot.add_updater(lambda m: m.set_point(dot_point()))
 
         # Dynamic Status Text
         def get_status_text():
-            f = freq_tracker.get_value()
-            if 2.4 <= f <= 2.6: return "At Resonance (Transparency!)"
+            if at_resonance()[0]: return "At Resonance (Transparency!)"
             else: return "Scanning..."
         
-        status_text_obj = always_redraw(lambda: Text(
+        # Only two strings ever appear: build each once, copy from the cache per frame
+        status_text_obj = always_redraw(lambda: text_cache.text(
             get_status_text(), font_size=24, color=WHITE
         ).to_edge(DOWN))
 
@@ -181,18 +206,11 @@ class EIT_Final_Fixed(Scene):
         self.add(dynamic_arrow, dynamic_lbl, dynamic_dot, status_text_obj)
         
         # 3. Scan High to Center
-        self.play(
-            freq_tracker.animate.set_value(2.5),
-            run_time=4,
-            rate_func=linear
-        )
+        self.play(scan_to_center)
         self.wait(1.0) # Pause at Delta=0 to show alignment
 
         # 4. Scan Center to Low
-        self.play(
-            freq_tracker.animate.set_value(1.0),
-            run_time=4,
-            rate_func=linear
-        )
+        self.play(scan_to_low)
 
-        self.wait(3)
\ No newline at end of file
+        self.wait(3)
+        text_cache.log_stats()
\ No newline at end of file
@@ -1,32 +1,40 @@
 from manim import *
 import numpy as np
 
+from lambda_system import susceptibility
+from kramers_kronig import dispersion_on_grid
+from baked_trackers import TrackerTimeline
+from live_plot import LivePlot
+from mutable_mobjects import MutableBar, MutableDashedLine
+from slow_light import slow_light
+
 class EITSlopeVariation(Scene):
+    bake_trackers = True
+
     def construct(self):
         # ============================
         # 1. PHYSICS DEFINITIONS
         # ============================
-        def lorentzian_base(x, center, width):
-            return 1 / ((x - center)**2 + width**2)
-
-        def dispersive_base(x, center, width):
-            return -1 * (x - center) / ((x - center)**2 + width**2)
-
         CENTER_FREQ = 3.0  
         GAMMA = 0.3        
         AMP_SCALE = 0.2    
+        OPTICAL_DEPTH = 50.0   # resonant optical depth of the medium (sets the delay)
 
         window_splitter = ValueTracker(2.0)
 
-        def get_current_absorption(x):
-            split_amt = window_splitter.get_value() / 2.0
-            return AMP_SCALE * (lorentzian_base(x, CENTER_FREQ - split_amt, GAMMA) + \
-                                lorentzian_base(x, CENTER_FREQ + split_amt, GAMMA))
+        # Lambda-system steady state: the control Rabi frequency is the splitting
+        # (peaks at +-splitter/2), each dressed line has half-width GAMMA
+        def get_current_absorption(x, splitter):
+            chi = susceptibility(x - CENTER_FREQ, omega_c=splitter, gamma_31=4 * GAMMA, gamma_21=1e-3)
+            return AMP_SCALE / GAMMA**2 * np.imag(chi)
+
+        # Dispersion follows from the absorption via Kramers-Kronig (FFT Hilbert transform)
+        def get_current_dispersion(x, splitter):
+            return dispersion_on_grid(lambda xx: get_current_absorption(xx, splitter), x)
 
-        def get_current_dispersion(x):
-            split_amt = window_splitter.get_value() / 2.0
-            return AMP_SCALE * (dispersive_base(x, CENTER_FREQ - split_amt, GAMMA) + \
-                                dispersive_base(x, CENTER_FREQ + split_amt, GAMMA))
+        # Script the tracker up front so the whole trajectory can be baked
+        timeline = TrackerTimeline(window_splitter, baked=self.bake_trackers)
+        squeeze = timeline.animate(window_splitter, 0.3, run_time=6, rate_func=slow_into)
 
         # ============================
         # 2. AXES SETUP
@@ -65,19 +73,40 @@ class EITSlopeVariation(Scene):
         # ============================
         # 3. DYNAMIC PLOTS
         # ============================
-        graph_abs = always_redraw(lambda: ax_left.plot(
-            get_current_absorption, x_range=[0.1, 5.9], color=GREEN, stroke_width=4
-        ))
+        # (frames x samples) tables, one row looked up per frame
+        x_full = np.linspace(0.1, 5.9, 581)
+
+        abs_y = timeline.bake(lambda s: get_current_absorption(x_full, s))
+        disp_y = timeline.bake(lambda s: get_current_dispersion(x_full, s))
 
-        graph_disp = always_redraw(lambda: ax_right.plot(
-            get_current_dispersion, x_range=[0.1, 5.9], color=BLUE, stroke_width=4
-        ))
+        # Curves keep their point arrays and only get new y-values per frame
+        graph_abs = LivePlot(
+            ax_left, lambda x: abs_y(), x=x_full, color=GREEN, stroke_width=4
+        )
+
+        graph_disp = LivePlot(
+            ax_right, lambda x: disp_y(), x=x_full, color=BLUE, stroke_width=4
+        )
 
-        slope_highlight = always_redraw(lambda: ax_right.plot(
-            get_current_dispersion, 
-            x_range=[CENTER_FREQ - 0.15, CENTER_FREQ + 0.15], 
-            color=RED, stroke_width=8
-        ))
+        # Slow-light numbers per frame, on a fine grid around the window so
+        # even the narrowest transmission window spans many samples:
+        # [slope, group delay, window, transmission width, delay-bandwidth]
+        x_fine = CENTER_FREQ + np.linspace(-3, 3, 6001)
+        light = timeline.bake(lambda s: slow_light(
+            x_fine, susceptibility(x_fine - CENTER_FREQ, omega_c=s, gamma_31=4 * GAMMA, gamma_21=1e-3),
+            optical_depth=OPTICAL_DEPTH, center=CENTER_FREQ,
+        ).table())
+        center_index = int(np.argmin(np.abs(x_full - CENTER_FREQ)))
+
+        # Tangent with the computed slope (plotted units), kept inside the axes
+        def tangent_ends():
+            m = AMP_SCALE / GAMMA**2 * light()[0]
+            y0 = disp_y()[center_index]
+            h = min(0.4, 2.8 / max(abs(m), 1e-9))
+            return (ax_right.c2p(CENTER_FREQ - h, y0 - m * h), ax_right.c2p(CENTER_FREQ + h, y0 + m * h))
+
+        slope_highlight = MutableDashedLine(*tangent_ends(), color=RED, stroke_width=6)
+        slope_highlight.add_updater(lambda m: m.set_start_and_end(*tangent_ends()))
 
         # ============================
         # 4. INDICATORS (FIXED POWER BAR)
@@ -85,15 +114,32 @@ class EITSlopeVariation(Scene):
         power_bar_bg = Rectangle(width=6, height=0.3, color=WHITE, fill_opacity=0.1).to_edge(DOWN, buff=1.5)
         power_label = Text("Control Laser Power (|Ωc|²)", font_size=20).next_to(power_bar_bg, UP)
         
-        # FIXED: We use .move_to(power_bar_bg.get_left()) and .shift(RIGHT * new_width/2)
+        # FIXED: We use .move_to(power_bar_bg.get_left(), aligned_edge=LEFT)
         # This ensures it grows/shrinks from the left edge of the container
-        power_bar_fill = always_redraw(lambda: Rectangle(
-            width=max(0.01, 6 * (window_splitter.get_value() / 2.0)), 
+        power_bar_fill = MutableBar(
+            max_width=6, 
             height=0.3, 
             color=RED, fill_opacity=0.8, stroke_width=0
-        ).move_to(power_bar_bg.get_left(), aligned_edge=LEFT))
+        ).move_to(power_bar_bg.get_left(), aligned_edge=LEFT)
+        power_bar_fill.add_updater(
+            lambda m: m.set_length(max(0.01, 6 * (window_splitter.get_value() / 2.0)))
+        )
 
        
+        # Live slow-light readout (delays in units of 1 / detuning unit)
+        readout_rows = [
+            (r"\tau_g = \tfrac{d}{2}\,\partial_\Delta \chi'", 1, RED),
+            (r"\Delta\omega_{\mathrm{EIT}}", 3, GREEN),
+            (r"\tau_g\,\Delta\omega_{\mathrm{EIT}}", 4, YELLOW),
+        ]
+        readout = VGroup()
+        for tex, column, color in readout_rows:
+            value = DecimalNumber(light()[column], num_decimal_places=2, font_size=28, color=color)
+            value.add_updater(lambda m, c=column: m.set_value(light()[c]))
+            readout.add(VGroup(MathTex(tex, "=", font_size=28, color=color), value).arrange(RIGHT, buff=0.15))
+        readout.arrange(DOWN, aligned_edge=LEFT, buff=0.15).to_corner(DR, buff=0.4)
+        readout_title = Text(f"Slow light (d = {OPTICAL_DEPTH:.0f})", font_size=18).next_to(readout, UP, aligned_edge=LEFT)
+
         mid_arrow = Arrow(start=LEFT, end=RIGHT, color=YELLOW, stroke_width=6).move_to(ORIGIN).shift(UP*0.5)
         kk_label = Text("Kramers-Kronig", font_size=16, color=YELLOW).next_to(mid_arrow, UP)
 
@@ -105,12 +151,9 @@ class EITSlopeVariation(Scene):
         self.add(graph_abs, graph_disp, slope_highlight)
         self.add(power_bar_bg, power_label, power_bar_fill)
         self.add(mid_arrow, kk_label)
+        self.add(readout_title, readout)
 
         self.wait(1)
         # Squeeze the window - Power goes down, slope goes up
-        self.play(
-            window_splitter.animate.set_value(0.3), 
-            run_time=6,
-            rate_func=slow_into
-        )
+        self.play(squeeze)
         self.wait(2)
\ No newline at end of file
@@ -1,27 +1,36 @@
 from manim import *
 import numpy as np
 
+from lambda_system import susceptibility
+from kramers_kronig import dispersion_on_grid
+from slow_light import slow_light
+
 class EIT_Static_Slide(Scene):
     def construct(self):
         # --- 1. DEFINE PHYSICS FUNCTIONS ---
-        def lorentzian(x, center, width, height):
-            return height * (width**2 / ((x - center)**2 + width**2))
-
-        def dispersive_func(x, center, width, height):
-            return -1 * height * 0.5 * (width * (x - center)) / ((x - center)**2 + width**2)
-
         center_freq = 2.5
         split_width = 0.8
         gamma = 0.4
         amp = 1.0
 
+        # Steady-state Lambda system: Omega_c sets the splitting, Gamma_31 the peak width
         def eit_absorption(x):
-            return lorentzian(x, center_freq - split_width, gamma, amp) + \
-                   lorentzian(x, center_freq + split_width, gamma, amp)
+            chi = susceptibility(x - center_freq, omega_c=2 * split_width, gamma_31=4 * gamma, gamma_21=1e-3)
+            return amp * np.imag(chi)
+
+        # Dispersion derived numerically from the absorption (Kramers-Kronig),
+        # sampled once and interpolated for plotting
+        x_samples = np.linspace(0, 5, 1001)
+        dispersion_samples = dispersion_on_grid(eit_absorption, x_samples)
 
         def eit_dispersion(x):
-            return dispersive_func(x, center_freq - split_width, gamma, amp) + \
-                   dispersive_func(x, center_freq + split_width, gamma, amp)
+            return np.interp(x, x_samples, dispersion_samples)
+
+        # Group delay from the slope of that same dispersion curve (d = 50 medium)
+        light = slow_light(
+            x_samples, dispersion_samples + 1j * eit_absorption(x_samples),
+            optical_depth=50, center=center_freq,
+        )
 
         # --- 2. LAYOUT & AXES ---
         
@@ -48,8 +57,8 @@ class EIT_Static_Slide(Scene):
         y_lbl_right = Text("Dispersion", font_size=16).next_to(ax_right.y_axis, UP)
 
         # --- 3. PLOTS ---
-        curve_abs = ax_left.plot(eit_absorption, color=GREEN, stroke_width=4)
-        curve_disp = ax_right.plot(eit_dispersion, color=BLUE, stroke_width=4)
+        curve_abs = ax_left.plot(eit_absorption, color=GREEN, stroke_width=4, use_vectorized=True)
+        curve_disp = ax_right.plot(eit_dispersion, color=BLUE, stroke_width=4, use_vectorized=True)
 
         # --- 4. HIGHLIGHTS & LABELS ---
 
@@ -65,7 +74,8 @@ class EIT_Static_Slide(Scene):
             eit_dispersion, 
             x_range=[2.2, 2.8],
             color=RED, 
-            stroke_width=8
+            stroke_width=8,
+            use_vectorized=True
         )
         
         # FIXED: Vertical Label and Arrow
@@ -119,7 +129,7 @@ class EIT_Static_Slide(Scene):
 
         # Optional: Add a text describing the result (Slow Light) below it
         slow_light_text = Text(
-            "(Slow Light Condition)",
+            f"(Slow Light: group delay {light.group_delay:.1f} at d = 50)",
             color=YELLOW_B,
             font_size=16
         ).next_to(implication_text, DOWN, buff=0.1)
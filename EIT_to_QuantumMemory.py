@@ -1,20 +1,71 @@
 from manim import *
 import numpy as np
 
+from baked_trackers import TrackerTimeline
+from live_plot import LivePlot
+from maxwell_bloch import gaussian_pulse, propagate, ramp_profile
+from mutable_mobjects import MutableBar
+
+# Storage sequence in simulation time (units of 1/gamma): (end of step, control level)
+CONTROL_SCHEDULE = [
+    (10.0, 1.0),   # probe enters under full control
+    (12.0, 0.7),   # slow light
+    (14.0, 0.0),   # storage: control switched off
+    (15.5, 0.0),   # hold
+    (17.5, 1.0),   # retrieval
+    (32.0, 1.0),   # probe leaves
+]
+OMEGA_C = 3.0          # full control Rabi frequency (gamma)
+OPTICAL_DEPTH = 200    # intensity optical depth of the medium
+
 class EITMemoryLambda(Scene):
+    bake_trackers = True
+
     def construct(self):
 
+        # -----------------------------
+        # MAXWELL-BLOCH SIMULATION (run once, streamed per frame)
+        # -----------------------------
+        control_envelope = ramp_profile(CONTROL_SCHEDULE)
+        result = propagate(
+            control=lambda t: OMEGA_C*control_envelope(t),
+            probe_in=gaussian_pulse(6.0, 1.5),
+            t_end=CONTROL_SCHEDULE[-1][0],
+            optical_depth=OPTICAL_DEPTH,
+            z_cells=400,
+            dt=0.02,
+            save_every=2
+        )
+
+        probe_density = np.abs(result.probe)**2      # |E(z,t)|^2, input peak = 1
+        spin_density = np.abs(result.spin)**2
+        spin_density /= spin_density.max()
+        probe_weight = probe_density.sum(axis=1)
+        probe_weight /= probe_weight.max()
+        spin_weight = spin_density.sum(axis=1)
+        spin_weight /= spin_weight.max()
+
         # -----------------------------
         # TRACKERS
         # -----------------------------
-        control = ValueTracker(1.0)      # Control Rabi frequency (normalized)
-        pulse_z = ValueTracker(-4.0)     # Probe pulse position
+        sim_time = ValueTracker(0.0)     # Simulation time (1/gamma)
+
+        # Script the tracker up front (same order as the animation sequence);
+        # time runs linearly, the control ramps are in the schedule itself
+        timeline = TrackerTimeline(sim_time, baked=self.bake_trackers)
+        probe_enters = timeline.animate(sim_time, CONTROL_SCHEDULE[0][0], run_time=3, rate_func=linear)
+        slow_light = timeline.animate(sim_time, CONTROL_SCHEDULE[1][0], run_time=2, rate_func=linear)
+        storage = timeline.animate(sim_time, CONTROL_SCHEDULE[2][0], run_time=2, rate_func=linear)
+        hold = timeline.animate(sim_time, CONTROL_SCHEDULE[3][0], run_time=1.5, rate_func=linear)
+        retrieval = timeline.animate(sim_time, CONTROL_SCHEDULE[4][0], run_time=2, rate_func=linear)
+        probe_leaves = timeline.animate(sim_time, CONTROL_SCHEDULE[5][0], run_time=3, rate_func=linear)
 
-        def photonic_part():
-            return control.get_value()**2
+        def snapshot(t):
+            return result.snapshot_index(t[:, 0])
 
-        def spin_part():
-            return 1 - control.get_value()**2
+        control_level = timeline.bake(lambda t: control_envelope(t))
+        probe_level = timeline.bake(lambda t: probe_weight[snapshot(t)][:, None])
+        spin_level = timeline.bake(lambda t: spin_weight[snapshot(t)][:, None])
 
         # -----------------------------
         # TITLE
@@ -51,34 +102,29 @@ class EITMemoryLambda(Scene):
         # -----------------------------
         # TRANSITIONS
         # -----------------------------
-        probe_arrow = always_redraw(
-            lambda: Arrow(
-                g1.get_center(), e3.get_center(),
-                buff=0.1,
-                color=RED,
-                stroke_width=6
-            ).set_opacity(photonic_part())
-        )
-
-        control_arrow = always_redraw(
-            lambda: Arrow(
-                g2.get_center(), e3.get_center(),
-                buff=0.1,
-                color=BLUE,
-                stroke_width=6
-            ).set_opacity(control.get_value())
-        )
+        # Levels never move, so only the opacities are updated (in place)
+        probe_arrow = Arrow(
+            g1.get_center(), e3.get_center(),
+            buff=0.1,
+            color=RED,
+            stroke_width=6
+        ).add_updater(lambda m: m.set_opacity(probe_level()[0]))
+
+        control_arrow = Arrow(
+            g2.get_center(), e3.get_center(),
+            buff=0.1,
+            color=BLUE,
+            stroke_width=6
+        ).add_updater(lambda m: m.set_opacity(control_level()[0]))
 
         # Ground-state coherence (spin wave)
-        spin_coherence = always_redraw(
-            lambda: DashedLine(
-                g1.get_center(),
-                g2.get_center(),
-                dash_length=0.15,
-                color=GREEN,
-                stroke_width=5
-            ).set_opacity(spin_part())
-        )
+        spin_coherence = DashedLine(
+            g1.get_center(),
+            g2.get_center(),
+            dash_length=0.15,
+            color=GREEN,
+            stroke_width=5
+        ).add_updater(lambda m: m.set_opacity(spin_level()[0]))
 
         self.add(probe_arrow, control_arrow, spin_coherence)
 
@@ -103,23 +149,25 @@ class EITMemoryLambda(Scene):
 
         self.add(axes)
 
-        def gaussian(x, mu):
-            return np.exp(-2*(x - mu)**2)
+        # Medium spans the whole axis: z in [0, 1] -> x in [-5, 5]
+        z_grid = -5 + 10*result.z
+
+        probe_y = timeline.bake(lambda t: probe_density[snapshot(t)])
+        spin_y = timeline.bake(lambda t: spin_density[snapshot(t)])
 
-        probe_wave = always_redraw(
-            lambda: axes.plot(
-                lambda x: photonic_part()*gaussian(x, pulse_z.get_value()),
-                color=RED,
-                stroke_width=4
-            )
+        # Fixed z-grid curves, y-values rewritten in place each frame
+        probe_wave = LivePlot(
+            axes, lambda z: probe_y(),
+            x=z_grid,
+            color=RED,
+            stroke_width=4
         )
 
-        spin_wave = always_redraw(
-            lambda: axes.plot(
-                lambda x: spin_part()*gaussian(x, 0),
-                color=GREEN,
-                stroke_width=4
-            )
+        spin_wave = LivePlot(
+            axes, lambda z: spin_y(),
+            x=z_grid,
+            color=GREEN,
+            stroke_width=4
         )
 
         self.add(probe_wave, spin_wave)
@@ -141,15 +189,16 @@ class EITMemoryLambda(Scene):
         # -----------------------------
         # CONTROL INDICATOR
         # -----------------------------
-        control_bar = always_redraw(
-            lambda: Rectangle(
-                width=2.5*control.get_value(),
-                height=0.25,
-                fill_color=BLUE,
-                fill_opacity=0.8,
-                stroke_width=0
-            ).to_corner(UR).shift(DOWN*0.8 + LEFT*0.3)
-        )
+        # Right edge stays pinned at the corner, length follows the control field
+        control_bar = MutableBar(
+            max_width=2.5,
+            height=0.25,
+            edge=RIGHT,
+            fill_color=BLUE,
+            fill_opacity=0.8,
+            stroke_width=0
+        ).to_corner(UR).shift(DOWN*0.8 + LEFT*0.3)
+        control_bar.add_updater(lambda m: m.set_fraction(control_level()[0]))
 
         self.add(
             control_bar,
@@ -162,23 +211,13 @@ class EITMemoryLambda(Scene):
         # ======================================================
 
         # Probe enters
-        self.play(
-            pulse_z.animate.set_value(0),
-            run_time=3,
-            rate_func=linear
-        )
+        self.play(probe_enters)
 
         # Slow-light regime (50/50 polariton)
-        self.play(
-            control.animate.set_value(0.7),
-            run_time=2
-        )
+        self.play(slow_light)
 
         # Storage (mapping to spin wave)
-        self.play(
-            control.animate.set_value(0.0),
-            run_time=2
-        )
+        self.play(storage)
 
         store_text = Text(
             "Probe photon mapped to ground-state coherence",
@@ -187,19 +226,19 @@ class EITMemoryLambda(Scene):
         ).to_edge(DOWN)
 
         self.play(FadeIn(store_text))
-        self.wait(1.5)
+        self.play(hold)
         self.play(FadeOut(store_text))
 
         # Retrieval
-        self.play(
-            control.animate.set_value(1.0),
-            run_time=2
-        )
+        self.play(retrieval)
 
-        self.play(
-            pulse_z.animate.set_value(4),
-            run_time=3,
-            rate_func=linear
-        )
+        self.play(probe_leaves)
+
+        efficiency_text = Text(
+            f"Retrieval efficiency: {result.efficiency():.0%}",
+            font_size=24,
+            color=RED
+        ).to_edge(DOWN)
+        self.play(FadeIn(efficiency_text))
 
         self.wait()
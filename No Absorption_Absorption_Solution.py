@@ -1,4 +1,43 @@
 from manim import *
+import numpy as np
+
+from baked_trackers import TrackerTimeline
+from lambda_system import susceptibility
+from live_plot import LivePlot
+from maxwell_bloch import gaussian_pulse
+from pulse_propagation import medium_profile, propagate_pulse
+
+# Shared pulse simulation: scene x is the propagation axis z and the crystal
+# spans [-2.5, 2.5]. Time in units of 1/Gamma (optical decay), so the
+# photon's motion, slowdown and loss all come from the computed envelope.
+Z_GRID = np.linspace(-7, 7, 701)
+T_GRID = np.linspace(0, 60, 4096)
+PULSE_WIDTH = 1.0      # rms duration (intensity)
+PULSE_START = 7.0      # input peak time: E(t = 0) ~ 5e-6, so the FFT window has no edge step
+LIGHT_SPEED = 2.5      # scene units per 1/Gamma
+SCENE_TIME = 0.4       # scene seconds per 1/Gamma
+CRYSTAL = medium_profile(Z_GRID, -2.5, 2.5, edge=0.2)
+
+def simulate_pulse(chi=None, optical_depth=0.0):
+    probe_in = gaussian_pulse(PULSE_START * PULSE_WIDTH, PULSE_WIDTH)
+    return propagate_pulse(chi, Z_GRID, T_GRID, probe_in, optical_depth, CRYSTAL, c=LIGHT_SPEED)
+
+def photon_mobjects(result, timeline):
+    """Dot riding the pulse maximum (opacity = |E|) and the |E| envelope along the beam."""
+    position, amplitude = result.peak()
+    envelope = 0.8 * np.abs(result.envelope)
+    frame = lambda s: np.clip(np.searchsorted(result.t, s[:, 0]), 0, len(result.t) - 1)
+    peak = timeline.bake(lambda s: np.stack([position[frame(s)], amplitude[frame(s)]], axis=-1))
+    profile = timeline.bake(lambda s: envelope[frame(s)])
+
+    # Never shown: only maps z (and envelope height) onto the screen
+    beam = Axes(x_range=[-7, 7, 1], y_range=[0, 1, 1], x_length=14, y_length=1)
+    beam.shift(-beam.c2p(0, 0))
+
+    photon = Dot(color=YELLOW, radius=0.15)
+    photon.add_updater(lambda m: m.move_to(beam.c2p(peak()[0], 0)).set_opacity(min(1, peak()[1])))
+    wave = LivePlot(beam, lambda x: profile(), x=result.z, color=YELLOW, stroke_width=2, stroke_opacity=0.6)
+    return photon, wave
 
 class Part1_Transparency(Scene):
     def construct(self):
@@ -8,20 +47,20 @@ class Part1_Transparency(Scene):
         title = Text("No Interaction Case", font_size=36).next_to(crystal,UP*2)
         label_od = Text("Glass (OD ≈ 0)", font_size=24, color=WHITE).next_to(crystal, DOWN)
         
-        # The Photon
-        photon = Dot(color=YELLOW, radius=0.15)
-        photon.move_to(LEFT * 6) # Start off-screen left
+        # The Photon: vacuum propagation of the pulse
+        result = simulate_pulse()
+        sim_time = ValueTracker(result.arrival(-6))
+        timeline = TrackerTimeline(sim_time)
+        t_end = result.arrival(6)
+        fly = timeline.animate(sim_time, t_end, run_time=SCENE_TIME * (t_end - sim_time.get_value()), rate_func=linear)
+        photon, wave = photon_mobjects(result, timeline)
 
         # Add static elements
-        self.add(title, crystal, label_od)
+        self.add(title, crystal, label_od, wave, photon)
 
         # 2. ANIMATION
         # Photon flies straight through without slowing down
-        self.play(
-            photon.animate.move_to(RIGHT * 6),
-            run_time=2,
-            rate_func=linear
-        )
+        self.play(fly)
         self.wait(0.5)
 
 from manim import *
@@ -33,26 +72,33 @@ class Part2_Absorption(Scene):
         title = Text("Resonant Absorption Case", font_size=36, color=WHITE).next_to(crystal,UP*2)
         label_od = MathTex(r"\text{Resonant Medium } (OD \gg 1)", color=WHITE, font_size=28).next_to(crystal, DOWN)
         
-        # The Photon
-        photon = Dot(color=YELLOW, radius=0.15).move_to(LEFT * 6)
+        # The Photon: resonant two-level medium (line wider than the pulse), intensity OD 8
+        result = simulate_pulse(lambda w: susceptibility(w, omega_c=0.0, gamma_31=4.0), optical_depth=8.0)
+        sim_time = ValueTracker(result.arrival(-6))
+        timeline = TrackerTimeline(sim_time)
+        # Until what is left of the pulse has dropped to 3% amplitude
+        _, amplitude = result.peak()
+        t_end = result.t[np.argmax((result.t > result.arrival(-2.5)) & (amplitude < 0.03))]
+        absorb = timeline.animate(sim_time, t_end, run_time=SCENE_TIME * (t_end - sim_time.get_value()), rate_func=linear)
+        photon, wave = photon_mobjects(result, timeline)
 
-        self.add(title, crystal, label_od)
+        self.add(title, crystal, label_od, wave, photon)
 
         # 2. ANIMATION
-        # Move to center
-        self.play(
-            photon.animate.move_to(crystal.get_center()),
-            run_time=1.0,
-            rate_func=linear
-        )
+        # Fly in; the envelope decays exp(-OD z / 2), so it dies near the entrance face
+        self.play(absorb)
         
         # 3. THE "DEATH" OF THE PHOTON
         # Flash effect to show energy loss
-        flash = Flash(crystal.get_center(), color=RED, line_length=0.5, num_lines=12)
-        loss_text = Text("Absorption Loss", font_size=30, color=RED).next_to(crystal, RIGHT)
+        photon.clear_updaters()
+        flash = Flash(photon.get_center(), color=RED, line_length=0.5, num_lines=12)
+        loss_text = Text(
+            f"Absorption Loss\n({1 - result.transmission():.0%})", font_size=30, color=RED
+        ).next_to(crystal, RIGHT)
 
         self.play(
             FadeOut(photon),      # Photon disappears
+            FadeOut(wave),
             flash,                # Explosion effect
             crystal.animate.set_fill(RED, opacity=0.6), # Crystal flashes bright red
             Write(loss_text),
@@ -73,34 +119,40 @@ class Part3_Solution(Scene):
         title = Text("Solution(s) (EIT / AFC)", font_size=36, color=WHITE).next_to(crystal, UP*2)
         label_od = MathTex(r"\chi(\omega) \text{ Engineered}", color=WHITE, font_size=28).next_to(crystal, DOWN)
         
-        # The Photon
-        photon = Dot(color=YELLOW, radius=0.15).move_to(LEFT * 6)
+        # The Photon: EIT medium (intensity OD 150, Omega_c = 6 Gamma)
+        result = simulate_pulse(
+            lambda w: susceptibility(w, omega_c=6.0, gamma_21=1e-3), optical_depth=150.0
+        )
+        sim_time = ValueTracker(result.arrival(-6))
+        timeline = TrackerTimeline(sim_time)
+        t_edge, t_center = result.arrival(-2.5), result.arrival(0)
+        enter = timeline.animate(sim_time, t_edge, run_time=SCENE_TIME * (t_edge - sim_time.get_value()), rate_func=linear)
+        slow = timeline.animate(sim_time, t_center, run_time=SCENE_TIME * (t_center - t_edge), rate_func=linear)
+        photon, wave = photon_mobjects(result, timeline)
+
+        # Group velocity from the simulated transit of the half crystal
+        slowdown = (t_center - t_edge) / (2.5 / LIGHT_SPEED)
+        slow_text = MathTex(rf"v_g \approx c / {slowdown:.1f}", color=YELLOW, font_size=28).next_to(label_od, DOWN)
         
-        self.add(title, crystal, label_od)
+        self.add(title, crystal, label_od, wave, photon)
 
         # 2. ANIMATION: ENTERING
-        # Move to the edge of the crystal fast
-        self.play(
-            photon.animate.move_to(crystal.get_left()),
-            run_time=0.5,
-            rate_func=linear
-        )
+        # Move to the edge of the crystal at c
+        self.play(enter)
         
         # 3. ANIMATION: SLOW LIGHT EFFECT
-        # Move to center SLOWLY (showing massive dispersion/group velocity reduction)
-        self.play(
-            photon.animate.move_to(crystal.get_center()),
-            run_time=2.0,
-            rate_func=rush_into # Decelerates as it enters
-        )
+        # Same linear clock: the pulse itself slows down (and compresses) inside
+        self.play(slow, FadeIn(slow_text))
         
         # 4. MAPPING TO SPIN WAVE
         # Create the stored state representation (a glowing ring)
+        photon.clear_updaters()
         spin_wave = Circle(radius=0.4, color=BLUE_E, fill_opacity=0.5).move_to(crystal.get_center())
         text_stored = Text("Coherent Mapping", font_size=30, color=BLUE).next_to(crystal, RIGHT)
         
         self.play(
             Transform(photon, spin_wave),  # Photon morphs into matter
+            FadeOut(wave),
             Write(text_stored),
             crystal.animate.set_fill(BLUE, opacity=0.4), # Crystal glows slightly to show storage
             run_time=1.0
@@ -112,4 +164,4 @@ class Part3_Solution(Scene):
             rate_func=there_and_back,
             run_time=1.0
         )
-        self.wait(1)
\ No newline at end of file
+        self.wait(1)
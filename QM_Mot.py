@@ -1,4 +1,18 @@
 from manim import *
+import numpy as np
+
+from link_sampling import attempt_sequence, link_probability, waiting_times
+from multimode_links import multimode_throughput, simulate_multimode
+from repeater_events import RepeaterChain
+from text_cache import text_cache
+
+# Both links: 20 km segments, p = eta exp(-L / L_att) ~ 0.40 per attempt
+LINK_P = link_probability([20.0, 20.0], attenuation_length=22.0, efficiency=1.0)
+SEED = 37              # sampled runs short enough to animate
+STATS_TRIALS = 1_000_000
+COHERENCE_TIME = 1e-3  # memory T2 (s): Link 1 does not wait for free
+MODE_GRID = 8          # multiplexed scene: 8 x 8 = 64 modes per memory
+MODE_ROUNDS = 6
 
 # ============================================
 
@@ -56,15 +70,10 @@ class QR_Without_Memory(Scene):
         attempt_group = VGroup(attempt_text, attempt_num)
         self.play(Write(attempt_group))
         
-        # --- Define success/failure patterns ---
-        # Format: (link1_success, link2_success)
-        attempts = [
-            (True, False),   # Attempt 1: Link 1 succeeds, Link 2 fails
-            (False, True),   # Attempt 2: Link 1 fails, Link 2 succeeds
-            (False, False),  # Attempt 3: Both fail
-            (True, False),   # Attempt 4: Link 1 succeeds, Link 2 fails
-            (True, True),    # Attempt 5: Both succeed!
-        ]
+        # --- Sampled success/failure pattern ---
+        # Format: (link1_success, link2_success), until both succeed together
+        attempts = attempt_sequence(LINK_P, protocol="memoryless", seed=SEED)
+        mean_wait = waiting_times(LINK_P, STATS_TRIALS, protocol="memoryless", seed=SEED).mean
         
         status_text = None
         
@@ -81,9 +90,9 @@ class QR_Without_Memory(Scene):
             rb_flash = Line(RIGHT * 0.6, RIGHT * 3.4, color=rb_color, stroke_width=8)
             
             # Show link results
-            ar_result = Text("✓" if ar_success else "✗", font_size=28, color=ar_color)
+            ar_result = text_cache.text("✓" if ar_success else "✗", font_size=28, color=ar_color)
             ar_result.next_to(link_ar, DOWN, buff=0.1)
-            rb_result = Text("✓" if rb_success else "✗", font_size=28, color=rb_color)
+            rb_result = text_cache.text("✓" if rb_success else "✗", font_size=28, color=rb_color)
             rb_result.next_to(link_rb, DOWN, buff=0.1)
             
             self.play(
@@ -114,12 +123,16 @@ class QR_Without_Memory(Scene):
                 )
                 final_label = Text("A-B Entangled!", font_size=24, color=PURPLE)
                 final_label.next_to(final_link, UP, buff=0.3)
+                mean_text = Text(
+                    f"Average over {STATS_TRIALS:,} runs: {mean_wait:.1f} attempts", font_size=20, color=GRAY
+                ).to_corner(DR, buff=0.5)
                 
                 self.play(
                     FadeOut(ar_flash), FadeOut(rb_flash),
                     FadeOut(ar_result), FadeOut(rb_result),
                     Create(final_link),
                     Write(final_label),
+                    FadeIn(mean_text),
                     run_time=1
                 )
                 break
@@ -128,7 +141,7 @@ class QR_Without_Memory(Scene):
                 if status_text:
                     self.play(FadeOut(status_text), run_time=0.2)
                 
-                status_text = Text("✗ Retry!", font_size=36, color=RED)
+                status_text = text_cache.text("✗ Retry!", font_size=36, color=RED)
                 status_text.to_edge(DOWN, buff=0.8)
                 self.play(Write(status_text), run_time=0.3)
                 
@@ -142,6 +155,7 @@ class QR_Without_Memory(Scene):
                 )
         
         self.wait(2)
+        text_cache.log_stats()
 
 
 # ============================================
@@ -204,25 +218,33 @@ class QR_With_Memory(Scene):
         self.play(Write(advantage))
         self.wait(0.5)
         
+        # --- Sampled attempts: each link retries on its own until it succeeds ---
+        link1_attempts, link2_attempts = attempt_sequence(LINK_P, protocol="memory", seed=SEED)
+        mean_wait = waiting_times(LINK_P, STATS_TRIALS, protocol="memory", seed=SEED).mean
+        stored = RepeaterChain(2, 20.0, coherence_time=COHERENCE_TIME).run(20_000, seed=SEED)
+
         # --- Phase 1: Establish Link 1 (A-R) ---
         phase1_text = Text("Step 1: Establish Link 1", font_size=22, color=WHITE)
         phase1_text.to_corner(DL, buff=0.5)
         self.play(Write(phase1_text))
         
-        # Attempt Link 1 - fail first
-        ar_flash_fail = Line(LEFT * 3.4, LEFT * 0.6, color=RED, stroke_width=8)
-        ar_result_fail = Text("✗", font_size=28, color=RED).next_to(link_ar, DOWN, buff=0.1)
-        
-        self.play(Create(ar_flash_fail), FadeIn(ar_result_fail), run_time=0.5)
-        
-        retry1_text = Text("Retry...", font_size=24, color=RED).to_edge(DOWN, buff=0.8)
-        self.play(Write(retry1_text), run_time=0.3)
-        self.wait(0.3)
-        self.play(FadeOut(ar_flash_fail), FadeOut(ar_result_fail), FadeOut(retry1_text), run_time=0.3)
+        # Attempt Link 1 until it succeeds
+        for ar_success in link1_attempts:
+            if ar_success:
+                break
+            ar_flash_fail = Line(LEFT * 3.4, LEFT * 0.6, color=RED, stroke_width=8)
+            ar_result_fail = text_cache.text("✗", font_size=28, color=RED).next_to(link_ar, DOWN, buff=0.1)
+            
+            self.play(Create(ar_flash_fail), FadeIn(ar_result_fail), run_time=0.5)
+            
+            retry1_text = text_cache.text("Retry...", font_size=24, color=RED).to_edge(DOWN, buff=0.8)
+            self.play(Write(retry1_text), run_time=0.3)
+            self.wait(0.3)
+            self.play(FadeOut(ar_flash_fail), FadeOut(ar_result_fail), FadeOut(retry1_text), run_time=0.3)
         
-        # Attempt Link 1 - succeed
+        # Link 1 succeeds
         ar_flash_success = Line(LEFT * 3.4, LEFT * 0.6, color=GREEN, stroke_width=8)
-        ar_result_success = Text("✓", font_size=28, color=GREEN).next_to(link_ar, DOWN, buff=0.1)
+        ar_result_success = text_cache.text("✓", font_size=28, color=GREEN).next_to(link_ar, DOWN, buff=0.1)
         
         self.play(Create(ar_flash_success), FadeIn(ar_result_success), run_time=0.5)
         
@@ -250,38 +272,35 @@ class QR_With_Memory(Scene):
         phase2_text.to_corner(DL, buff=0.5)
         self.play(Write(phase2_text))
         
-        # Attempt Link 2 - fail first
-        rb_flash_fail = Line(RIGHT * 0.6, RIGHT * 3.4, color=RED, stroke_width=8)
-        rb_result_fail = Text("✗", font_size=28, color=RED).next_to(link_rb, DOWN, buff=0.1)
-        
-        self.play(Create(rb_flash_fail), FadeIn(rb_result_fail), run_time=0.5)
-        
-        # Key point: Link 1 still stored!
-        retry2_text = Text("Retry... (Link 1 still stored!)", font_size=24, color=YELLOW).to_edge(DOWN, buff=0.8)
-        
-        # Pulse memory to show it's still holding
-        self.play(
-            Write(retry2_text),
-            memory_box.animate.set_stroke(width=4),
-            run_time=0.4
-        )
-        self.play(memory_box.animate.set_stroke(width=2), run_time=0.2)
-        
-        self.play(FadeOut(rb_flash_fail), FadeOut(rb_result_fail), FadeOut(retry2_text), run_time=0.3)
-        
-        # Attempt Link 2 - fail again
-        rb_flash_fail2 = Line(RIGHT * 0.6, RIGHT * 3.4, color=RED, stroke_width=8)
-        rb_result_fail2 = Text("✗", font_size=28, color=RED).next_to(link_rb, DOWN, buff=0.1)
-        
-        self.play(Create(rb_flash_fail2), FadeIn(rb_result_fail2), run_time=0.5)
-        
-        retry3_text = Text("Retry...", font_size=24, color=RED).to_edge(DOWN, buff=0.8)
-        self.play(Write(retry3_text), run_time=0.3)
-        self.play(FadeOut(rb_flash_fail2), FadeOut(rb_result_fail2), FadeOut(retry3_text), run_time=0.3)
+        # Attempt Link 2 until it succeeds
+        for k, rb_success in enumerate(link2_attempts):
+            if rb_success:
+                break
+            rb_flash_fail = Line(RIGHT * 0.6, RIGHT * 3.4, color=RED, stroke_width=8)
+            rb_result_fail = text_cache.text("✗", font_size=28, color=RED).next_to(link_rb, DOWN, buff=0.1)
+            
+            self.play(Create(rb_flash_fail), FadeIn(rb_result_fail), run_time=0.5)
+            
+            if k == 0:
+                # Key point: Link 1 still stored!
+                retry2_text = Text("Retry... (Link 1 still stored!)", font_size=24, color=YELLOW).to_edge(DOWN, buff=0.8)
+                
+                # Pulse memory to show it's still holding
+                self.play(
+                    Write(retry2_text),
+                    memory_box.animate.set_stroke(width=4),
+                    run_time=0.4
+                )
+                self.play(memory_box.animate.set_stroke(width=2), run_time=0.2)
+            else:
+                retry2_text = text_cache.text("Retry...", font_size=24, color=RED).to_edge(DOWN, buff=0.8)
+                self.play(Write(retry2_text), run_time=0.3)
+            
+            self.play(FadeOut(rb_flash_fail), FadeOut(rb_result_fail), FadeOut(retry2_text), run_time=0.3)
         
-        # Attempt Link 2 - succeed!
+        # Link 2 succeeds!
         rb_flash_success = Line(RIGHT * 0.6, RIGHT * 3.4, color=GREEN, stroke_width=8)
-        rb_result_success = Text("✓", font_size=28, color=GREEN).next_to(link_rb, DOWN, buff=0.1)
+        rb_result_success = text_cache.text("✓", font_size=28, color=GREEN).next_to(link_rb, DOWN, buff=0.1)
         
         self.play(Create(rb_flash_success), FadeIn(rb_result_success), run_time=0.5)
         
@@ -325,13 +344,138 @@ class QR_With_Memory(Scene):
         final_label.next_to(final_link, UP, buff=0.3)
         
         success_final = Text("✓ Success!", font_size=36, color=GREEN).to_edge(DOWN, buff=0.8)
+        mean_text = VGroup(
+            Text(f"Average over {STATS_TRIALS:,} runs: {mean_wait:.1f} attempts", font_size=20, color=GRAY),
+            Text(
+                f"Memory T2 = {COHERENCE_TIME * 1e3:g} ms: {stored.rate:,.0f} pairs/s, "
+                f"fidelity {stored.mean_fidelity:.2f}",
+                font_size=20, color=GRAY
+            ),
+        ).arrange(DOWN, aligned_edge=RIGHT, buff=0.1).to_corner(DR, buff=0.5)
         
         self.play(
             Create(final_link),
             Write(final_label),
             Write(success_final),
             FadeOut(phase3_text),
+            FadeIn(mean_text),
             run_time=1
         )
         
-        self.wait(2)
\ No newline at end of file
+        self.wait(2)
+        text_cache.log_stats()
+
+
+# ============================================
+
+# SCENE 3: Quantum Repeater WITH Multimode (Multiplexed) Memory
+
+# ============================================
+
+class QR_Multiplexed(Scene):
+    def construct(self):
+        # --- Title ---
+        title = Text("Quantum Repeater: Multiplexed Memory", font_size=32, color=GREEN)
+        title.to_edge(UP, buff=0.5)
+        self.play(Write(title))
+        
+        # --- Setup: 3 Nodes ---
+        node_a = VGroup(
+            Circle(radius=0.4, color=BLUE, fill_opacity=0.3),
+            Text("A", font_size=24)
+        ).move_to(LEFT * 5 + UP * 1.5)
+        
+        node_r = VGroup(
+            Circle(radius=0.4, color=GREEN, fill_opacity=0.3),
+            Text("R", font_size=24)
+        ).move_to(UP * 1.5)
+        
+        node_b = VGroup(
+            Circle(radius=0.4, color=BLUE, fill_opacity=0.3),
+            Text("B", font_size=24)
+        ).move_to(RIGHT * 5 + UP * 1.5)
+        
+        link_ar = Line(node_a.get_right(), node_r.get_left(), color=GRAY, stroke_width=4)
+        link_rb = Line(node_r.get_right(), node_b.get_left(), color=GRAY, stroke_width=4)
+        
+        # One mode grid per memory side: left holds Link 1 modes, right Link 2 modes
+        n_modes = MODE_GRID ** 2
+        
+        def mode_grid():
+            return VGroup(*[
+                Square(side_length=0.16, color=YELLOW, stroke_width=1, fill_opacity=0)
+                for _ in range(n_modes)
+            ]).arrange_in_grid(MODE_GRID, MODE_GRID, buff=0.04)
+        
+        grids = VGroup(mode_grid(), mode_grid()).arrange(RIGHT, buff=0.3).next_to(node_r, DOWN, buff=0.3)
+        grid_labels = VGroup(
+            Text("Link 1 modes", font_size=14, color=YELLOW).next_to(grids[0], DOWN, buff=0.1),
+            Text("Link 2 modes", font_size=14, color=YELLOW).next_to(grids[1], DOWN, buff=0.1),
+        )
+        
+        self.play(
+            FadeIn(node_a), FadeIn(node_r), FadeIn(node_b),
+            Create(link_ar), Create(link_rb),
+            FadeIn(grids), Write(grid_labels)
+        )
+        
+        # --- Sampled rounds: herald, then swap matched modes ---
+        run = simulate_multimode(n_modes, LINK_P[0], rounds=MODE_ROUNDS, runs=1, seed=SEED, record=True)
+        
+        round_text = Text("Round: ", font_size=22).to_corner(DL, buff=0.5)
+        round_num = Integer(1, font_size=22).next_to(round_text, RIGHT)
+        pairs_text = Text("A-B pairs: ", font_size=22).next_to(round_text, UP, aligned_edge=LEFT)
+        pairs_num = Integer(0, font_size=22, color=PURPLE).next_to(pairs_text, RIGHT)
+        self.play(Write(VGroup(round_text, round_num, pairs_text, pairs_num)))
+        
+        total = 0
+        for r in range(MODE_ROUNDS):
+            if r > 0:
+                self.play(round_num.animate.set_value(r + 1), run_time=0.2)
+            
+            # Heralded modes light up
+            self.play(*[
+                square.animate.set_fill(GREEN, opacity=0.8 if held else 0)
+                for grid, row in zip(grids, run.held[r])
+                for square, held in zip(grid, row)
+            ], run_time=0.4)
+            
+            # Matched modes are swapped and freed
+            swapped = [
+                square for grid, row in zip(grids, run.swapped[r])
+                for square, used in zip(grid, row) if used
+            ]
+            total += int(run.delivered[0, r])
+            self.play(*[square.animate.set_fill(PURPLE, opacity=1) for square in swapped], run_time=0.3)
+            self.play(
+                *[square.animate.set_fill(opacity=0) for square in swapped],
+                pairs_num.animate.set_value(total),
+                run_time=0.3
+            )
+        
+        # --- Throughput vs number of modes ---
+        modes = np.array([1, 10, 100, 1000, 10000])
+        throughput = multimode_throughput(modes, LINK_P[0], rounds=200, runs=8, seed=SEED)
+        
+        axes = Axes(
+            x_range=[0, 4, 1], y_range=[-1, 4, 1],
+            x_length=3.5, y_length=2.2,
+            axis_config={"color": WHITE, "include_numbers": False},
+            tips=False
+        ).to_corner(DR, buff=0.6)
+        x_label = MathTex(r"\log_{10} M", font_size=20).next_to(axes.x_axis, DOWN, buff=0.1)
+        y_label = Text("log10 pairs / round", font_size=14).next_to(axes.y_axis, UP, buff=0.1)
+        points = [axes.c2p(x, y) for x, y in zip(np.log10(modes), np.log10(throughput))]
+        curve = VMobject(color=GREEN).set_points_as_corners(points)
+        dots = VGroup(*[Dot(p, radius=0.05, color=GREEN) for p in points])
+        
+        self.play(Create(axes), Write(x_label), Write(y_label))
+        self.play(Create(curve), FadeIn(dots), run_time=1.5)
+        
+        summary = Text(
+            f"{modes[-1]:,} modes: {throughput[-1]:,.0f} pairs per round vs {throughput[0]:.2f}",
+            font_size=18, color=GRAY
+        ).next_to(axes, UP, buff=0.3)
+        self.play(Write(summary))
+        
+        self.wait(2)
@@ -1,4 +1,19 @@
 from manim import *
+import numpy as np
+
+from repeater_design import repeater_designs
+from repeater_waiting import effective_transmission
+
+# Exact 1 / E[T] per elementary attempt: direct (n = 0) vs one repeater with memory (n = 1)
+DISTANCE = np.linspace(0, 1000, 201)
+LOG_DIRECT = np.log10(effective_transmission(DISTANCE, 0))
+LOG_REPEATER = np.log10(effective_transmission(DISTANCE, 1, memory=True))
+
+# Best 1000 km design with realistic memories and at most 2000 memory modes in total
+BEST = repeater_designs(
+    1000, levels=np.arange(9), memory_efficiency=[0.5, 0.7, 0.9],
+    coherence_time=[1e-3, 1e-2, 1e-1], modes=np.unique(np.logspace(0, 3, 31).astype(int)),
+).optimal(max_memory_modes=2000)
 
 class QuantumRepeaterSync(Scene):
     def construct(self):
@@ -41,11 +56,11 @@ class QuantumRepeaterSync(Scene):
         )
 
         # Plot 1: Direct Transmission
-        curve_direct = axes.plot(lambda x: -0.02 * x, color=RED, x_range=[0, 1000])
+        curve_direct = axes.plot(lambda x: np.interp(x, DISTANCE, LOG_DIRECT), color=RED, x_range=[0, 1000])
         label_direct = Text("Direct Trans.", font_size=16, color=RED).next_to(curve_direct.get_end(), UP*0.5 + RIGHT*0.2)
         
         # Plot 2: Repeater Assisted
-        curve_repeater = axes.plot(lambda x: -0.01 * x, color=GREEN, x_range=[0, 1000])
+        curve_repeater = axes.plot(lambda x: np.interp(x, DISTANCE, LOG_REPEATER), color=GREEN, x_range=[0, 1000])
         label_repeater = Text("w/ Repeater", font_size=16, color=GREEN).next_to(curve_repeater.get_end(), RIGHT)
 
         # -----------------------------------------
@@ -65,6 +80,12 @@ class QuantumRepeaterSync(Scene):
         fiber_1 = Line(start_pos, repeater_box.get_left(), color=GRAY)
         fiber_2 = Line(repeater_box.get_right(), end_pos, color=GRAY)
         
+        best_lbl = Text(
+            f"Optimum for 1000 km: {BEST['segments']} segments, {BEST['modes']} modes, "
+            f"{BEST['rate']:.2g} pairs/s",
+            font_size=14, color=GRAY
+        ).next_to(VGroup(fiber_1, fiber_2), DOWN, buff=0.8)
+        
         photon = Dot(color=GREEN, radius=0.1)
         photon.move_to(start_pos)
         
@@ -76,7 +97,8 @@ class QuantumRepeaterSync(Scene):
             Create(axes), Write(x_label), Write(y_label), 
             Write(x_nums), Write(y_nums), Write(log_note),
             FadeIn(alice_lbl), FadeIn(bob_lbl), FadeIn(repeater_lbl),
-            Create(fiber_1), Create(fiber_2), FadeIn(repeater_box)
+            Create(fiber_1), Create(fiber_2), FadeIn(repeater_box),
+            FadeIn(best_lbl)
         )
         
         # Reference Line (Direct)
@@ -86,8 +108,8 @@ class QuantumRepeaterSync(Scene):
         self.wait(0.5)
 
         # Segmented Curves for sync
-        curve_seg1 = axes.plot(lambda x: -0.01 * x, color=GREEN, x_range=[0, 500])
-        curve_seg2 = axes.plot(lambda x: -0.01 * x, color=GREEN, x_range=[500, 1000])
+        curve_seg1 = axes.plot(lambda x: np.interp(x, DISTANCE, LOG_REPEATER), color=GREEN, x_range=[0, 500])
+        curve_seg2 = axes.plot(lambda x: np.interp(x, DISTANCE, LOG_REPEATER), color=GREEN, x_range=[500, 1000])
 
         self.add(photon)
 
@@ -1,5 +1,7 @@
 from manim import *
 
+from photon_cloud import PhotonCloud
+
 class ExponentialLossPhysics(Scene):
     def construct(self):
         # -----------------------------------------
@@ -54,11 +56,13 @@ class ExponentialLossPhysics(Scene):
         
         dist_label = MathTex("L = 1000 \\text{ km}", font_size=20, color=GRAY).next_to(dist_arrow, DOWN, buff=0.1)
 
-        photon = Dot(color=YELLOW, radius=0.08)
-        photon.move_to(fiber.get_start())
-        
-        glow = Dot(color=YELLOW, radius=0.25, fill_opacity=0.4)
-        glow.add_updater(lambda m: m.move_to(photon.get_center()))
+        # 20,000 photons, each lost at a random exp(-L / L_att) distributed point
+        photons = PhotonCloud(
+            fiber.get_start(), fiber.get_end(), length=1000, attenuation_length=22, n_photons=20_000
+        )
+        survivors = Integer(photons.n_photons, font_size=24, color=YELLOW)
+        survivors_label = Text("photons left", font_size=18, color=YELLOW)
+        counter = VGroup(survivors, survivors_label).arrange(RIGHT, buff=0.15).next_to(fiber, UP, buff=0.6)
 
         # -----------------------------------------
         # 4. CENTER: Equation & Arrow (PHYSICS NOTATION)
@@ -96,23 +100,12 @@ class ExponentialLossPhysics(Scene):
         self.wait(0.5)
 
         tracker = ValueTracker(0)
-        
-        def update_photon(mob):
-            val = tracker.get_value()
-            progress = val / 1000.0
-            mob.move_to(fiber.point_from_proportion(progress))
-            mob.set_opacity(1 - progress) 
-            
-        def update_glow(mob):
-            val = tracker.get_value()
-            progress = val / 1000.0
-            mob.move_to(photon.get_center())
-            mob.set_opacity(0.4 * (1 - progress))
 
-        photon.add_updater(update_photon)
-        glow.add_updater(update_glow)
-        
-        self.add(photon, glow)
+        # One vectorized step per frame for the whole cloud
+        photons.add_updater(lambda m: m.set_front(tracker.get_value()))
+        survivors.add_updater(lambda m: m.set_value(photons.survivors()))
+
+        self.add(photons, counter)
 
         self.play(
             Create(graph_line, rate_func=linear),
@@ -120,5 +113,4 @@ class ExponentialLossPhysics(Scene):
             run_time=4,
             rate_func=linear
         )
-        
         self.wait(2)
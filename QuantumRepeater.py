@@ -1,140 +1,151 @@
 from manim import *
+import numpy as np
+
+from bell_diagonal import swap_chain, werner
+from purification import purification_rounds
+from swap_chain import node_labels, state_tex, swap_sequence
 
 # -----------------------------------------
 # HELPER: Define Styles and Positions once
 # -----------------------------------------
-def get_base_layout():
-    # Positions
-    pos_a = LEFT * 5 + UP * 1.5
-    pos_b = LEFT * 1.5 + UP * 1.5
-    pos_c = RIGHT * 1.5 + UP * 1.5
-    pos_d = RIGHT * 5 + UP * 1.5
-    
+def get_base_layout(n_nodes=4, width=10, height=1.5):
+    # Positions: evenly spaced along one row
+    xs = np.linspace(-width / 2, width / 2, n_nodes)
+    pos = [RIGHT * x + UP * height for x in xs]
+    side = min(1.2, 0.4 * (xs[1] - xs[0]))
+    labels = node_labels(n_nodes)
+
     # Node Configuration
-    box_config = {"color": BLUE, "fill_opacity": 0.2, "side_length": 1.2}
-    
-    # Node A
-    node_a = VGroup(Square(**box_config), Text("A").scale(0.8)).move_to(pos_a)
-    
-    # Node B (with memory slots)
-    box_b = Square(**box_config).move_to(pos_b)
-    mem_b_l = Square(side_length=0.4, color=WHITE).move_to(pos_b + LEFT*0.3)
-    mem_b_r = Square(side_length=0.4, color=WHITE).move_to(pos_b + RIGHT*0.3)
-    label_b = Text("B").scale(0.8).next_to(box_b, UP)
-    node_b = VGroup(box_b, mem_b_l, mem_b_r, label_b)
-    
-    # Node C (with memory slots)
-    box_c = Square(**box_config).move_to(pos_c)
-    mem_c_l = Square(side_length=0.4, color=WHITE).move_to(pos_c + LEFT*0.3)
-    mem_c_r = Square(side_length=0.4, color=WHITE).move_to(pos_c + RIGHT*0.3)
-    label_c = Text("C").scale(0.8).next_to(box_c, UP)
-    node_c = VGroup(box_c, mem_c_l, mem_c_r, label_c)
-    
-    # Node D
-    node_d = VGroup(Square(**box_config), Text("D").scale(0.8)).move_to(pos_d)
-    
+    box_config = {"color": BLUE, "fill_opacity": 0.2, "side_length": side}
+
+    nodes = []
+    for i, (p, label) in enumerate(zip(pos, labels)):
+        if i in (0, n_nodes - 1):
+            # End node
+            nodes.append(VGroup(Square(**box_config), Text(label).scale(0.8 * side / 1.2)).move_to(p))
+            continue
+        # Repeater node (with memory slots)
+        box = Square(**box_config).move_to(p)
+        mem_l = Square(side_length=side / 3, color=WHITE).move_to(p + LEFT * side / 4)
+        mem_r = Square(side_length=side / 3, color=WHITE).move_to(p + RIGHT * side / 4)
+        label_node = Text(label).scale(0.8 * side / 1.2).next_to(box, UP)
+        nodes.append(VGroup(box, mem_l, mem_r, label_node))
+
     # Return dictionary of points and objects for easy access
     return {
-        "pos": [pos_a, pos_b, pos_c, pos_d],
-        "nodes": [node_a, node_b, node_c, node_d]
+        "pos": pos,
+        "nodes": nodes,
+        "side": side,
+        "labels": labels,
     }
 
+
+def get_pair_links(layout, pairs, color=TEAL):
+    # Neighbours: straight line; longer pairs arc higher with their span
+    pos, half = layout["pos"], layout["side"] / 2
+    links = VGroup()
+    for a, b in pairs:
+        start, end = pos[a] + RIGHT * half, pos[b] + LEFT * half
+        if b - a == 1:
+            links.add(Line(start, end, color=color))
+        else:
+            angle = -min(PI / 4 + (b - a - 2) * PI / 12, PI / 2)
+            links.add(ArcBetweenPoints(start, end, angle=angle, color=color))
+    return links
+
 # -----------------------------------------
-# IMAGE 1: Entangle & Store
+# ONE SWAPPING STEP: layout, pairs and state from the swap sequence
 # -----------------------------------------
-class Case1_Entangle(Scene):
+class SwapStep(Scene):
+    N_NODES = 4
+    ORDER = "sequential"
+    STEP = 0
+    # Noise behind the final fidelity
+    LINK_FIDELITY = 0.97
+    STORAGE_TIME = 20e-6      # s each link waits in memory
+    COHERENCE_TIME = 1e-3     # s memory depolarization time
+    BSM = "linear_optics"
+    BSM_QUALITY = 0.99
+    # Purification of every elementary link before swapping (0: none)
+    PURIFY_ROUNDS = 0
+    PURIFY_PROTOCOL = "dejmps"
+    PURIFY_SCHEDULE = "symmetric"
+
     def construct(self):
-        layout = get_base_layout()
-        pos = layout["pos"]
-        nodes = layout["nodes"]
-        
-        # Add Nodes
+        layout = get_base_layout(self.N_NODES)
+        nodes, labels = layout["nodes"], layout["labels"]
+        states = list(swap_sequence(self.N_NODES, self.ORDER))
+        state = states[self.STEP]
+        where = ", ".join(labels[i] for i in state.swapped)
+
+        # Measured nodes are consumed (gray out)
+        for i in np.flatnonzero(state.measured):
+            nodes[i].set_opacity(0.3)
         self.add(*nodes)
-        
+
+        if self.STEP == 0:
+            title_text = "Entangle & Store"
+            tex = r"|\Psi_{init}\rangle = " + state_tex(state, labels)
+            links = get_pair_links(layout, state.pairs())
+        elif state.is_final():
+            # Highlight the two ends (Success)
+            title_text = f"Final Measurement at {where}"
+            ends = labels[0] + labels[-1]
+            raw_links = werner(np.full(self.N_NODES - 1, self.LINK_FIDELITY))
+            purified = purification_rounds(raw_links, self.PURIFY_ROUNDS, self.PURIFY_PROTOCOL, self.PURIFY_SCHEDULE)
+            final = swap_chain(
+                purified.final(),
+                storage_time=self.STORAGE_TIME, coherence_time=self.COHERENCE_TIME,
+                bsm_quality=self.BSM_QUALITY, bsm=self.BSM,
+            )
+            tex = (
+                rf"F = \langle\Phi^+|\rho_{{{ends}}}|\Phi^+\rangle = {final.fidelity:.3f}, \quad "
+                rf"P_{{succ}} = {final.success_probability:.2f}"
+            )
+            if self.PURIFY_ROUNDS:
+                title_text += " (purified links)"
+                tex += rf", \quad {purified.raw_pairs[-1, 0]:.1f}\ \text{{raw pairs / link}}"
+            links = get_pair_links(layout, state.pairs(), color=PURPLE)
+            self.add(*[SurroundingRectangle(nodes[i], color=PURPLE, buff=0.1) for i in (0, -1)])
+        else:
+            # Highlight the nodes measured in this step
+            title_text = f"Bell State Measurement at {where} (Swap)"
+            tex = rf"\text{{Measure }} {where} \rightarrow " + state_tex(state, labels)
+            links = get_pair_links(layout, state.pairs())
+            self.add(*[SurroundingRectangle(nodes[i], color=RED, buff=0.1) for i in state.swapped])
+
         # Title
-        title = Text("1. Entangle & Store", font_size=36).to_corner(UL)
-        self.add(title)
-
-        # Links (Short Range)
-        link_ab = Line(pos[0] + RIGHT*0.6, pos[1] + LEFT*0.6, color=TEAL)
-        link_bc = Line(pos[1] + RIGHT*0.6, pos[2] + LEFT*0.6, color=TEAL)
-        link_cd = Line(pos[2] + RIGHT*0.6, pos[3] + LEFT*0.6, color=TEAL)
-        self.add(link_ab, link_bc, link_cd)
-        
-        nodes_group = VGroup(*nodes)
+        title = Text(f"{self.STEP + 1}. {title_text}", font_size=36).to_corner(UL)
+        self.add(title, links)
 
+        nodes_group = VGroup(*nodes)
         # Math
-        math = MathTex(
-            r"|\Psi_{init}\rangle = |\Phi^+\rangle_{A,B_L} \otimes |\Phi^+\rangle_{B_R,C_L} \otimes |\Phi^+\rangle_{C_R,D}",
-            font_size=46
-        ).next_to(nodes_group, DOWN, buff=1)
+        math = MathTex(tex, font_size=46).next_to(nodes_group, DOWN, buff=1)
+        if math.width > config.frame_width - 1:
+            math.scale_to_fit_width(config.frame_width - 1)
         self.add(math)
 
+# -----------------------------------------
+# IMAGE 1: Entangle & Store
+# -----------------------------------------
+class Case1_Entangle(SwapStep):
+    STEP = 0
+
 # -----------------------------------------
 # IMAGE 2: Bell State Measurement at B
 # -----------------------------------------
-class Case2_SwapB(Scene):
-    def construct(self):
-        layout = get_base_layout()
-        pos = layout["pos"]
-        nodes = layout["nodes"]
-        
-        # Modify State: B is measured (Gray out B, Highlight Red)
-        nodes[1].set_opacity(0.3) 
-        highlight_b = SurroundingRectangle(nodes[1], color=RED, buff=0.1)
-        
-        self.add(*nodes, highlight_b)
-        
-        # Title
-        title = Text("2. Bell State Measurement at B (Swap)", font_size=36).to_corner(UL)
-        self.add(title)
-
-        # Links: AB and BC are gone. AC is created.
-        # Still show CD
-        link_cd = Line(pos[2] + RIGHT*0.6, pos[3] + LEFT*0.6, color=TEAL)
-        link_ac = ArcBetweenPoints(pos[0] + RIGHT*0.6, pos[2] + LEFT*0.6, angle=-PI/4, color=TEAL)
-        
-        self.add(link_cd, link_ac)
-        
-        nodes_group = VGroup(*nodes)
-        # Math
-        math = MathTex(
-            r"\text{Measure } B \rightarrow |\Phi^+\rangle_{A,C_L} \otimes |\Phi^+\rangle_{C_R,D}",
-            font_size=46
-        ).next_to(nodes_group, DOWN, buff=1)
-        self.add(math)
+class Case2_SwapB(SwapStep):
+    STEP = 1
 
 # -----------------------------------------
 # IMAGE 3: Final Measurement at C
 # -----------------------------------------
-class Case3_Final(Scene):
-    def construct(self):
-        layout = get_base_layout()
-        pos = layout["pos"]
-        nodes = layout["nodes"]
-        
-        # Modify State: B and C are consumed
-        nodes[1].set_opacity(0.3)
-        nodes[2].set_opacity(0.3)
-        
-        # Highlight A and D (Success)
-        highlight_a = SurroundingRectangle(nodes[0], color=PURPLE, buff=0.1)
-        highlight_d = SurroundingRectangle(nodes[3], color=PURPLE, buff=0.1)
-        
-        self.add(*nodes, highlight_a, highlight_d)
+class Case3_Final(SwapStep):
+    STEP = 2
 
-        # Title
-        title = Text("3. Final Measurement at C", font_size=36).to_corner(UL)
-        self.add(title)
-        
-        # Links: Only AD exists now
-        link_ad = ArcBetweenPoints(pos[0] + RIGHT*0.6, pos[3] + LEFT*0.6, angle=-PI/3, color=PURPLE)
-        self.add(link_ad)
-        
-        nodes_group = VGroup(*nodes)
-        # Math
-        math = MathTex(
-            r"|\Psi_{final}\rangle_{AD} = \frac{1}{\sqrt{2}} (|00\rangle_{AD} + |11\rangle_{AD})",
-            font_size=46
-        ).next_to(nodes_group, DOWN, buff=1)
-        self.add(math)
\ No newline at end of file
+# -----------------------------------------
+# IMAGE 4: Final Measurement with purified links
+# -----------------------------------------
+class Case4_Purified(SwapStep):
+    STEP = 2
+    PURIFY_ROUNDS = 2
@@ -0,0 +1,140 @@
+import numpy as np
+
+# -----------------------------------------
+# AFC DESIGN SPACE: EFFICIENCY VS MULTIMODE CAPACITY
+# -----------------------------------------
+# Closed-form figures of merit of a comb with N teeth of peak optical depth
+# d and finesse F = Delta / tooth FWHM, inside a fixed usable bandwidth
+# (the inhomogeneous line, or the pump's reach):
+#     spacing       Delta = bandwidth / N,   storage time 2 pi / Delta
+#     efficiency    eta = d_eff^2 exp(-d_eff)  (forward)   or
+#                         (1 - exp(-d_eff))^2   (backward recall)
+#                   x tooth dephasing(F) x exp(-d_0) x exp(-2 pi gamma_h / Delta)
+#     modes         N / slot (one temporal mode per `slot` pulse durations 2 pi / bandwidth)
+# d_eff = d / F x (tooth area / (peak x FWHM)) is the mean optical depth of
+# the comb; the dephasing factor is the tooth's Fourier transform at the
+# echo, |tooth(2 pi / Delta)|^2. A comb is only preparable if its teeth are
+# no narrower than min_tooth_width. Everything broadcasts over a
+# (shape, od, finesse, teeth) grid, so millions of designs take one call.
+
+# Tooth shape: (area / (peak x FWHM), echo dephasing as a function of F)
+TOOTH_SHAPES = {
+    "gaussian": (np.sqrt(np.pi / (4 * np.log(2))), lambda F: np.exp(-np.pi ** 2 / (2 * np.log(2) * F ** 2))),
+    "lorentzian": (np.pi / 2, lambda F: np.exp(-2 * np.pi / F)),
+    "square": (1.0, lambda F: np.sinc(1 / F) ** 2),
+}
+
+
+class CombDesigns:
+    """Figures of merit on a grid of comb designs, axes (shape, peak_od, finesse, n_teeth)."""
+
+    def __init__(self, shapes, peak_od, finesse, n_teeth, spacing, efficiency, modes, feasible):
+        self.shapes = shapes            # tooth shape names, axis 0
+        self.peak_od = peak_od          # axis 1
+        self.finesse = finesse          # axis 2
+        self.n_teeth = n_teeth          # axis 3
+        self.spacing = spacing          # tooth spacing per n_teeth
+        self.efficiency = efficiency    # (shapes, od, F, teeth)
+        self.modes = modes              # temporal modes per n_teeth
+        self.feasible = feasible        # (1, 1, F, teeth): teeth wide enough to prepare
+
+    def design(self, index):
+        """Parameters and figures of merit of one design (flat or tuple index)."""
+        if np.ndim(index) == 0:
+            index = np.unravel_index(index, self.efficiency.shape)
+        s, o, f, n = (int(i) for i in index)
+        return {
+            "shape": self.shapes[s],
+            "peak_od": self.peak_od[o],
+            "finesse": self.finesse[f],
+            "n_teeth": int(self.n_teeth[n]),
+            "spacing": self.spacing[n],
+            "storage_time": 2 * np.pi / self.spacing[n],
+            "modes": int(self.modes[n]),
+            "efficiency": self.efficiency[s, o, f, n],
+        }
+
+    def _masked(self):
+        return np.where(self.feasible, self.efficiency, -np.inf)
+
+    def optimal(self, target_modes):
+        """Most efficient preparable design holding at least target_modes modes (None if there is none)."""
+        efficiency = np.where(self.modes >= target_modes, self._masked(), -np.inf)
+        best = np.argmax(efficiency)
+        if not np.isfinite(efficiency.flat[best]):
+            return None
+        return self.design(best)
+
+    def pareto_front(self):
+        """
+        Non-dominated (modes, efficiency) pairs, sorted by modes, with the
+        flat index of the design reaching each.
+        """
+        # Best design per n_teeth, then keep those beaten by no design with more modes
+        per_teeth = self._masked().reshape(-1, len(self.n_teeth))
+        best = np.argmax(per_teeth, axis=0)
+        efficiency = per_teeth[best, np.arange(len(self.n_teeth))]
+
+        order = np.lexsort((-efficiency, -self.modes))     # most modes first, best first on ties
+        previous = np.r_[-np.inf, np.maximum.accumulate(efficiency[order])[:-1]]
+        keep = order[efficiency[order] > previous][::-1]
+
+        index = np.ravel_multi_index(
+            np.unravel_index(best[keep], self.efficiency.shape[:3]) + (keep,), self.efficiency.shape
+        )
+        return self.modes[keep], efficiency[keep], index
+
+    def front_by_od(self, modes):
+        """
+        Pareto front sampled at the given mode counts for every peak-OD
+        ceiling (peak_od ascending): row k is the best efficiency holding at
+        least `modes` modes using peak_od[:k + 1] only (-inf where none does).
+        """
+        per_teeth = np.maximum.accumulate(np.max(self._masked(), axis=(0, 2)), axis=0)    # (od, teeth)
+
+        # Best over all designs with >= m modes: running max from the most modes down
+        order = np.argsort(self.modes, kind="stable")
+        reach = np.maximum.accumulate(per_teeth[:, order[::-1]], axis=1)[:, ::-1]
+        first = np.searchsorted(self.modes[order], modes)
+        front = np.full((len(self.peak_od), len(modes)), -np.inf)
+        valid = first < len(order)
+        front[:, valid] = reach[:, first[valid]]
+        return front
+
+
+def comb_designs(peak_od, finesse, n_teeth, shapes=tuple(TOOTH_SHAPES), bandwidth=100.0,
+                 homogeneous_width=0.0, min_tooth_width=0.0, background_od=0.0, slot=3.0,
+                 backward=False):
+    """
+    Evaluate every (shape, peak_od, finesse, n_teeth) comb in one call.
+
+    bandwidth:         usable comb bandwidth (angular); fixes the spacing of N teeth
+    homogeneous_width: optical homogeneous FWHM (coherence loss during 2 pi / Delta)
+    min_tooth_width:   narrowest tooth the preparation can carve
+    slot:              temporal-mode slot in units of the shortest pulse, 2 pi / bandwidth
+    backward:          backward recall (phase-matched, no reabsorption limit)
+    """
+    peak_od = np.atleast_1d(np.asarray(peak_od, dtype=float))
+    finesse = np.atleast_1d(np.asarray(finesse, dtype=float))
+    n_teeth = np.atleast_1d(np.asarray(n_teeth, dtype=int))
+    shapes = tuple(shapes)
+    unknown = set(shapes) - set(TOOTH_SHAPES)
+    if unknown:
+        raise ValueError(f"Unknown tooth shape(s) {sorted(unknown)} (use {', '.join(TOOTH_SHAPES)})")
+
+    spacing = bandwidth / n_teeth
+    od = peak_od[None, :, None, None]
+    F = finesse[None, None, :, None]
+
+    area = np.array([TOOTH_SHAPES[s][0] for s in shapes])[:, None, None, None]
+    dephasing = np.stack([TOOTH_SHAPES[s][1](F[0]) for s in shapes])
+    d_eff = area * od / F
+    if backward:
+        efficiency = (1 - np.exp(-d_eff)) ** 2
+    else:
+        efficiency = d_eff ** 2 * np.exp(-d_eff)
+    efficiency = efficiency * dephasing * np.exp(-background_od - 2 * np.pi * homogeneous_width / spacing)
+
+    modes = np.floor(n_teeth / slot).astype(int)
+    feasible = spacing / F >= min_tooth_width
+    return CombDesigns(shapes, peak_od, finesse, n_teeth, spacing, efficiency, modes, feasible)
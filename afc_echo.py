@@ -0,0 +1,147 @@
+import numpy as np
+
+from kramers_kronig import kk_dispersion
+from lineshapes import voigt
+
+# -----------------------------------------
+# AFC ECHO FROM THE COMB SPECTRUM (FFT)
+# -----------------------------------------
+# A weak pulse crossing a medium with (intensity) optical depth d(w) leaves
+# with the spectrum E_in(w) T(w), where
+#     T(w) = exp(-(d(w) - i d_KK(w)) / 2)
+# and d_KK is the Kramers-Kronig partner of d (the phase that makes the
+# response causal). One FFT of E_in T gives the output field in time: the
+# transmitted part near t = 0 and, for a comb with tooth spacing Delta,
+# echoes at t = 2 pi k / Delta. Echo efficiencies are the output energy in
+# each echo window over the input energy. Frequencies are angular; every
+# function works along the last axis, so stacks of combs (an OD x finesse
+# grid, say) go through in one call.
+
+
+def comb_absorption(freq, spacing=1.0, finesse=10.0, peak_od=1.0, background_od=0.0, n_teeth=None,
+                    homogeneous_width=0.0):
+    """
+    Gaussian-tooth comb d(w): teeth at multiples of spacing, FWHM spacing / finesse.
+
+    n_teeth limits the comb to the central n_teeth teeth (None: fills freq).
+    homogeneous_width: Lorentzian FWHM convolved into every tooth (Voigt
+    teeth, still peak peak_od); their far wings beyond the next tooth are dropped.
+    Parameters broadcast against freq, e.g. peak_od[:, None, None].
+    """
+    freq = np.asarray(freq, dtype=float)
+    spacing = np.asarray(spacing, dtype=float)
+    sigma = spacing / np.asarray(finesse, dtype=float) / (2 * np.sqrt(2 * np.log(2)))
+
+    # Nearest and next-nearest tooth of every sample: no loop over teeth,
+    # and overlapping wings of low-finesse combs are still summed
+    nearest = np.round(freq / spacing)
+    offset = freq - nearest * spacing
+    side = np.where(offset < 0, -1.0, 1.0)
+    d = background_od
+    for tooth, dist in ((nearest, offset), (nearest + side, offset - side * spacing)):
+        if np.any(homogeneous_width):
+            line = voigt(dist, 0.0, sigma, 0.5 * np.asarray(homogeneous_width, dtype=float), peak_od)
+        else:
+            line = np.asarray(peak_od, dtype=float) * np.exp(-0.5 * (dist / sigma) ** 2)
+        if n_teeth is not None:
+            line = np.where(np.abs(tooth) <= (n_teeth - 1) / 2, line, 0.0)
+        d = d + line
+    return d
+
+
+def transfer_function(absorption, **kwargs):
+    """Causal field transmission T(w) for a sampled optical-depth profile."""
+    absorption = np.asarray(absorption, dtype=float)
+    return np.exp(-0.5 * (absorption - 1j * kk_dispersion(absorption, **kwargs)))
+
+
+class EchoTrace:
+    """Output field of a pulse through the comb, on the FFT time grid."""
+
+    def __init__(self, t, field_out, energy_in, spacing, delay):
+        self.t = t                  # times 0 .. 2 pi / dw
+        self.field_out = field_out  # output field (..., N)
+        self.energy_in = energy_in  # input pulse energy on the same time grid
+        self.spacing = spacing
+        self.delay = delay          # arrival time of the input pulse centre
+
+    @property
+    def echo_time(self):
+        """Echo delay 2 pi / Delta after the input pulse."""
+        return 2 * np.pi / self.spacing
+
+    def intensity(self):
+        return np.abs(self.field_out) ** 2
+
+    def efficiencies(self, orders=3):
+        """
+        Energy fractions (..., orders + 1): index 0 is the directly transmitted
+        pulse, index k the k-th echo (one echo period centred on delay + 2 pi k / Delta).
+        """
+        energy_in = self.energy_in[..., None] if np.ndim(self.energy_in) else self.energy_in
+        out = np.abs(self.field_out) ** 2 / energy_in
+        order = np.round((self.t - self.delay) / self.echo_time).astype(int)
+        return np.stack(
+            [out[..., order == k].sum(axis=-1) for k in range(orders + 1)],
+            axis=-1,
+        )
+
+    def efficiency(self):
+        """First-echo efficiency."""
+        return self.efficiencies(orders=1)[..., 1]
+
+
+def echo_trace(freq, absorption, spacing, pulse_bandwidth=None, pad=1, **kwargs):
+    """
+    Echo response of a sampled comb d(w) on the uniform grid freq.
+
+    pulse_bandwidth: rms spectral width (intensity) of the gaussian input
+                     pulse centred on the grid (default: a sixth of the grid
+                     span, well inside it and much wider than the tooth spacing).
+    pad, kwargs:     passed to the Kramers-Kronig transform. No padding by
+                     default: the comb should sit inside an absorption-free
+                     (or flat background) margin anyway for the pulse to fit.
+    """
+    freq = np.asarray(freq, dtype=float)
+    n = freq.shape[-1]
+    dw = freq[1] - freq[0]
+    center = 0.5 * (freq[0] + freq[-1])
+    if pulse_bandwidth is None:
+        pulse_bandwidth = (freq[-1] - freq[0]) / 6
+
+    # Input centred 5 rms durations after t = 0 so none of it wraps to t < 0
+    delay = 5 / pulse_bandwidth
+    spectrum_in = np.exp(-0.25 * ((freq - center) / pulse_bandwidth) ** 2 + 1j * freq * delay)
+    spectrum_out = spectrum_in * transfer_function(absorption, pad=pad, **kwargs)
+
+    # E(t) = sum_w E(w) exp(-i w t) is numpy's forward FFT, at t_k = 2 pi k / (N dw);
+    # Parseval gives the input energy on that grid without transforming it
+    field_out = np.fft.fft(spectrum_out, axis=-1)
+    energy_in = n * np.sum(np.abs(spectrum_in) ** 2, axis=-1)
+    t = 2 * np.pi * np.arange(n) / (n * dw)
+    return EchoTrace(t, field_out, energy_in, spacing, delay)
+
+
+def efficiency_grid(peak_od, finesse, spacing=1.0, n_teeth=101, bins_per_tooth=64, orders=3,
+                    background_od=0.0, homogeneous_width=0.0):
+    """
+    Echo efficiencies for every (peak_od, finesse) pair, shape (len(od), len(F), orders + 1).
+
+    The comb is sampled with bins_per_tooth bins per period over n_teeth teeth
+    plus the same again of empty margin, rounded up to a power of two.
+    """
+    peak_od = np.atleast_1d(np.asarray(peak_od, dtype=float))
+    finesse = np.atleast_1d(np.asarray(finesse, dtype=float))
+    n = 1 << int(np.ceil(np.log2(2 * n_teeth * bins_per_tooth)))
+    freq = (np.arange(n) - n // 2) * (spacing / bins_per_tooth)
+
+    d = comb_absorption(freq, spacing, finesse[None, :, None], peak_od[:, None, None],
+                        background_od, n_teeth, homogeneous_width)
+    trace = echo_trace(freq, d, spacing, pulse_bandwidth=n_teeth * spacing / 6)
+    return trace.efficiencies(orders)
+
+
+def analytic_efficiency(peak_od, finesse):
+    """Forward-echo efficiency for gaussian teeth: (d/F)^2 exp(-d/F) exp(-7/F^2)."""
+    d_eff = np.asarray(peak_od, dtype=float) / np.asarray(finesse, dtype=float)
+    return d_eff ** 2 * np.exp(-d_eff) * np.exp(-7 / np.asarray(finesse, dtype=float) ** 2)
@@ -0,0 +1,112 @@
+from manim import *
+import numpy as np
+
+# -----------------------------------------
+# BAKED VALUETRACKER TIMELINES
+# -----------------------------------------
+# always_redraw re-evaluates the physics on every frame. When the tracker
+# animations are known up front we can instead replay the exact values
+# manim will visit (same rate_func, run_time and frame_rate), evaluate the
+# physics once for all frames as a (frames x samples) array, and let each
+# updater just look up its row.
+#
+# Usage:
+#     timeline = TrackerTimeline(tracker)
+#     squeeze = timeline.animate(tracker, 0.3, run_time=6, rate_func=slow_into)
+#     curve_y = timeline.bake(lambda v: f(x, v))
+#     graph = LivePlot(ax, lambda x: curve_y(), x=x, color=GREEN)
+#     self.play(squeeze)
+#
+# Scenes that bake set a class attribute `bake_trackers = True` and pass
+# baked=self.bake_trackers to their timeline. Setting it to False (on the
+# class or a subclass) renders the same scene with every frame evaluated
+# live, to check the baked table against the physics or to profile both.
+
+
+class TrackerTimeline:
+    """Joint trajectory of one or more ValueTrackers, recorded frame by frame."""
+
+    def __init__(self, *trackers, baked=True, frame_rate=None):
+        self.trackers = list(trackers)
+        self.baked = baked
+        self.frame_rate = frame_rate or config.frame_rate
+        self._blocks = [np.array([[t.get_value() for t in self.trackers]])]
+        self._states = None
+        self._cursor = 0
+        self.misses = 0
+
+    def animate(self, tracker, target, run_time=1.0, rate_func=smooth):
+        """Record tracker -> target and return the matching animation for self.play."""
+        k = self.trackers.index(tracker)
+        start = self._blocks[-1][-1]
+
+        # Same frame times as Scene.play: np.arange(0, run_time, dt), then finish() at alpha = 1
+        alphas = np.append(np.arange(0, run_time, 1 / self.frame_rate) / run_time, 1.0)
+        progress = np.array([rate_func(a) for a in alphas])
+
+        block = np.tile(start, (len(alphas), 1))
+        block[:, k] = interpolate(start[k], target, progress)
+        self._blocks.append(block)
+        self._states = None
+
+        return tracker.animate(run_time=run_time, rate_func=rate_func).set_value(target)
+
+    @property
+    def states(self):
+        """(frames, trackers) array of every tracker state the scene will show."""
+        if self._states is None:
+            self._states = np.concatenate(self._blocks)
+        return self._states
+
+    def current_state(self):
+        return np.array([t.get_value() for t in self.trackers])
+
+    def frame_index(self):
+        """Row of `states` matching the trackers right now, or None if off-script."""
+        state = self.current_state()
+        states = self.states
+        tol = 1e-9 * (1 + np.abs(state).max())
+
+        # Playback is sequential, so the next row is almost always the answer
+        for k in (self._cursor, self._cursor + 1):
+            if k < len(states) and np.abs(states[k] - state).max() <= tol:
+                self._cursor = k
+                return k
+
+        k = int(np.abs(states - state).max(axis=1).argmin())
+        if np.abs(states[k] - state).max() <= tol:
+            self._cursor = k
+            return k
+        return None
+
+    def bake(self, func):
+        """
+        Evaluate func once for the whole trajectory.
+
+        func receives one (frames, 1) column per tracker and must return an
+        array whose first axis is frames (so it broadcasts against a sample grid).
+        """
+        return BakedTable(self, func)
+
+
+class BakedTable:
+    """Per-frame lookup into a table baked along a TrackerTimeline."""
+
+    def __init__(self, timeline, func):
+        self.timeline = timeline
+        self.func = func
+        self.table = func(*timeline.states.T[:, :, None]) if timeline.baked else None
+
+    def live(self):
+        state = self.timeline.current_state()
+        return self.func(*state[:, None, None])[0]
+
+    def __call__(self):
+        if self.table is None:
+            return self.live()
+        k = self.timeline.frame_index()
+        if k is None:
+            # Tracker was moved by something we did not record: evaluate directly
+            self.timeline.misses += 1
+            return self.live()
+        return self.table[k]
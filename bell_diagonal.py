@@ -0,0 +1,109 @@
+import numpy as np
+
+# -----------------------------------------
+# BELL-DIAGONAL (WERNER) STATES THROUGH ENTANGLEMENT SWAPPING
+# -----------------------------------------
+# A Bell-diagonal pair is four weights on (Phi+, Phi-, Psi+, Psi-), i.e. on
+# the Pauli error (I, Z, X, Y) that turns Phi+ into each. Swapping two
+# pairs composes their errors, so the output weights are the XOR
+# convolution of the inputs. The 4-point Walsh-Hadamard transform turns
+# that convolution into a product: in "character" space a pair is
+# (1, c_Z, c_X, c_Y), swapping multiplies characters, depolarizing with
+# survival k multiplies c_Z, c_X, c_Y by k, and a Werner state is
+# (1, w, w, w). A whole chain is then one product over its links, so the
+# last axis holds the four weights and every other axis is a batch
+# (millions of chains at once).
+#     memory depolarization: k = exp(-t / T) per memory, two per stored pair
+#     imperfect BSM:         depolarizing with k = bsm_quality per swap
+#     heralding:             each swap succeeds with its BSM's probability
+#                            (1/2 for a linear-optics BSM, which only
+#                            resolves Psi+ and Psi-)
+
+BELL_STATES = ("Phi+", "Phi-", "Psi+", "Psi-")
+BSM_SUCCESS = {"deterministic": 1.0, "linear_optics": 0.5}
+
+_HADAMARD = np.array([
+    [1, 1, 1, 1],
+    [1, -1, 1, -1],
+    [1, 1, -1, -1],
+    [1, -1, -1, 1],
+], dtype=float)
+
+
+def werner(fidelity):
+    """Bell-diagonal weights of a Werner state with overlap `fidelity` with Phi+."""
+    fidelity = np.asarray(fidelity, dtype=float)
+    rest = (1 - fidelity) / 3
+    return np.stack([fidelity, rest, rest, rest], axis=-1)
+
+
+def fidelity(state):
+    """Overlap with Phi+."""
+    return state[..., 0]
+
+
+def to_characters(state):
+    return state @ _HADAMARD
+
+
+def from_characters(characters):
+    return characters @ _HADAMARD / 4
+
+
+def depolarize(state, keep):
+    """Keep the state with probability `keep`, otherwise replace it by the maximally mixed state."""
+    keep = np.asarray(keep, dtype=float)[..., None]
+    return keep * state + (1 - keep) / 4
+
+
+def swap(state_a, state_b, bsm_quality=1.0):
+    """Pair left after a Bell measurement on the inner halves of two pairs."""
+    characters = to_characters(state_a) * to_characters(state_b)
+    return depolarize(from_characters(characters), bsm_quality)
+
+
+class SwappedChain:
+    """End-to-end pair of a swapped chain and the probability that every swap heralded."""
+
+    def __init__(self, state, success_probability):
+        self.state = state
+        self.success_probability = success_probability
+
+    @property
+    def fidelity(self):
+        return fidelity(self.state)
+
+
+def swap_chain(links, storage_time=0.0, coherence_time=np.inf, bsm_quality=1.0,
+               bsm="deterministic"):
+    """
+    Swap a chain of links (..., L, 4) down to one pair.
+
+    storage_time: time each link waits in its two memories, broadcast to (..., L)
+    bsm:          "deterministic" or "linear_optics" (sets the heralding probability)
+    """
+    links = np.asarray(links, dtype=float)
+    n_links = links.shape[-2]
+    n_swaps = n_links - 1
+    keep = np.exp(-2 * np.asarray(storage_time, dtype=float) / coherence_time)
+
+    characters = to_characters(links)
+    characters[..., 1:] *= np.broadcast_to(keep, characters.shape[:-1])[..., None]
+    characters = np.prod(characters, axis=-2)
+    characters[..., 1:] *= np.asarray(bsm_quality, dtype=float)[..., None] ** n_swaps
+    success = BSM_SUCCESS[bsm] ** n_swaps
+    return SwappedChain(from_characters(characters), np.broadcast_to(success, characters.shape[:-1]))
+
+
+def chain_fidelity(link_fidelity, n_links, storage_time=0.0, coherence_time=np.inf,
+                   bsm_quality=1.0):
+    """
+    Final fidelity of n_links equal Werner links swapped into one; all arguments broadcast.
+
+    Werner in, Werner out: w = (w_link k_mem)^L q_bsm^(L - 1).
+    """
+    w = (4 * np.asarray(link_fidelity, dtype=float) - 1) / 3
+    keep = np.exp(-2 * np.asarray(storage_time, dtype=float) / coherence_time)
+    n_links = np.asarray(n_links)
+    w_final = (w * keep) ** n_links * np.asarray(bsm_quality, dtype=float) ** (n_links - 1)
+    return (1 + 3 * w_final) / 4
@@ -0,0 +1,159 @@
+import numpy as np
+
+# -----------------------------------------
+# SPECTRAL HOLE BURNING: AFC PREPARATION BY OPTICAL PUMPING
+# -----------------------------------------
+# Rate equations for every frequency bin of an inhomogeneous line, with a
+# long-lived shelving level |s> next to the ground state |g>:
+#     dg/dt = -R(w, t) (g - e) + beta Gamma_e e + Gamma_s s
+#     de/dt = +R(w, t) (g - e) - Gamma_e e
+#     ds/dt = (1 - beta) Gamma_e e - Gamma_s s
+# R is the pump rate: a Lorentzian of the homogeneous linewidth around every
+# pump line. One pump cycle is a frequency sweep (short compared with the
+# excited lifetime, so decay during it is neglected and the pumping only
+# needs the sweep's integrated dose) followed by a wait in which |e>
+# empties into |g> and |s>. Both steps are exact and linear per bin, so a
+# cycle is one 3x3 matrix per bin and many cycles are a matrix power. The
+# absorption is proportional to g - e.
+
+
+def lorentzian_dose(freq, centers, span, steps, linewidth, period=None):
+    """
+    Pump dose sum_k L(w - w_k) over one sweep (peak of L = 1 per step).
+
+    centers: pump line positions at the middle of the sweep; each line is
+             swept over [center - span/2, center + span/2] in `steps` steps.
+    period:  if the lines are equally spaced by `period`, only the nearest
+             two lines of every bin are summed (no loop over lines).
+    """
+    freq = np.asarray(freq, dtype=float)
+    centers = np.atleast_1d(np.asarray(centers, dtype=float))
+    half = 0.5 * linewidth
+    dose = np.zeros_like(freq)
+
+    for shift in np.linspace(-span / 2, span / 2, steps):
+        if period is None:
+            dist = freq[:, None] - (centers + shift)[None, :]
+            dose += np.sum(half ** 2 / (dist ** 2 + half ** 2), axis=1)
+        else:
+            x = freq - (centers[0] + shift)
+            nearest = np.clip(np.round(x / period), 0, len(centers) - 1)
+            offset = x - nearest * period
+            second = nearest + np.where(offset >= 0, 1, -1)
+            dose += half ** 2 / (offset ** 2 + half ** 2)
+            dose += np.where(
+                (second >= 0) & (second < len(centers)),
+                half ** 2 / ((x - second * period) ** 2 + half ** 2),
+                0.0,
+            )
+    return dose
+
+
+class BurnResult:
+    """Absorption frames recorded while the comb forms, plus the final profile."""
+
+    def __init__(self, freq, absorption, record_freq, frames, cycles):
+        self.freq = freq                # full simulation grid
+        self.absorption = absorption    # final absorption on freq
+        self.record_freq = record_freq  # grid of the recorded frames
+        self.frames = frames            # (recorded cycles, len(record_freq)); frames[0] is the bare line
+        self.cycles = cycles            # cycle number of every frame
+
+    def frame(self, cycle):
+        """Recorded frame(s) nearest to the given cycle number(s)."""
+        k = np.clip(np.searchsorted(self.cycles, cycle), 0, len(self.cycles) - 1)
+        return self.frames[k]
+
+
+class HoleBurning:
+    """Optical pumping of an inhomogeneous line into a comb, bin by bin."""
+
+    def __init__(self, freq, line=1.0, branching=0.5, excited_decay=1.0, shelf_decay=1e-4):
+        """
+        freq:          frequency bins (up to ~10^6)
+        line:          initial absorption profile (scalar for a flat line)
+        branching:     fraction of |e> decays that return to |g>
+        excited_decay, shelf_decay: population decay rates of |e> and |s>
+        """
+        self.freq = np.asarray(freq, dtype=float)
+        self.line = np.broadcast_to(np.asarray(line, dtype=float), self.freq.shape)
+        self.branching = branching
+        self.excited_decay = excited_decay
+        self.shelf_decay = shelf_decay
+
+    def cycle_matrix(self, dose, wait):
+        """
+        Per-bin (N, 3, 3) map of (g, e, s) over one cycle: the sweeps in
+        `dose` (one row per sweep) each followed by `wait`.
+        """
+        stay_e = np.exp(-self.excited_decay * wait)
+        stay_s = np.exp(-self.shelf_decay * wait)
+        relax = np.array([
+            [1, self.branching * (1 - stay_e), 1 - stay_s],
+            [0, stay_e, 0],
+            [0, (1 - self.branching) * (1 - stay_e), stay_s],
+        ])
+
+        m = np.broadcast_to(np.eye(3), self.freq.shape + (3, 3))
+        for d in np.atleast_2d(dose):
+            # Pumping equalises g and e at rate 2R; g + e is conserved
+            p = np.exp(-2 * d)
+            sweep = np.zeros(self.freq.shape + (3, 3))
+            sweep[:, 0, 0] = sweep[:, 1, 1] = 0.5 * (1 + p)
+            sweep[:, 0, 1] = sweep[:, 1, 0] = 0.5 * (1 - p)
+            sweep[:, 2, 2] = 1
+            m = relax @ sweep @ m
+        return m
+
+    def run(self, dose, cycles, wait=3.0, record_every=1, record_freq=None):
+        """
+        Repeat a pump cycle `cycles` times and record the absorption as the comb forms.
+
+        dose: integrated pump dose of one sweep (rate x step time summed over
+              the sweep, see lorentzian_dose), or a (sweeps, N) stack making up
+              one cycle. Each sweep is followed by `wait`.
+
+        Every cycle is the same linear map per bin, so the state is advanced
+        record_every cycles at a time by a precomputed matrix power: the cost
+        scales with the number of recorded frames, not of cycles.
+        """
+        m = self.cycle_matrix(dose, wait)
+        step = np.linalg.matrix_power(m, record_every)
+
+        state = np.zeros(self.freq.shape + (3,))
+        state[:, 0] = self.line
+
+        record_freq = self.freq if record_freq is None else np.asarray(record_freq, dtype=float)
+        record = lambda x: np.interp(record_freq, self.freq, x[:, 0] - x[:, 1])
+        frames = [record(state)]
+        recorded = [0]
+
+        done = 0
+        while done < cycles:
+            n = min(record_every, cycles - done)
+            advance = step if n == record_every else np.linalg.matrix_power(m, n)
+            state = np.einsum("nij,nj->ni", advance, state)
+            done += n
+            frames.append(record(state))
+            recorded.append(done)
+
+        return BurnResult(self.freq, state[:, 0] - state[:, 1], record_freq, np.array(frames), np.array(recorded))
+
+
+def comb_metrics(freq, absorption, spacing, teeth):
+    """
+    Finesse, background and peak of a comb with teeth at n * spacing for n in teeth.
+
+    background is the mean absorption at the hole centres (between teeth),
+    finesse = spacing / FWHM with the FWHM measured above that background.
+    """
+    teeth = np.asarray(teeth, dtype=float)
+    peak = np.interp(teeth * spacing, freq, absorption).mean()
+    holes = (teeth[:-1] + 0.5) * spacing
+    background = np.interp(holes, freq, absorption).mean()
+
+    # Fraction of each period above half maximum = FWHM / spacing
+    inside = (freq >= teeth[0] * spacing) & (freq <= teeth[-1] * spacing)
+    half_level = background + 0.5 * (peak - background)
+    duty = np.mean(absorption[inside] > half_level)
+    return {"finesse": 1 / duty, "background": background, "peak": peak}
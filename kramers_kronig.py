@@ -0,0 +1,86 @@
+import numpy as np
+
+# -----------------------------------------
+# NUMERICAL KRAMERS-KRONIG (FFT HILBERT TRANSFORM)
+# -----------------------------------------
+# For a causal response chi = chi' + i chi'' the real (dispersive) part
+# follows from the imaginary (absorptive) part:
+#     chi'(w) = (1/pi) P.V. integral chi''(w') / (w' - w) dw' = -H[chi''](w)
+# H is the Hilbert transform. On a uniform grid it is a multiplication by
+# -i sign(k) in Fourier space, i.e. O(N log N) instead of an O(N^2)
+# principal-value sum. Any sampled absorption spectrum works, analytic
+# model or measured data. Transforms run along the last axis, so a stack
+# of spectra (e.g. one per animation frame) is transformed in one call.
+
+
+def _window(n, kind, taper):
+    if kind is None:
+        return None
+    if kind == "hann":
+        return np.hanning(n)
+    if kind == "tukey":
+        w = np.ones(n)
+        edge = int(taper * (n - 1) / 2)
+        if edge > 0:
+            ramp = 0.5 * (1 - np.cos(np.pi * np.arange(edge) / edge))
+            w[:edge] = ramp
+            w[-edge:] = ramp[::-1]
+        return w
+    raise ValueError(f"Unknown window '{kind}' (use None, 'tukey' or 'hann')")
+
+
+def hilbert(y, pad=2, window=None, taper=0.1, subtract_baseline=True):
+    """
+    Hilbert transform H[y] along the last axis of uniformly sampled y.
+
+    pad:               zero-pad to at least pad * N samples (next power of two)
+                       so the circular FFT does not wrap the tails around.
+    window:            None, 'tukey' or 'hann' taper applied before transforming
+                       to suppress ringing from a spectrum cut off mid-line.
+    taper:             fraction of the grid tapered by the Tukey window.
+    subtract_baseline: remove the constant level set by the two end points
+                       (a constant has no Hilbert transform, but a padded one does).
+    """
+    y = np.asarray(y, dtype=float)
+    n = y.shape[-1]
+
+    if subtract_baseline:
+        y = y - 0.5 * (y[..., :1] + y[..., -1:])
+
+    w = _window(n, window, taper)
+    if w is not None:
+        y = y * w
+
+    n_fft = 1 << int(np.ceil(np.log2(max(pad, 1) * n)))
+    spectrum = np.fft.rfft(y, n=n_fft, axis=-1)
+
+    # -i sign(k): rfft only keeps k >= 0; DC and Nyquist carry no Hilbert part
+    spectrum *= -1j
+    spectrum[..., 0] = 0
+    spectrum[..., -1] = 0
+
+    return np.fft.irfft(spectrum, n=n_fft, axis=-1)[..., :n]
+
+
+def kk_dispersion(absorption, **kwargs):
+    """Dispersion chi' = -H[chi''] from sampled absorption (uniform grid, last axis)."""
+    return -hilbert(absorption, **kwargs)
+
+
+def dispersion_on_grid(absorption_func, x, extend=4.0, **kwargs):
+    """
+    Dispersion on the uniform grid x for a callable absorption model.
+
+    The model is sampled on a grid `extend` times wider than x (same spacing,
+    x sits in the middle as an exact slice) so the truncated line wings
+    do not bias the transform. absorption_func may broadcast, e.g. return a
+    (frames, N) stack; the result keeps the leading axes.
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    dx = (x[-1] - x[0]) / (n - 1)
+    margin = int(np.ceil(extend * n / 2))
+
+    x_wide = x[0] + dx * np.arange(-margin, n + margin)
+    dispersion = kk_dispersion(absorption_func(x_wide), **kwargs)
+    return dispersion[..., margin:margin + n]
@@ -0,0 +1,190 @@
+import numpy as np
+
+from lineshapes import faddeeva
+
+# -----------------------------------------
+# THREE-LEVEL LAMBDA SYSTEM: STEADY-STATE EIT SUSCEPTIBILITY
+# -----------------------------------------
+# Same level scheme as the scenes draw:
+#     |1> ground (probe 1-3),  |2> ground (control 2-3),  |3> excited
+# Rotating frame, hbar = 1, probe detuning D = w_p - w_31, control detuning
+# D_c, two-photon detuning d = D - D_c.
+#     gamma_31: population decay rate of |3> (the optical coherence decays at gamma_31 / 2)
+#     gamma_21: ground-state (spin) dephasing rate
+#
+# chi is returned normalised so that without control field and on resonance
+# chi = i, i.e. Im(chi) is the absorption in units of its two-level peak and
+# Re(chi) the matching dispersion. Every function broadcasts over all of its
+# arguments: detuning[None, :] against omega_c[:, None] gives a whole
+# (powers x detunings) sweep in one call.
+
+
+def _solve_2x2(m, b):
+    # Batched 2x2 linear solve (Cramer's rule) over arbitrary leading axes;
+    # far cheaper than np.linalg.solve's per-matrix LAPACK dispatch.
+    det = m[..., 0, 0] * m[..., 1, 1] - m[..., 0, 1] * m[..., 1, 0]
+    x0 = (b[..., 0] * m[..., 1, 1] - m[..., 0, 1] * b[..., 1]) / det
+    x1 = (m[..., 0, 0] * b[..., 1] - b[..., 0] * m[..., 1, 0]) / det
+    return x0, x1
+
+
+def coherence_matrices(detuning, omega_c, gamma_31=1.0, gamma_21=0.0, control_detuning=0.0):
+    """
+    Stacked weak-probe equations M @ [rho_31, rho_21] = b (per unit probe Rabi frequency).
+
+        d rho_31/dt = -(gamma_31/2 - iD) rho_31 + i/2 + (i omega_c/2) rho_21
+        d rho_21/dt = -(gamma_21 - i d) rho_21 + (i omega_c/2) rho_31
+    """
+    detuning, omega_c, gamma_31, gamma_21, control_detuning = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (detuning, omega_c, gamma_31, gamma_21, control_detuning))
+    )
+    two_photon = detuning - control_detuning
+
+    m = np.empty(detuning.shape + (2, 2), dtype=complex)
+    m[..., 0, 0] = gamma_31 / 2 - 1j * detuning
+    m[..., 0, 1] = -0.5j * omega_c
+    m[..., 1, 0] = -0.5j * omega_c
+    m[..., 1, 1] = gamma_21 - 1j * two_photon
+
+    b = np.zeros(detuning.shape + (2,), dtype=complex)
+    b[..., 0] = 0.5j
+    return m, b
+
+
+def susceptibility(detuning, omega_c, gamma_31=1.0, gamma_21=0.0, control_detuning=0.0):
+    """Weak-probe complex chi(D) of the Lambda system, normalised to the two-level peak."""
+    m, b = coherence_matrices(detuning, omega_c, gamma_31, gamma_21, control_detuning)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rho_31, _ = _solve_2x2(m, b)
+
+    # No control and no spin dephasing on two-photon resonance: |2> decouples
+    # and the system is a plain two-level absorber
+    decoupled = ~np.isfinite(rho_31)
+    if decoupled.any():
+        rho_31 = np.where(decoupled, b[..., 0] / m[..., 0, 0], rho_31)
+    return gamma_31 * rho_31
+
+
+# -----------------------------------------
+# DOPPLER (VELOCITY-CLASS) AVERAGE
+# -----------------------------------------
+# An atom whose probe Doppler shift is s sees D - s and D_c - k s (k = k_c / k_p
+# along the probe). Its rho_31 is a ratio of polynomials in s of degree <= 2,
+# so it splits into partial fractions c_j / (s - s_j), and the Maxwell-
+# Boltzmann average of each is a Faddeeva function:
+#     < 1 / (x - s) > = -i sqrt(pi / 2) / sigma * w(x / (sqrt(2) sigma))   (Im x > 0)
+# This is the continuum limit of summing velocity classes, with no class grid.
+def _gaussian_mean_inverse(x, sigma):
+    """< 1 / (x - s) > for s ~ N(0, sigma^2), either half plane."""
+    upper = x.imag >= 0
+    xu = np.where(upper, x, np.conj(x))
+    mean = -1j * np.sqrt(np.pi / 2) / sigma * faddeeva(xu / (np.sqrt(2) * sigma))
+    return np.where(upper, mean, np.conj(mean))
+
+
+def doppler_susceptibility(detuning, omega_c, doppler, gamma_31=1.0, gamma_21=0.0,
+                           control_detuning=0.0, k_ratio=1.0):
+    """
+    Weak-probe chi averaged over a thermal velocity distribution.
+
+    doppler: rms probe Doppler shift k_p v_rms (lineshapes.doppler_sigma);
+             broadcasts, e.g. doppler[:, None] for one row per temperature
+    k_ratio: k_c / k_p; 1 is co-propagating (two-photon Doppler-free), -1 counter-propagating
+    """
+    detuning, omega_c, doppler, gamma_31, gamma_21, control_detuning, k_ratio = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float)
+          for a in (detuning, omega_c, doppler, gamma_31, gamma_21, control_detuning, k_ratio))
+    )
+    # rho_31(s) = (i/2) A / (B A + omega_c^2 / 4), B = b0 + i s, A = a0 + i kappa s
+    b0 = gamma_31 / 2 - 1j * detuning
+    a0 = gamma_21 - 1j * (detuning - control_detuning)
+    kappa = 1 - k_ratio
+    coupling = omega_c**2 / 4
+    sigma = np.where(doppler > 0, doppler, 1.0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # kappa = 0: one pole, rho_31 = (1/2) / (s - s_1)
+        linear_pole = 1j * (b0 + np.where(coupling > 0, coupling / a0, 0))
+        linear = 0.5 * -_gaussian_mean_inverse(linear_pole, sigma)
+
+        # kappa != 0: denominator -kappa (s - s_1)(s - s_2)
+        half_b = 0.5j * (kappa * b0 + a0) / kappa
+        root = np.sqrt(half_b**2 + (a0 * b0 + coupling) / kappa)
+        quadratic = 0
+        for pole, other in ((half_b + root, half_b - root), (half_b - root, half_b + root)):
+            residue = 0.5j * (a0 + 1j * kappa * pole) / (-kappa * (pole - other))
+            quadratic = quadratic + residue * -_gaussian_mean_inverse(pole, sigma)
+
+    rho_31 = np.where(kappa == 0, linear, quadratic)
+    # No Doppler spread, or the decoupled two-level limit (a0 = 0): plain susceptibility
+    plain = susceptibility(detuning, omega_c, gamma_31, gamma_21, control_detuning) / gamma_31
+    rho_31 = np.where((doppler > 0) & np.isfinite(rho_31), rho_31, plain)
+    return gamma_31 * rho_31
+
+
+# -----------------------------------------
+# FULL LINDBLAD STEADY STATE (any probe strength)
+# -----------------------------------------
+def _ket_bra(i, j):
+    op = np.zeros((3, 3))
+    op[i, j] = 1.0
+    return op
+
+
+def liouvillian(detuning, omega_c, omega_p, gamma_31=1.0, gamma_21=0.0,
+                control_detuning=0.0, branching=0.5):
+    """
+    Stacked (..., 9, 9) Lindblad generators acting on row-major vec(rho).
+
+    |3> decays to |1> with rate branching * gamma_31 and to |2> with the rest;
+    gamma_21 dephases the ground-state coherence.
+    """
+    detuning, omega_c, omega_p, gamma_31, gamma_21, control_detuning = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float)
+          for a in (detuning, omega_c, omega_p, gamma_31, gamma_21, control_detuning))
+    )
+    shape = detuning.shape
+
+    # Basis order |1>, |2>, |3> -> indices 0, 1, 2
+    h = np.zeros(shape + (3, 3), dtype=complex)
+    h[..., 1, 1] = -(detuning - control_detuning)
+    h[..., 2, 2] = -detuning
+    h[..., 0, 2] = h[..., 2, 0] = -omega_p / 2
+    h[..., 1, 2] = h[..., 2, 1] = -omega_c / 2
+
+    eye = np.eye(3)
+    # vec(A rho B) = (A kron B^T) vec(rho) for row-major vec
+    lv = -1j * (np.einsum("...ij,kl->...ikjl", h, eye) - np.einsum("ij,...lk->...ikjl", eye, h))
+    lv = lv.reshape(shape + (9, 9))
+
+    def dissipator(c):
+        cdc = c.T @ c
+        return (np.kron(c, c) - 0.5 * np.kron(cdc, eye) - 0.5 * np.kron(eye, cdc.T))
+
+    lv = lv + (branching * gamma_31)[..., None, None] * dissipator(_ket_bra(0, 2))
+    lv = lv + ((1 - branching) * gamma_31)[..., None, None] * dissipator(_ket_bra(1, 2))
+    # Pure dephasing of |2> relative to |1> at rate gamma_21
+    lv = lv + (2 * gamma_21)[..., None, None] * dissipator(_ket_bra(1, 1))
+    return lv
+
+
+def steady_state(detuning, omega_c, omega_p, gamma_31=1.0, gamma_21=0.0,
+                 control_detuning=0.0, branching=0.5):
+    """Steady-state density matrices (..., 3, 3) from one batched linear solve."""
+    lv = liouvillian(detuning, omega_c, omega_p, gamma_31, gamma_21, control_detuning, branching)
+
+    # Replace the first equation by the trace condition rho_11 + rho_22 + rho_33 = 1
+    lv[..., 0, :] = 0
+    lv[..., 0, [0, 4, 8]] = 1
+    rhs = np.zeros(lv.shape[:-1], dtype=complex)
+    rhs[..., 0] = 1
+
+    rho = np.linalg.solve(lv, rhs[..., None])[..., 0]
+    return rho.reshape(lv.shape[:-2] + (3, 3))
+
+
+def susceptibility_full(detuning, omega_c, omega_p, gamma_31=1.0, gamma_21=0.0,
+                        control_detuning=0.0, branching=0.5):
+    """chi from the full steady state (includes probe saturation / optical pumping)."""
+    rho = steady_state(detuning, omega_c, omega_p, gamma_31, gamma_21, control_detuning, branching)
+    return gamma_31 * rho[..., 2, 0] / omega_p
@@ -0,0 +1,62 @@
+import numpy as np
+
+# -----------------------------------------
+# LINE-SHAPE KERNELS (Voigt profiles for the EIT and AFC modules)
+# -----------------------------------------
+# Every kernel is a plain NumPy expression, so it behaves like a ufunc:
+# pass a whole detuning grid and get the whole curve back in one call.
+# Parameters broadcast against x, e.g. a column of Doppler widths
+# sigma[:, None] against a row of detunings gives a (K, N) family of curves.
+# EIT absorption itself comes from lambda_system.py and its dispersion
+# from kramers_kronig.py, so every model gets a consistent pair.
+#
+# A Lorentzian convolved with a gaussian (Doppler or inhomogeneous spread)
+# is the real part of the Faddeeva function w(z) = exp(-z^2) erfc(-iz):
+#     V(x) ~ Re w((x - x0 + i w_L) / (sqrt(2) sigma))
+# w is evaluated with Weideman's rational expansion (SIAM J. Numer. Anal.
+# 31, 1994): one polynomial in a Moebius-mapped variable, so a whole grid
+# (or a detuning x temperature family) is a single NumPy expression.
+def _weideman_coefficients(n=32):
+    m = 2 * n
+    k = np.arange(-m + 1, m)
+    scale = np.sqrt(n / np.sqrt(2))
+    t = scale * np.tan(k * np.pi / (2 * m))
+    f = np.r_[0.0, np.exp(-t**2) * (scale**2 + t**2)]
+    a = np.real(np.fft.fft(np.fft.fftshift(f))) / (2 * m)
+    return scale, a[1:n + 1][::-1]
+
+
+_WEIDEMAN_SCALE, _WEIDEMAN_COEFFS = _weideman_coefficients()
+
+
+def faddeeva(z):
+    """Faddeeva function w(z) = exp(-z^2) erfc(-iz), relative error ~1e-13 near the real axis."""
+    z = np.asarray(z, dtype=complex)
+    # The expansion holds in the upper half plane; w(z) = 2 exp(-z^2) - w(-z) below it
+    lower = z.imag < 0
+    zu = np.where(lower, -z, z)
+    denom = _WEIDEMAN_SCALE - 1j * zu
+    p = np.polyval(_WEIDEMAN_COEFFS, (_WEIDEMAN_SCALE + 1j * zu) / denom)
+    w = 2 * p / denom**2 + 1 / (np.sqrt(np.pi) * denom)
+    if lower.any():
+        w = np.where(lower, 2 * np.exp(-z**2) - w, w)
+    return w
+
+
+def voigt(x, center, sigma, width, height=1.0):
+    """
+    Peak-normalised Voigt profile: Lorentzian of half-width `width` convolved
+    with a gaussian of rms `sigma`. sigma = 0 gives the Lorentzian exactly;
+    sigma broadcasts, e.g. a column of Doppler widths (one per temperature).
+    """
+    dx = np.asarray(x, dtype=float) - center
+    sigma = np.asarray(sigma, dtype=float)
+    scale = np.sqrt(2) * np.where(sigma > 0, sigma, 1.0)
+    profile = faddeeva((dx + 1j * width) / scale).real / faddeeva(1j * width / scale).real
+    return height * np.where(sigma > 0, profile, width**2 / (dx**2 + width**2))
+
+
+def doppler_sigma(temperature, mass, wavelength):
+    """RMS angular Doppler shift k sqrt(k_B T / m) [rad/s] for T [K], m [kg], wavelength [m]."""
+    k_b = 1.380649e-23
+    return 2 * np.pi / wavelength * np.sqrt(k_b * np.asarray(temperature, dtype=float) / mass)
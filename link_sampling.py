@@ -0,0 +1,121 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+# -----------------------------------------
+# MONTE CARLO LINK GENERATION (HERALDED ENTANGLEMENT PER SEGMENT)
+# -----------------------------------------
+# Each elementary segment of length L heralds entanglement per attempt with
+#     p = eta exp(-L / L_att)
+# Waiting times are counted in attempts (one attempt = one round trip of
+# the segment). Two protocols:
+#     memoryless: every segment must succeed in the same attempt, so the
+#                 wait is geometric with success probability prod_i p_i
+#     memory:     each segment retries on its own and stores its success;
+#                 the chain is ready after max_i of independent geometrics
+# Both are drawn straight from the geometric distribution, so 10^6 trials
+# are one batched call. Trials are split into fixed chunks, each with its
+# own stream spawned from one SeedSequence: the samples are identical
+# whether the chunks run in one process or in a pool of workers.
+
+PROTOCOLS = ("memoryless", "memory")
+
+
+def link_probability(length, attenuation_length=22.0, efficiency=1.0):
+    """Heralding probability per attempt of a segment of the given length (km)."""
+    return efficiency * np.exp(-np.asarray(length, dtype=float) / attenuation_length)
+
+
+def _check_protocol(protocol):
+    if protocol not in PROTOCOLS:
+        raise ValueError(f"Unknown protocol '{protocol}' (use {' or '.join(PROTOCOLS)})")
+
+
+def _sample_chunk(p, size, seed, protocol):
+    rng = np.random.default_rng(seed)
+    if protocol == "memoryless":
+        return rng.geometric(np.prod(p), size=size)
+    return rng.geometric(p, size=(size, len(p))).max(axis=1)
+
+
+class WaitingTimes:
+    """Sampled waiting times (in attempts) of one protocol."""
+
+    def __init__(self, samples, protocol, p):
+        self.samples = samples
+        self.protocol = protocol
+        self.p = p
+
+    @property
+    def mean(self):
+        return self.samples.mean()
+
+    def pmf(self, n_max=None):
+        """Empirical P(T = n) for n = 0 .. n_max (index 0 is always 0)."""
+        n_max = self.samples.max() if n_max is None else n_max
+        counts = np.bincount(np.minimum(self.samples, n_max + 1), minlength=n_max + 2)[: n_max + 1]
+        return counts / len(self.samples)
+
+    def exact_pmf(self, n_max):
+        """P(T = n) for n = 0 .. n_max from the closed form of the protocol."""
+        return waiting_time_pmf(self.p, n_max, self.protocol)
+
+
+def waiting_time_pmf(p, n_max, protocol="memory"):
+    """Exact P(T = n), n = 0 .. n_max: geometric, or the max of independent geometrics."""
+    _check_protocol(protocol)
+    p = np.atleast_1d(np.asarray(p, dtype=float))
+    n = np.arange(n_max + 1)
+    if protocol == "memoryless":
+        cdf = 1 - (1 - np.prod(p)) ** n
+    else:
+        cdf = np.prod(1 - np.power.outer(1 - p, n), axis=0)
+    return np.diff(cdf, prepend=0.0)
+
+
+def waiting_times(p, n_trials, protocol="memory", seed=0, chunk=1_000_000, workers=1):
+    """
+    n_trials sampled waiting times for segments with heralding probabilities p.
+
+    p:       one probability per segment (link_probability of each length)
+    chunk:   trials per spawned seed stream; fixes the result for a given seed
+    workers: >1 samples the chunks in a process pool (same samples as workers=1)
+    """
+    _check_protocol(protocol)
+    p = np.atleast_1d(np.asarray(p, dtype=float))
+    n_chunks = -(-n_trials // chunk)
+    sizes = [min(chunk, n_trials - k * chunk) for k in range(n_chunks)]
+    streams = np.random.SeedSequence(seed).spawn(n_chunks)
+
+    if workers > 1 and n_chunks > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            parts = list(pool.map(_sample_chunk, repeat(p), sizes, streams, repeat(protocol)))
+    else:
+        parts = [_sample_chunk(p, size, stream, protocol) for size, stream in zip(sizes, streams)]
+    return WaitingTimes(np.concatenate(parts), protocol, p)
+
+
+def attempt_sequence(p, protocol="memory", seed=0, max_attempts=10_000):
+    """
+    One sampled run, attempt by attempt, for animating.
+
+    memoryless: list of per-attempt tuples (success of every segment), ending
+                with the first all-True attempt
+    memory:     one list per segment of its attempts, each ending with its first success
+    """
+    _check_protocol(protocol)
+    p = np.atleast_1d(np.asarray(p, dtype=float))
+    rng = np.random.default_rng(seed)
+    heralds = rng.random((max_attempts, len(p))) < p
+
+    if protocol == "memoryless":
+        done = np.flatnonzero(heralds.all(axis=1))
+        if len(done) == 0:
+            raise RuntimeError(f"No joint success within {max_attempts} attempts")
+        return [tuple(bool(h) for h in row) for row in heralds[: done[0] + 1]]
+
+    first = np.argmax(heralds, axis=0)
+    if not heralds.any(axis=0).all():
+        raise RuntimeError(f"A segment did not succeed within {max_attempts} attempts")
+    return [[bool(h) for h in heralds[: k + 1, i]] for i, k in enumerate(first)]
@@ -0,0 +1,71 @@
+from manim import *
+import numpy as np
+
+from mutable_mobjects import BEZIER_T
+
+# -----------------------------------------
+# LIVE PLOT: a curve that is updated in place
+# -----------------------------------------
+# always_redraw(lambda: ax.plot(f)) builds a fresh ParametricFunction on
+# every frame (new object, new bezier fit, garbage). LivePlot keeps one
+# fixed sample grid and one point array: each frame the new y-values are
+# written straight into the existing bezier points, O(samples), no new
+# mobjects. Assumes a linear y-axis (the x-axis may use any scaling).
+
+
+class LivePlot(VMobject):
+    """Curve bound to `axes` whose points are rewritten each frame from func(x)."""
+
+    def __init__(self, axes, func, x_range=None, samples=200, x=None, live=True, **kwargs):
+        super().__init__(**kwargs)
+        self.axes = axes
+        self.func = func
+        if x is None:
+            x_range = x_range if x_range is not None else axes.x_range
+            x = np.linspace(x_range[0], x_range[1], samples)
+        self.x = np.asarray(x, dtype=float)
+
+        # Scratch buffers reused every frame
+        n = len(self.x)
+        self._y_points = np.zeros(4 * (n - 1))
+        self._scratch = np.zeros(n - 1)
+        self._axes_key = None
+
+        self.set_points_as_corners(np.zeros((n, 3)))
+        self.update_curve()
+        if live:
+            self.add_updater(lambda m: m.update_curve())
+
+    def _refresh_mapping(self):
+        # Screen point = base(x) + y * y_unit, cached until the axes move
+        key = np.concatenate([self.axes.c2p(0, 0), self.axes.c2p(1, 1)])
+        if self._axes_key is not None and np.array_equal(key, self._axes_key):
+            return
+        self._axes_key = key
+
+        anchors = self.axes.c2p(self.x, np.zeros_like(self.x)).T
+        self._base = np.empty((4 * (len(self.x) - 1), 3))
+        for j, t in enumerate(BEZIER_T):
+            self._base[j::4] = interpolate(anchors[:-1], anchors[1:], t)
+        self._y_unit = self.axes.c2p(0, 1) - self.axes.c2p(0, 0)
+
+    def set_y(self, y):
+        """Write new y-values (one per sample) into the existing points."""
+        self._refresh_mapping()
+        if self.points.shape != self._base.shape:
+            # Something (e.g. a Transform) re-aligned our points: start over
+            self.set_points(self._base.copy())
+
+        y = np.broadcast_to(y, self.x.shape)
+        for j, t in enumerate(BEZIER_T):
+            out = self._y_points[j::4]
+            np.multiply(y[:-1], 1 - t, out=out)
+            np.multiply(y[1:], t, out=self._scratch)
+            np.add(out, self._scratch, out=out)
+
+        np.multiply(self._y_points[:, None], self._y_unit, out=self.points)
+        np.add(self.points, self._base, out=self.points)
+        return self
+
+    def update_curve(self):
+        return self.set_y(self.func(self.x))
@@ -0,0 +1,149 @@
+import numpy as np
+
+# -----------------------------------------
+# 1D MAXWELL-BLOCH PROPAGATION (EIT STORAGE / RETRIEVAL)
+# -----------------------------------------
+# Weak probe E in a Lambda medium of length 1 (z in [0, 1]), written in the
+# retarded frame t -> t - z/c and in units of the optical coherence decay
+# (time 1/gamma, Rabi frequencies in gamma):
+#
+#     dE/dz = i sqrt(d) P
+#     dP/dt = -(1 - i Delta) P + i sqrt(d) E + i Omega(t) S
+#     dS/dt = -gamma_s S + i Omega(t) P
+#
+# P is the optical coherence, S the spin-wave (ground-state) coherence and
+# d the resonant optical depth of the amplitude (intensity OD = 2d). At
+# each instant E(z) is a cumulative integral of P, so one RK4 stage costs a
+# handful of O(N_z) array operations; space is fully vectorized and only
+# time is stepped. Dark-state polariton group velocity is Omega^2 / d.
+
+
+def smoothstep(u):
+    u = np.clip(u, 0, 1)
+    return u * u * (3 - 2 * u)
+
+
+def ramp_profile(schedule, start=1.0):
+    """
+    Piecewise control envelope in simulation time.
+
+    schedule is [(t_end, value), ...]; the envelope ramps smoothly from the
+    previous value to `value` between the previous t_end (or 0) and t_end,
+    then holds. Returns a vectorized function of t.
+    """
+    t_ends = np.array([0.0] + [t for t, _ in schedule])
+    values = np.array([start] + [v for _, v in schedule])
+
+    def envelope(t):
+        t = np.asarray(t, dtype=float)
+        k = np.clip(np.searchsorted(t_ends, t, side="right"), 1, len(t_ends) - 1)
+        u = (t - t_ends[k - 1]) / (t_ends[k] - t_ends[k - 1])
+        return values[k - 1] + (values[k] - values[k - 1]) * smoothstep(u)
+
+    return envelope
+
+
+def gaussian_pulse(t0, width):
+    """Input probe amplitude with peak 1 at t0 and rms duration `width` (in intensity)."""
+    return lambda t: np.exp(-((np.asarray(t, dtype=float) - t0) / width) ** 2 / 4)
+
+
+class PropagationResult:
+    """Snapshots of one run plus the full-resolution input/output traces."""
+
+    def __init__(self, z, t, probe, spin, t_full, probe_in, probe_out, control):
+        self.z = z
+        self.t = t                  # snapshot times
+        self.probe = probe          # (snapshots, N_z) complex E(z, t)
+        self.spin = spin            # (snapshots, N_z) complex S(z, t)
+        self.t_full = t_full
+        self.probe_in = probe_in    # E(z=0, t) at every time step
+        self.probe_out = probe_out  # E(z=1, t) at every time step
+        self.control = control      # Omega(t) at every time step
+
+    def snapshot_index(self, t):
+        """Nearest snapshot for each requested time (vectorized)."""
+        k = np.searchsorted(self.t, t)
+        k = np.clip(k, 1, len(self.t) - 1)
+        return np.where(np.abs(self.t[k - 1] - t) <= np.abs(self.t[k] - t), k - 1, k)
+
+    def efficiency(self):
+        """Retrieved energy over input energy (uniform time grid)."""
+        return np.sum(np.abs(self.probe_out) ** 2) / np.sum(np.abs(self.probe_in) ** 2)
+
+
+def propagate(control, probe_in, t_end, optical_depth=200.0, detuning=0.0,
+              spin_decay=0.0, z_cells=500, dt=0.01, save_every=1):
+    """
+    Integrate the Maxwell-Bloch equations with RK4 from t = 0 to t_end.
+
+    control, probe_in: vectorized functions of time giving Omega(t) and E(z=0, t).
+    optical_depth:     intensity optical depth 2d of the medium.
+    save_every:        keep one (E, S) snapshot every this many steps.
+    """
+    d = optical_depth / 2
+    g = np.sqrt(d)
+    z = np.linspace(0, 1, z_cells)
+    dz = z[1] - z[0]
+
+    n_steps = int(np.ceil(t_end / dt))
+    t_full = np.arange(n_steps + 1) * dt
+    omega = np.asarray(control(t_full), dtype=float) * np.ones_like(t_full)
+    e_in = np.asarray(probe_in(t_full), dtype=complex) * np.ones_like(t_full)
+    # RK4 needs the drives at half steps too
+    t_half = t_full[:-1] + dt / 2
+    omega_half = np.asarray(control(t_half), dtype=float) * np.ones_like(t_half)
+    e_in_half = np.asarray(probe_in(t_half), dtype=complex) * np.ones_like(t_half)
+
+    decay_p = 1 - 1j * detuning
+    # Explicit RK4 stays stable while dt times the fastest local rate is
+    # inside its ~2.8 stability radius
+    fastest = abs(decay_p) + spin_decay + np.abs(omega).max()
+    if dt * fastest > 2.5:
+        raise ValueError(f"dt = {dt} too large for RK4 here (need dt < {2.5 / fastest:.3g})")
+
+    state = np.zeros((2, z_cells), dtype=complex)   # rows: P, S
+    field = np.empty(z_cells, dtype=complex)
+    pair_sum = np.empty(z_cells - 1, dtype=complex)
+
+    def probe_field(p, e0):
+        # E(z) = E(0) + i sqrt(d) * trapezoidal integral of P from 0 to z
+        np.add(p[1:], p[:-1], out=pair_sum)
+        field[0] = 0
+        np.cumsum(pair_sum, out=field[1:])
+        np.multiply(field, 0.5j * g * dz, out=field)
+        np.add(field, e0, out=field)
+        return field
+
+    def rhs(y, om, e0):
+        p, s = y
+        e = probe_field(p, e0)
+        dy = np.empty_like(y)
+        dy[0] = -decay_p * p + 1j * g * e + 1j * om * s
+        dy[1] = -spin_decay * s + 1j * om * p
+        return dy
+
+    n_saved = n_steps // save_every + 1
+    probe = np.empty((n_saved, z_cells), dtype=complex)
+    spin = np.empty((n_saved, z_cells), dtype=complex)
+    e_out = np.empty(n_steps + 1, dtype=complex)
+
+    probe[0] = probe_field(state[0], e_in[0])
+    spin[0] = state[1]
+    e_out[0] = field[-1]
+
+    for n in range(n_steps):
+        k1 = rhs(state, omega[n], e_in[n])
+        k2 = rhs(state + 0.5 * dt * k1, omega_half[n], e_in_half[n])
+        k3 = rhs(state + 0.5 * dt * k2, omega_half[n], e_in_half[n])
+        k4 = rhs(state + dt * k3, omega[n + 1], e_in[n + 1])
+        state += (dt / 6) * (k1 + 2 * k2 + 2 * k3 + k4)
+
+        e_out[n + 1] = probe_field(state[0], e_in[n + 1])[-1]
+        if (n + 1) % save_every == 0:
+            i = (n + 1) // save_every
+            probe[i] = field
+            spin[i] = state[1]
+
+    t_saved = t_full[: n_saved * save_every : save_every]
+    return PropagationResult(z, t_saved, probe, spin, t_full, e_in, e_out, omega)
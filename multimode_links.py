@@ -0,0 +1,80 @@
+import numpy as np
+
+# -----------------------------------------
+# MULTIPLEXED (MULTIMODE) MEMORY CHAIN, ROUND BY ROUND
+# -----------------------------------------
+# Every segment end stores M modes (temporal modes of an AFC memory).
+# Each attempt round (one L0 / c), every empty mode of every segment
+# heralds with probability p. Which modes hold a pair is one boolean
+# array of shape (runs, segments, M), so many independent runs advance
+# together. Swaps are matched across modes: the repeaters can pair any
+# stored mode with any other (feed-forward mode mapping), so each round
+# min over segments of the stored counts end-to-end chains are swapped.
+# Without a cutoff any choice is equivalent and the lowest-index modes of
+# every segment are used (the rank test cumsum(held) <= matches picks them
+# without a sort); with one, each segment uses its oldest modes first, so
+# the pairs closest to being discarded are the ones swapped on. Each chain
+# survives its n_segments - 1 swaps with swap_probability^(n_segments - 1).
+# A mode stored for `cutoff` rounds without being used is discarded.
+# Throughput grows ~linearly with M: one round delivers about M p pairs
+# instead of at most one.
+
+
+class MultimodeRun:
+    """End-to-end pairs delivered per round of every run, plus run 0's mode history."""
+
+    def __init__(self, modes, delivered, held=None, swapped=None):
+        self.modes = modes
+        self.delivered = delivered      # (runs, rounds)
+        self.held = held                # (rounds, segments, M) run 0 after heralding, or None
+        self.swapped = swapped          # (rounds, segments, M) run 0 modes used in swaps, or None
+
+    @property
+    def throughput(self):
+        """Mean end-to-end pairs per attempt round."""
+        return self.delivered.mean()
+
+
+def simulate_multimode(modes, p, n_segments=2, rounds=1000, runs=16, cutoff=None,
+                       swap_probability=1.0, seed=0, record=False):
+    """
+    Run a chain of n_segments segments with `modes` modes per memory for `rounds` rounds.
+
+    cutoff: rounds a stored mode may wait before it is discarded (None: forever)
+    record: keep run 0's held / swapped modes every round (for animating)
+    """
+    rng = np.random.default_rng(seed)
+    shape = (runs, n_segments, modes)
+    held = np.zeros(shape, dtype=bool)
+    age = np.zeros(shape, dtype=np.int32)
+    delivered = np.zeros((runs, rounds), dtype=np.int64)
+    chain_success = swap_probability ** (n_segments - 1)
+    history = (np.zeros((rounds,) + shape[1:], dtype=bool),
+               np.zeros((rounds,) + shape[1:], dtype=bool)) if record else (None, None)
+
+    for r in range(rounds):
+        held |= rng.random(shape, dtype=np.float32) < p
+        matches = held.sum(axis=-1).min(axis=-1)
+        if cutoff is None:
+            used = held & (np.cumsum(held, axis=-1) <= matches[:, None, None])
+        else:
+            # Rank held modes oldest first (empty ones last)
+            order = np.argsort(np.where(held, -age, 1), axis=-1, kind="stable")
+            rank = np.empty_like(order)
+            np.put_along_axis(rank, order, np.arange(modes), axis=-1)
+            used = held & (rank < matches[:, None, None])
+        if record:
+            history[0][r] = held[0]
+            history[1][r] = used[0]
+        held &= ~used
+        delivered[:, r] = rng.binomial(matches, chain_success)
+
+        age = np.where(held, age + 1, 0)
+        if cutoff is not None:
+            held &= age < cutoff
+    return MultimodeRun(modes, delivered, *history)
+
+
+def multimode_throughput(modes, p, **kwargs):
+    """Mean pairs per round for each mode count in `modes` (other arguments as simulate_multimode)."""
+    return np.array([simulate_multimode(int(m), p, **kwargs).throughput for m in np.atleast_1d(modes)])
@@ -0,0 +1,122 @@
+from manim import *
+import numpy as np
+
+# -----------------------------------------
+# MUTABLE PRIMITIVES FOR PER-FRAME UPDATERS
+# -----------------------------------------
+# always_redraw(lambda: Arrow(...)) constructs a fresh mobject every frame.
+# These classes are built once; their geometry is rewritten in place from
+# a template captured at construction, so an updater only moves numbers
+# around in existing point arrays. Opacity and colour changes go through
+# the usual set_opacity / set_fill, which are already in-place.
+
+# Cubic bezier anchor / handle / handle / anchor fractions along a segment
+# (VMobject._bezier_t_values only exists from manim 0.19)
+BEZIER_T = np.linspace(0, 1, 4)
+
+
+def _rotation_xy(direction):
+    # 3x3 rotation taking +x onto `direction` (in the xy-plane of the scene)
+    c, s = direction[0], direction[1]
+    return np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
+
+
+class MutableArrow(Arrow):
+    """Arrow whose start and end can be reset every frame without rebuilding it."""
+
+    def __init__(self, start=LEFT, end=RIGHT, **kwargs):
+        super().__init__(start, end, **kwargs)
+
+        # Tip in a frame where it points along +x with unit length, tip point at origin
+        direction = normalize(self.tip.tip_point - self.tip.base)
+        rotation = _rotation_xy(direction)
+        self._tip_template = (self.tip.points - self.tip.tip_point) @ rotation / self.tip.length
+
+        self.set_start_and_end(start, end)
+
+    def set_start_and_end(self, start, end):
+        start = np.asarray(start, dtype=float)
+        end = np.asarray(end, dtype=float)
+        span = end - start
+        full_length = np.linalg.norm(span)
+        length = max(full_length - 2 * self.buff, 0)
+
+        if length < 1e-8:
+            # Degenerate arrow: collapse everything onto the start point
+            self.points[:] = start
+            self.tip.points[:] = start
+            return self
+
+        direction = span / full_length
+        tip_point = end - self.buff * direction
+        tail = start + self.buff * direction
+        tip_length = min(self.tip_length, self.max_tip_length_to_length_ratio * length)
+        tip_base = tip_point - tip_length * direction
+
+        # Shaft runs from the tail to the base of the tip
+        for j, t in enumerate(BEZIER_T):
+            self.points[j::4] = interpolate(tail, tip_base, t)
+
+        rotation = _rotation_xy(direction)
+        np.matmul(self._tip_template * tip_length, rotation.T, out=self.tip.points)
+        self.tip.points += tip_point
+
+        self.set_stroke(
+            width=min(self.initial_stroke_width, self.max_stroke_width_to_length_ratio * length),
+            family=False,
+        )
+        return self
+
+
+class MutableBar(Rectangle):
+    """Bar that grows from one edge; set_length rewrites its corner x-coordinates in place."""
+
+    def __init__(self, max_width=1.0, height=0.3, edge=LEFT, **kwargs):
+        super().__init__(width=max_width, height=height, **kwargs)
+        self.max_width = max_width
+        self.edge = np.asarray(edge, dtype=float)
+
+        # Fraction of the full length each point sits at, measured from the anchored edge
+        self._u = (self.points[:, 0] - self.get_edge_center(edge)[0]) * (-self.edge[0]) / max_width
+
+    def set_length(self, length):
+        # The anchored edge stays wherever the bar currently is (move_to/to_corner still work)
+        xs = self.points[:, 0]
+        anchor = xs.min() if self.edge[0] < 0 else xs.max()
+        np.multiply(self._u, -self.edge[0] * length, out=xs)
+        xs += anchor
+        return self
+
+    def set_fraction(self, fraction):
+        return self.set_length(self.max_width * fraction)
+
+
+class MutableDot(Dot):
+    """Dot with an in-place position setter (points are shifted, never rebuilt)."""
+
+    def set_point(self, point):
+        self.shift(np.asarray(point, dtype=float) - self.get_center())
+        return self
+
+
+class MutableDashedLine(DashedLine):
+    """Dashed line whose endpoints can be reset per frame; dashes stretch with it."""
+
+    def __init__(self, start=LEFT, end=RIGHT, **kwargs):
+        super().__init__(start, end, **kwargs)
+        start, end = self.get_start(), self.get_end()
+        span = end - start
+        length_sq = np.dot(span, span)
+
+        # Each dash point's fraction along the line, captured once
+        self._fractions = [
+            (dash.points - start) @ span / length_sq for dash in self.submobjects
+        ]
+
+    def set_start_and_end(self, start, end):
+        start = np.asarray(start, dtype=float)
+        span = np.asarray(end, dtype=float) - start
+        for dash, u in zip(self.submobjects, self._fractions):
+            np.multiply(u[:, None], span, out=dash.points)
+            dash.points += start
+        return self
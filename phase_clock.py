@@ -0,0 +1,52 @@
+from manim import *
+import numpy as np
+
+from mutable_mobjects import MutableArrow
+
+# -----------------------------------------
+# AFC PHASE CLOCK
+# -----------------------------------------
+# Clock face for a PhasorEnsemble: a handful of representative atoms as
+# arrows plus the macroscopic polarization vector (length |P|, angle arg P).
+# Phase 0 points up. The drawn subset is fixed, so a frame costs a few
+# in-place arrow rewrites plus the ensemble's one vectorized dipole sum,
+# whatever the number of atoms.
+
+
+class PhaseClock(VGroup):
+    """Representative atom phasors and the collective dipole of an ensemble."""
+
+    def __init__(self, ensemble, circle, colors=RED_B, dipole_color=YELLOW,
+                 stroke_width=3, dipole_stroke_width=6, **kwargs):
+        super().__init__(**kwargs)
+        self.ensemble = ensemble
+        self.circle = circle
+
+        n_shown = len(ensemble.shown)
+        if not isinstance(colors, (list, tuple)):
+            colors = [colors] * n_shown
+
+        center = circle.get_center()
+        self.atoms = VGroup(*(
+            MutableArrow(center, center + UP, buff=0, color=c, stroke_width=stroke_width)
+            for c in colors
+        ))
+        self.dipole = MutableArrow(
+            center, center + UP, buff=0, color=dipole_color, stroke_width=dipole_stroke_width
+        )
+        self.add(self.atoms, self.dipole)
+        self.set_time(0)
+
+    def _point(self, center, radius, angle):
+        return center + radius * np.array([np.cos(angle), np.sin(angle), 0])
+
+    def set_time(self, t):
+        center = self.circle.get_center()
+        radius = self.circle.width / 2
+
+        for arrow, phase in zip(self.atoms, self.ensemble.shown_phases(t)):
+            arrow.set_start_and_end(center, self._point(center, radius, PI / 2 + phase))
+
+        p = self.ensemble.polarization(t)
+        self.dipole.set_start_and_end(center, self._point(center, radius * abs(p), PI / 2 + np.angle(p)))
+        return self
@@ -0,0 +1,87 @@
+from manim import *
+import numpy as np
+
+# -----------------------------------------
+# PHOTON CLOUD: MANY LOSSY PHOTONS AS ONE POINT CLOUD
+# -----------------------------------------
+# 10^4-10^5 photons sent down a fiber, kept as NumPy arrays (distance
+# travelled, random loss point, launch offset, jitter) and drawn as a
+# single PMobject, so the camera rasterises one point cloud instead of
+# thousands of Dots. Each photon's loss point is drawn once from the
+# exponential distribution with mean L_att, i.e. it survives a length L
+# with probability exp(-L / L_att); a frame is then one vectorized update
+# of positions and brightness, and scrubbing the clock back and forth
+# replays exactly the same statistics. Lost photons scatter out of the
+# core and fade instead of vanishing.
+
+
+class PhotonCloud(PMobject):
+    """Photons flying from start to end (length in km), lost at random along the way."""
+
+    def __init__(self, start, end, length, attenuation_length, n_photons=20_000,
+                 launch_spread=50.0, core_width=0.06, fade_length=None,
+                 color=YELLOW, seed=0, stroke_width=2, **kwargs):
+        """
+        length, attenuation_length: fiber length and L_att (same units, e.g. km)
+        launch_spread:              photons leave over this much of the clock (pulse length)
+        core_width:                 transverse spread of surviving photons on screen
+        fade_length:                distance over which a lost photon fades (default L_att / 2)
+        """
+        super().__init__(stroke_width=stroke_width, **kwargs)
+        rng = np.random.default_rng(seed)
+        self.start = np.asarray(start, dtype=float)
+        self.end = np.asarray(end, dtype=float)
+        self.length = length
+        self.fade_length = 0.5 * attenuation_length if fade_length is None else fade_length
+
+        self.loss_at = rng.exponential(attenuation_length, n_photons)
+        self.launch = rng.uniform(0, launch_spread, n_photons)
+        self.jitter = rng.normal(scale=core_width, size=n_photons)
+        self.scatter = rng.choice([-1.0, 1.0], n_photons)
+
+        axis = self.end - self.start
+        self._unit = axis / self.length
+        self._normal = np.array([-axis[1], axis[0], 0.0]) / np.linalg.norm(axis)
+        self._rgb = np.array(color_to_rgb(color))
+
+        self.distance = np.zeros(n_photons)
+        self.brightness = np.zeros(n_photons)
+        self.alive = np.ones(n_photons, dtype=bool)
+        self.set_front(0.0)
+
+    @property
+    def n_photons(self):
+        return len(self.loss_at)
+
+    def set_front(self, front):
+        """Move every photon to where the clock `front` (distance of the earliest launch) puts it."""
+        np.clip(front - self.launch, 0, self.length, out=self.distance)
+        self.alive = self.distance < self.loss_at
+        past_loss = np.maximum(self.distance - self.loss_at, 0)
+
+        # Launched photons are full brightness; lost ones drift out and fade
+        launched = front >= self.launch
+        np.clip(1 - past_loss / self.fade_length, 0, 1, out=self.brightness)
+        self.brightness *= launched
+        offset = self.jitter + self.scatter * 0.5 * past_loss / self.fade_length
+
+        shown = self.brightness > 0
+        along = np.where(self.alive, self.distance, self.loss_at)[shown]
+        self.points = (
+            self.start
+            + np.multiply.outer(along, self._unit)
+            + np.multiply.outer(offset[shown], self._normal)
+        )
+        # The camera overwrites pixels, so fade by darkening instead of alpha
+        self.rgbas = np.empty((len(self.points), 4))
+        self.rgbas[:, :3] = np.multiply.outer(self.brightness[shown], self._rgb)
+        self.rgbas[:, 3] = 1
+        return self
+
+    def survivors(self):
+        """Photons not (yet) lost: waiting, in flight or delivered."""
+        return int(np.count_nonzero(self.alive))
+
+    def delivered(self):
+        """Photons that reached the far end."""
+        return int(np.count_nonzero(self.alive & (self.distance >= self.length)))
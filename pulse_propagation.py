@@ -0,0 +1,98 @@
+import numpy as np
+
+# -----------------------------------------
+# LINEAR PULSE PROPAGATION THROUGH A RESONANT MEDIUM (SPLIT-STEP)
+# -----------------------------------------
+# Lab frame, envelope E(z, t) = sum_w E(w) exp(-i w t) around the probe
+# carrier. A slice dz of free space multiplies E(w) by exp(i w dz / c); a
+# slice of medium adds exp(i (d / 2) dN chi(w)), chi normalised to the
+# two-level peak (as in lambda_system) and dN the slice's share of the
+# medium's column density, so the whole medium has intensity OD d:
+#     E(z + dz, w) = E(z, w) exp(i w dz / c + i (d / 2) dN(z) chi(z, w))
+# This is the split-step scheme with every step diagonal in frequency: the
+# steps commute, so all z slices follow from one cumulative sum of the
+# step exponents and a single batched FFT gives the whole z x t envelope.
+# Loss is exp(-d chi''), the group delay (d / 2) d chi' / dw (slow_light.py)
+# comes out of the phase by itself. chi may vary along z (one row per z).
+
+
+def medium_profile(z, start, end, edge=0.0):
+    """Density of a slab [start, end] with smooth (smoothstep) edges of width `edge`, peak 1."""
+    z = np.asarray(z, dtype=float)
+    if edge <= 0:
+        return ((z >= start) & (z <= end)).astype(float)
+    rise = np.clip((z - start) / edge + 0.5, 0, 1)
+    fall = np.clip((end - z) / edge + 0.5, 0, 1)
+    u = np.minimum(rise, fall)
+    return u * u * (3 - 2 * u)
+
+
+class PulseResult:
+    """Envelope of one pulse on the z x t grid, plus input/output traces."""
+
+    def __init__(self, z, t, envelope, column):
+        self.z = z
+        self.t = t
+        self.envelope = envelope    # (T, Z) complex E(z, t)
+        self.column = column        # (Z,) fraction of the medium crossed at z
+
+    def intensity(self):
+        return np.abs(self.envelope) ** 2
+
+    def transmission(self):
+        """Output over input pulse energy (flux through the last vs first z)."""
+        flux = np.sum(self.intensity()[:, [0, -1]], axis=0)
+        return flux[1] / flux[0]
+
+    def peak(self):
+        """Position and amplitude |E| of the pulse maximum at every time (parabolic refinement)."""
+        a = np.abs(self.envelope)
+        k = np.clip(np.argmax(a, axis=1), 1, len(self.z) - 2)
+        rows = np.arange(len(self.t))
+        left, mid, right = a[rows, k - 1], a[rows, k], a[rows, k + 1]
+        curvature = left - 2 * mid + right
+        with np.errstate(invalid="ignore", divide="ignore"):
+            shift = np.where(curvature < 0, 0.5 * (left - right) / curvature, 0.0)
+        shift = np.clip(shift, -0.5, 0.5)
+        dz = self.z[1] - self.z[0]
+        return self.z[k] + shift * dz, mid - 0.25 * (left - right) * shift
+
+    def arrival(self, z0):
+        """First time the pulse maximum reaches z0."""
+        position, _ = self.peak()
+        past = np.flatnonzero(position >= z0)
+        return self.t[past[0]] if len(past) else np.inf
+
+
+def propagate_pulse(chi, z, t, probe_in, optical_depth=1.0, density=None, c=1.0,
+                    carrier_detuning=0.0):
+    """
+    Envelope E(z, t) of a probe entering at z[0] with E(z[0], t) = probe_in(t).
+
+    chi:        vectorized function of detuning (the medium's susceptibility),
+                or None for vacuum; may return (Z, W) if chi changes along z
+    z, t:       uniform grids (t long enough that the delayed pulse does not wrap)
+    density:    medium density on z (e.g. medium_profile); normalised internally
+                so the whole medium has intensity optical depth `optical_depth`
+    c:          vacuum speed of light in z units per t unit
+    """
+    z = np.asarray(z, dtype=float)
+    t = np.asarray(t, dtype=float)
+    dt = t[1] - t[0]
+    omega = 2 * np.pi * np.fft.fftfreq(len(t), d=dt)
+    spectrum = np.fft.ifft(probe_in(t))
+
+    # Cumulative step exponents: vacuum delay plus the medium's share so far
+    exponent = 1j * np.multiply.outer(z - z[0], omega) / c
+    column = np.zeros_like(z)
+    if chi is not None and density is not None and optical_depth:
+        density = np.asarray(density, dtype=float)
+        steps = 0.5 * (density[1:] + density[:-1]) * np.diff(z)
+        column = np.r_[0.0, np.cumsum(steps)] / np.sum(steps)
+        susceptibility = np.broadcast_to(chi(omega + carrier_detuning), exponent.shape)
+        # Step k uses chi at its own slice: sum_{j<k} dN_j chi_j
+        slices = 0.5 * (susceptibility[1:] + susceptibility[:-1]) * np.diff(column)[:, None]
+        exponent += 0.5j * optical_depth * np.vstack([np.zeros_like(omega), np.cumsum(slices, axis=0)])
+
+    envelope = np.fft.fft(spectrum[None, :] * np.exp(exponent), axis=-1)
+    return PulseResult(z, t, envelope.T, column)
@@ -0,0 +1,80 @@
+import numpy as np
+
+from bell_diagonal import werner
+
+# -----------------------------------------
+# ENTANGLEMENT PURIFICATION ON BELL-DIAGONAL WEIGHTS
+# -----------------------------------------
+# Two pairs in, one pair out when the parity check agrees. With weights
+# (A, D, C, B) = (Phi+, Phi-, Psi+, Psi-) as in bell_diagonal:
+#     DEJMPS:  N  = (A1 + B1)(A2 + B2) + (C1 + D1)(C2 + D2)
+#              A' = (A1 A2 + B1 B2) / N     B' = (C1 D2 + D1 C2) / N
+#              C' = (C1 C2 + D1 D2) / N     D' = (A1 B2 + B1 A2) / N
+#     BBPSSW:  both inputs twirled to Werner states first, the output
+#              twirled again, so only the fidelity survives
+# N is the success probability. Schedules:
+#     symmetric: round k purifies two copies of round k - 1 (doubling);
+#                raw pairs R_k = 2 R_(k-1) / p_k
+#     pumping:   round k purifies the kept pair with one fresh raw pair;
+#                a failure loses everything, R_k = (R_(k-1) + 1) / p_k
+# Everything acts on the last axis, so a whole grid of initial states is
+# purified in one pass per round.
+
+PROTOCOLS = ("dejmps", "bbpssw")
+SCHEDULES = ("symmetric", "pumping")
+
+
+def _twirl(state):
+    return werner(state[..., 0])
+
+
+def purify(state_a, state_b, protocol="dejmps"):
+    """Output pair and success probability of one purification of two pairs."""
+    if protocol not in PROTOCOLS:
+        raise ValueError(f"Unknown protocol '{protocol}' (use {' or '.join(PROTOCOLS)})")
+    if protocol == "bbpssw":
+        state_a, state_b = _twirl(state_a), _twirl(state_b)
+
+    a1, d1, c1, b1 = np.moveaxis(state_a, -1, 0)
+    a2, d2, c2, b2 = np.moveaxis(state_b, -1, 0)
+    success = (a1 + b1) * (a2 + b2) + (c1 + d1) * (c2 + d2)
+    out = np.stack([
+        a1 * a2 + b1 * b2,
+        a1 * b2 + b1 * a2,
+        c1 * c2 + d1 * d2,
+        c1 * d2 + d1 * c2,
+    ], axis=-1) / success[..., None]
+    return (_twirl(out) if protocol == "bbpssw" else out), success
+
+
+class PurificationRounds:
+    """State, success probability and raw-pair cost after every round (round 0: the raw pair)."""
+
+    def __init__(self, states, success, raw_pairs):
+        self.states = states            # (rounds + 1, ..., 4)
+        self.success = success          # (rounds + 1, ...), 1 for round 0
+        self.raw_pairs = raw_pairs      # (rounds + 1, ...) expected raw pairs per output pair
+
+    @property
+    def fidelity(self):
+        return self.states[..., 0]
+
+    def final(self):
+        return self.states[-1]
+
+
+def purification_rounds(raw, rounds, protocol="dejmps", schedule="symmetric"):
+    """Purify raw pairs (..., 4) for `rounds` rounds and keep every intermediate result."""
+    if schedule not in SCHEDULES:
+        raise ValueError(f"Unknown schedule '{schedule}' (use {' or '.join(SCHEDULES)})")
+    raw = np.asarray(raw, dtype=float)
+    states, success, cost = [raw], [np.ones(raw.shape[:-1])], [np.ones(raw.shape[:-1])]
+
+    for _ in range(rounds):
+        partner = states[-1] if schedule == "symmetric" else raw
+        state, p = purify(states[-1], partner, protocol)
+        spent = 2 * cost[-1] if schedule == "symmetric" else cost[-1] + 1
+        states.append(state)
+        success.append(p)
+        cost.append(spent / p)
+    return PurificationRounds(np.stack(states), np.stack(success), np.stack(cost))
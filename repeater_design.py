@@ -0,0 +1,131 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+
+from bell_diagonal import BSM_SUCCESS
+from link_sampling import link_probability
+from repeater_events import FIBER_SPEED
+
+# -----------------------------------------
+# REPEATER DESIGN SPACE: RATE VS SEGMENTS, MEMORY AND MULTIPLEXING
+# -----------------------------------------
+# Nested repeater over `distance` with 2^n segments of L0 = distance / 2^n.
+# An elementary attempt lasts L0 / c and, with M multiplexed modes, heralds
+# with p = 1 - (1 - p0)^M, p0 = eta_d exp(-L0 / L_att). Direct transmission
+# (n = 0) has no memory to multiplex and stays one mode whatever M. Mean
+# times follow the usual nesting recursion:
+#     T_0 = (L0 / c) / p
+#     T_1 = (L0 / c) (3 - 2p) / (p (2 - p)) / P_1
+#     T_i = (3 / 2) T_(i-1) / P_i,   P_i = P_bsm eta_m^2 exp(-T_(i-1) / tau)
+# The first level is the exact mean of the later of two geometric links
+# (repeater_waiting has it for every level). Higher levels wait on links
+# that are no longer geometric and keep the 3/2 of the later of two
+# exponentials, exact only for small p.
+# A swap reads two memories (efficiency eta_m each) and the earlier of the
+# two links has waited T_(i-1) on average, losing exp(-T_(i-1) / tau) to
+# memory decay. The end pair is read out once more:
+#     rate = eta_m^2 / T_n     pairs per second (1 / T_0 for n = 0, no memory)
+# Everything broadcasts over a (levels, memory efficiency, coherence time,
+# modes) grid; large grids are split along the coherence-time axis across
+# a process pool.
+
+AXES = ("levels", "memory_efficiency", "coherence_time", "modes")
+
+
+class RepeaterDesigns:
+    """End-to-end rates on a grid of repeater designs, axes (levels, eta_m, tau, modes)."""
+
+    def __init__(self, distance, levels, memory_efficiency, coherence_time, modes, rate):
+        self.distance = distance
+        self.levels = levels                        # axis 0: 2^levels segments
+        self.memory_efficiency = memory_efficiency  # axis 1
+        self.coherence_time = coherence_time        # axis 2 (s)
+        self.modes = modes                          # axis 3
+        self.rate = rate                            # (levels, eta_m, tau, modes) pairs / s
+
+    def design(self, index):
+        """Parameters and rate of one design (flat or tuple index)."""
+        if np.ndim(index) == 0:
+            index = np.unravel_index(index, self.rate.shape)
+        n, e, t, m = (int(i) for i in index)
+        return {
+            "segments": 2 ** int(self.levels[n]),
+            "segment_length": self.distance / 2 ** int(self.levels[n]),
+            "memory_efficiency": self.memory_efficiency[e],
+            "coherence_time": self.coherence_time[t],
+            "modes": int(self.modes[m]) if self.levels[n] > 0 else 1,
+            "rate": self.rate[n, e, t, m],
+        }
+
+    def optimal(self, max_memory_modes=None):
+        """
+        Highest-rate design, optionally within a budget of memory modes
+        (2^(n+1) M: two memories per repeater node and one per end node;
+        direct transmission, n = 0, needs none). None if nothing fits.
+        """
+        rate = self.rate
+        if max_memory_modes is not None:
+            memories = np.where(self.levels > 0, 2 ** (self.levels + 1), 0)
+            memory_modes = np.multiply.outer(memories, self.modes)[:, None, None, :]
+            rate = np.where(memory_modes <= max_memory_modes, rate, -np.inf)
+        best = np.argmax(rate)
+        if not np.isfinite(rate.flat[best]) or rate.flat[best] <= 0:
+            return None
+        return self.design(best)
+
+    def surface(self, *axes):
+        """Best rate over every axis not named, e.g. surface("levels", "modes") for a heatmap."""
+        unknown = set(axes) - set(AXES)
+        if unknown:
+            raise ValueError(f"Unknown axis {sorted(unknown)} (use {', '.join(AXES)})")
+        drop = tuple(i for i, name in enumerate(AXES) if name not in axes)
+        return np.max(self.rate, axis=drop)
+
+
+def _rates(coherence_time, distance, levels, memory_efficiency, modes, attenuation_length,
+           detection_efficiency, bsm_success, speed):
+    n = levels[:, None, None, None]
+    eta = memory_efficiency[None, :, None, None]
+    tau = coherence_time[None, None, :, None]
+    segment = distance / 2.0 ** n
+    p0 = link_probability(segment, attenuation_length, detection_efficiency)
+    p = -np.expm1(np.where(n > 0, modes[None, None, None, :], 1) * np.log1p(-p0))
+
+    attempt = segment / speed
+    wait = np.broadcast_to(attempt / p, (len(levels), len(memory_efficiency),
+                                         len(coherence_time), len(modes))).copy()
+    with np.errstate(divide="ignore", over="ignore"):
+        for i in range(int(levels.max())):
+            swap = bsm_success * eta ** 2 * np.exp(-wait / tau)
+            later = attempt * (3 - 2 * p) / (p * (2 - p)) if i == 0 else 1.5 * wait
+            wait = np.where(i < n, later / swap, wait)
+    # Direct transmission (n = 0) never touches a memory
+    return np.where(n > 0, eta ** 2, 1.0) / wait
+
+
+def repeater_designs(distance, levels, memory_efficiency, coherence_time, modes,
+                     attenuation_length=22.0, detection_efficiency=1.0, bsm="linear_optics",
+                     speed=FIBER_SPEED, workers=1):
+    """
+    Evaluate every (levels, memory efficiency, coherence time, modes) design in one call.
+
+    distance:  end-to-end length (km); 2^levels segments
+    bsm:       swap BSM, sets the heralding probability per swap (bell_diagonal.BSM_SUCCESS)
+    workers:   >1 splits the coherence-time axis across a process pool
+    """
+    levels = np.atleast_1d(np.asarray(levels, dtype=int))
+    memory_efficiency = np.atleast_1d(np.asarray(memory_efficiency, dtype=float))
+    coherence_time = np.atleast_1d(np.asarray(coherence_time, dtype=float))
+    modes = np.atleast_1d(np.asarray(modes, dtype=int))
+    shared = (distance, levels, memory_efficiency, modes, attenuation_length,
+              detection_efficiency, BSM_SUCCESS[bsm], speed)
+
+    if workers > 1 and len(coherence_time) > 1:
+        chunks = np.array_split(coherence_time, min(workers, len(coherence_time)))
+        with ProcessPoolExecutor(workers) as pool:
+            parts = list(pool.map(_rates, chunks, *(repeat(arg) for arg in shared)))
+        rate = np.concatenate(parts, axis=2)
+    else:
+        rate = _rates(coherence_time, *shared)
+    return RepeaterDesigns(distance, levels, memory_efficiency, coherence_time, modes, rate)
@@ -0,0 +1,436 @@
+import heapq
+import math
+
+import numpy as np
+
+from link_sampling import link_probability
+
+# -----------------------------------------
+# DISCRETE-EVENT SIMULATION OF A MEMORY-ASSISTED REPEATER CHAIN
+# -----------------------------------------
+# Nodes 0 .. N, segment i between nodes i and i + 1. Every node has a left
+# and a right memory. A segment with both memories free heralds a link
+# after a geometric number of attempts, each lasting L0 / c (photons to
+# the midpoint station and the herald back), so one heap event is one
+# generated link, not one attempt. Swaps are ASAP: a node holding two
+# idle links Bell-measures them (taking swap_time, succeeding with
+# swap_probability) and the result is a link between the outer ends.
+# Classical signalling: a link is only known to both of its ends once
+# every swap outcome inside it has travelled at fiber speed to them, and
+# it is delivered when the end-to-end link is known.
+# Each memory dephases with coherence time T2, shrinking the Werner
+# parameter of a stored link as exp(-2 dt / T2); a swap multiplies the
+# Werner parameters, fidelity is (1 + 3 w) / 4. Every link carries the
+# birth time of the oldest elementary link inside it (swaps keep the
+# minimum), and it is discarded at born + `cutoff`, so no qubit waits in
+# memory longer than `cutoff` however often its link is swapped on. Stale
+# heap entries (the cutoff of a link already swapped or delivered) are
+# skipped lazily. Events at the same instant run cutoffs first, then
+# heralds, then swaps; heralds fall on a common attempt grid, so the tie
+# order is fixed rather than left to push order.
+#
+# run_batch advances many independent runs together: the heap becomes
+# per-run arrays of pending herald, swap and cutoff times, every step
+# takes each run's earliest event and applies each kind of event to all
+# runs that drew it as one array update: the same statistics at several
+# times the events per second of run() when many runs are needed.
+
+FIBER_SPEED = 2.0e5     # km/s
+_PRIORITY = {"cutoff": 0, "link": 1, "swap": 2}     # order of simultaneous events
+
+
+class _Link:
+    __slots__ = ("a", "b", "werner", "updated", "known_at", "born", "busy", "alive")
+
+    def __init__(self, a, b, werner, time, known_at, born):
+        self.a, self.b = a, b
+        self.werner = werner
+        self.updated = time
+        self.known_at = known_at
+        self.born = born
+        self.busy = False
+        self.alive = True
+
+
+class RepeaterRun:
+    """Outcome of one simulated run: deliveries, their fidelities and (optionally) the event log."""
+
+    def __init__(self, times, fidelities, duration, n_events, log):
+        # Deliveries are recorded when the end link forms, but counted when
+        # its last swap outcome arrives, which is not in formation order
+        order = np.argsort(times, kind="stable")
+        self.times = np.asarray(times, dtype=float)[order]
+        self.fidelities = np.asarray(fidelities, dtype=float)[order]
+        self.duration = duration        # simulated seconds
+        self.n_events = n_events
+        self.log = log                  # [(time, kind, a, b)] or None
+
+    @property
+    def rate(self):
+        """End-to-end links per second."""
+        return len(self.times) / self.duration if self.duration > 0 else 0.0
+
+    @property
+    def mean_fidelity(self):
+        return self.fidelities.mean() if len(self.fidelities) else np.nan
+
+
+class RepeaterChain:
+    """ASAP-swapping chain of n_segments segments of length segment_length (km)."""
+
+    def __init__(self, n_segments, segment_length, attenuation_length=22.0, efficiency=1.0,
+                 link_fidelity=1.0, coherence_time=np.inf, cutoff=np.inf,
+                 swap_probability=1.0, swap_time=0.0, speed=FIBER_SPEED):
+        """
+        coherence_time: memory T2 in seconds (inf: no dephasing)
+        cutoff:         a link is discarded once its oldest elementary link is this old (s)
+        swap_time:      duration of one Bell-state measurement (s)
+        """
+        self.n_segments = n_segments
+        self.segment_length = segment_length
+        self.p = float(link_probability(segment_length, attenuation_length, efficiency))
+        self.attempt_time = segment_length / speed
+        self.hop_time = segment_length / speed
+        self.werner = (4 * link_fidelity - 1) / 3
+        self.decay_rate = 2 / coherence_time
+        self.cutoff = cutoff
+        self.swap_probability = swap_probability
+        self.swap_time = swap_time
+
+    def run(self, n_deliveries=1000, max_time=np.inf, seed=0, log=False, block=1 << 16):
+        """Simulate until n_deliveries end-to-end links or max_time seconds."""
+        rng = np.random.default_rng(seed)
+        n = self.n_segments
+        decay_rate = self.decay_rate
+        attempts = iter(())
+        swaps = iter(())
+
+        heap = []
+        heappush, heappop = heapq.heappush, heapq.heappop
+        seq = 0
+        left = [None] * (n + 1)     # link whose right end is this node
+        right = [None] * (n + 1)    # link whose left end is this node
+        pending = [False] * n       # segment currently attempting
+        times, fidelities = [], []
+        events = [] if log else None
+        n_events = 0
+        now = 0.0
+
+        def push(time, kind, item):
+            nonlocal seq
+            heappush(heap, (time, _PRIORITY[kind], seq, kind, item))
+            seq += 1
+
+        def start_segment(i):
+            nonlocal attempts
+            if pending[i]:
+                return
+            pending[i] = True
+            k = next(attempts, None)
+            if k is None:
+                attempts = iter(rng.geometric(self.p, block).tolist())
+                k = next(attempts)
+            push(now + k * self.attempt_time, "link", i)
+
+        def decay(link):
+            link.werner *= math.exp(-decay_rate * (now - link.updated))
+            link.updated = now
+
+        def store(link):
+            left[link.b] = right[link.a] = link
+            if self.cutoff < np.inf:
+                push(max(now, link.born + self.cutoff), "cutoff", link)
+            if link.a == 0 and link.b == n:
+                deliver(link)
+            else:
+                try_swap(link.a)
+                try_swap(link.b)
+
+        def free(link):
+            link.alive = False
+            left[link.b] = right[link.a] = None
+            for node in (link.a, link.b):
+                # A segment restarts once both of its memories are empty
+                if node > 0 and right[node - 1] is None and left[node] is None:
+                    start_segment(node - 1)
+                if node < n and right[node] is None and left[node + 1] is None:
+                    start_segment(node)
+
+        def deliver(link):
+            decay(link)
+            link.werner *= math.exp(-decay_rate * (link.known_at - now))
+            times.append(link.known_at)
+            fidelities.append((1 + 3 * link.werner) / 4)
+            free(link)
+
+        def try_swap(node):
+            if node in (0, n):
+                return
+            a, b = left[node], right[node]
+            if a is None or b is None or a.busy or b.busy:
+                return
+            a.busy = b.busy = True
+            push(now + self.swap_time, "swap", (a, b))
+
+        def swap(pair):
+            nonlocal swaps
+            a, b = pair
+            outcome = next(swaps, None)
+            if outcome is None:
+                swaps = iter((rng.random(block) < self.swap_probability).tolist())
+                outcome = next(swaps)
+            decay(a)
+            decay(b)
+            # The outcome travels from the middle node to the farther outer end
+            node = a.b
+            latency = max(node - a.a, b.b - node) * self.hop_time
+            if log:
+                events.append((now, "swap" if outcome else "swap-fail", a.a, b.b))
+            a.alive = b.alive = False
+            left[node] = right[node] = None
+            right[a.a] = left[b.b] = None
+            if outcome:
+                store(_Link(a.a, b.b, a.werner * b.werner, now,
+                            max(a.known_at, b.known_at, now + latency), min(a.born, b.born)))
+            else:
+                # Both links are lost: every segment inside them is free again
+                for i in range(a.a, b.b):
+                    if right[i] is None and left[i + 1] is None:
+                        start_segment(i)
+                return
+            if node > 0 and right[node - 1] is None and left[node] is None:
+                start_segment(node - 1)
+            if right[node] is None and left[node + 1] is None:
+                start_segment(node)
+
+        for i in range(n):
+            start_segment(i)
+
+        while heap and len(times) < n_deliveries:
+            now, _, _, kind, item = heappop(heap)
+            if now > max_time:
+                now = max_time
+                break
+            n_events += 1
+            if kind == "link":
+                pending[item] = False
+                if log:
+                    events.append((now, "link", item, item + 1))
+                store(_Link(item, item + 1, self.werner, now, now, now))
+            elif kind == "swap":
+                a, b = item
+                if a.alive and b.alive:
+                    swap(item)
+            elif item.alive and not item.busy:
+                if log:
+                    events.append((now, "cutoff", item.a, item.b))
+                free(item)
+
+        duration = max(times) if len(times) >= n_deliveries else now
+        return RepeaterRun(times, fidelities, duration, n_events, events)
+
+    def run_batch(self, n_runs, n_deliveries=1000, max_time=np.inf, seed=0, log=False):
+        """
+        n_runs independent runs advanced together, one event per run per step.
+
+        Same model as run(), with the heap replaced by per-run arrays: every
+        step takes each run's earliest pending herald, swap or cutoff, and
+        applies each kind of event to all runs that drew it in one array
+        update. Simultaneous events of the same kind go by node index
+        rather than push order, which changes single runs but not the
+        statistics. Returns one RepeaterRun per run (with its own event log
+        if log=True).
+        """
+        rng = np.random.default_rng(seed)
+        n = self.n_segments
+        width = n + 1
+        inf = np.inf
+
+        # Run r, node (or segment) i lives at flat index r * width + i
+        size = n_runs * width
+        ready = np.full(size, inf)      # next herald of the segment starting here
+        swap_at = np.full(size, inf)    # pending swap at this node
+        cut_at = np.full(size, inf)     # cutoff of the link whose left end is here
+        left = np.full(size, -1)        # left end of the link ending here
+        right = np.full(size, -1)       # right end of the link starting here
+        # Attributes of each stored link, at its left end
+        werner = np.zeros(size)
+        updated = np.zeros(size)
+        known = np.zeros(size)
+        born = np.zeros(size)
+        busy = np.zeros(size, dtype=bool)
+
+        now = np.zeros(n_runs)
+        count = np.zeros(n_runs, dtype=int)
+        times = np.zeros((n_runs, n_deliveries))
+        fidelities = np.zeros((n_runs, n_deliveries))
+        n_events = np.zeros(n_runs, dtype=int)
+        events = [] if log else None
+
+        def record(runs, kind, a, b):
+            if log and len(runs):
+                events.append((runs, now[runs], np.full(len(runs), kind), a, b))
+
+        def start_segments(runs, i):
+            ok = (i >= 0) & (i < n)
+            runs = runs[ok]
+            k = runs * width + i[ok]
+            free = (right[k] < 0) & (left[k + 1] < 0) & (ready[k] == inf)
+            runs, k = runs[free], k[free]
+            ready[k] = now[runs] + rng.geometric(self.p, len(k)) * self.attempt_time
+
+        def start_all(runs, lo, hi):
+            # Every free, idle segment in [lo, hi) of the given runs
+            i = np.arange(n)
+            k = (runs * width)[:, None] + i
+            free = (
+                (i >= lo[:, None]) & (i < hi[:, None])
+                & (right[k] < 0) & (left[k + 1] < 0) & (ready[k] == inf)
+            )
+            rows, _ = np.nonzero(free)
+            k = k[free]
+            ready[k] = now[runs[rows]] + rng.geometric(self.p, len(k)) * self.attempt_time
+
+        def decayed(k, until):
+            return werner[k] * np.exp(-self.decay_rate * (until - updated[k]))
+
+        def free_link(runs, a, b):
+            base = runs * width
+            right[base + a] = left[base + b] = -1
+            cut_at[base + a] = inf
+            busy[base + a] = False
+            # Segments on both sides of both ends (b - 1 is a for an elementary link)
+            inner = b - 1 > a
+            start_segments(np.concatenate([runs, runs, runs[inner], runs]),
+                           np.concatenate([a - 1, a, b[inner] - 1, b]))
+
+        def store(runs, a, b, w, known_at, first):
+            ka = runs * width + a
+            right[ka] = b
+            left[ka - a + b] = a
+            werner[ka] = w
+            updated[ka] = now[runs]
+            known[ka] = known_at
+            born[ka] = first
+            busy[ka] = False
+            if self.cutoff < inf:
+                cut_at[ka] = np.maximum(now[runs], first + self.cutoff)
+
+            end = (a == 0) & (b == n)
+            if end.any():
+                deliver(runs[end])
+            inner = ~end
+            runs, a, b = runs[inner], a[inner], b[inner]
+            try_swap(runs, a)
+            try_swap(runs, b)
+
+        def deliver(runs):
+            k = runs * width
+            fidelities[runs, count[runs]] = (1 + 3 * decayed(k, known[k])) / 4
+            times[runs, count[runs]] = known[k]
+            count[runs] += 1
+            free_link(runs, np.zeros_like(runs), np.full_like(runs, n))
+
+        def try_swap(runs, j):
+            kj = runs * width + j
+            a = left[kj]
+            ka = kj - j + a     # garbage where a = -1, masked out below
+            ok = (j > 0) & (j < n) & (a >= 0) & (right[kj] >= 0) & ~busy[ka] & ~busy[kj]
+            ka, kj, runs = ka[ok], kj[ok], runs[ok]
+            busy[ka] = busy[kj] = True
+            cut_at[ka] = cut_at[kj] = inf
+            swap_at[kj] = now[runs] + self.swap_time
+
+        def swap(runs, j):
+            base = runs * width
+            kj = base + j
+            a, b = left[kj], right[kj]
+            ka = base + a
+            t = now[runs]
+            w = decayed(ka, t) * decayed(kj, t)
+            # The outcome travels from the middle node to the farther outer end
+            latency = np.maximum(j - a, b - j) * self.hop_time
+            known_at = np.maximum(np.maximum(known[ka], known[kj]), t + latency)
+            first = np.minimum(born[ka], born[kj])
+            success = rng.random(len(runs)) < self.swap_probability
+            record(runs[success], "swap", a[success], b[success])
+            record(runs[~success], "swap-fail", a[~success], b[~success])
+
+            left[kj] = right[kj] = right[ka] = left[base + b] = -1
+            busy[ka] = busy[kj] = False
+
+            s = success
+            store(runs[s], a[s], b[s], w[s], known_at[s], first[s])
+            start_segments(np.tile(runs[s], 2), np.concatenate([j[s] - 1, j[s]]))
+            # Failed swap: both links are lost, every segment inside them is free again
+            start_all(runs[~s], a[~s], b[~s])
+
+        runs = np.arange(n_runs)
+        start_all(runs, np.zeros(n_runs, dtype=int), np.full(n_runs, n))
+        while len(runs):
+            rows = slice(None) if len(runs) == n_runs else runs     # no copy while all are running
+            k_cut = cut_at.reshape(n_runs, width)[rows].argmin(axis=1) if self.cutoff < inf else 0 * runs
+            k_link = ready.reshape(n_runs, width)[rows].argmin(axis=1)
+            k_swap = swap_at.reshape(n_runs, width)[rows].argmin(axis=1)
+            base = runs * width
+            # Ties go to the first row: cutoff, link, swap (as _PRIORITY)
+            candidates = np.stack([cut_at[base + k_cut], ready[base + k_link], swap_at[base + k_swap]])
+            kind = candidates.argmin(axis=0)
+            t = candidates[kind, np.arange(len(runs))]
+
+            over = t > max_time
+            now[runs[over]] = max_time
+            live = ~over
+            runs, kind, t = runs[live], kind[live], t[live]
+            k_link, k_swap, k_cut = k_link[live], k_swap[live], k_cut[live]
+            now[runs] = t
+            n_events[runs] += 1
+
+            m = kind == 0
+            r, a = runs[m], k_cut[m]
+            b = right[r * width + a]
+            record(r, "cutoff", a, b)
+            free_link(r, a, b)
+
+            m = kind == 1
+            r, i = runs[m], k_link[m]
+            ready[r * width + i] = inf
+            record(r, "link", i, i + 1)
+            store(r, i, i + 1, self.werner, now[r], now[r])
+
+            m = kind == 2
+            r, j = runs[m], k_swap[m]
+            swap_at[r * width + j] = inf
+            swap(r, j)
+
+            runs = runs[count[runs] < n_deliveries]
+
+        if log:
+            run_of, when, kinds, ends_a, ends_b = (
+                [np.concatenate(column) for column in zip(*events)] if events else [np.zeros(0)] * 5
+            )
+        results = []
+        for r in range(n_runs):
+            k = count[r]
+            duration = times[r, :k].max() if k >= n_deliveries else now[r]
+            run_log = None
+            if log:
+                mine = np.flatnonzero(run_of == r)
+                mine = mine[np.argsort(when[mine], kind="stable")]
+                run_log = list(zip(when[mine].tolist(), kinds[mine].tolist(),
+                                   ends_a[mine].tolist(), ends_b[mine].tolist()))
+            results.append(RepeaterRun(times[r, :k], fidelities[r, :k], duration, int(n_events[r]), run_log))
+        return results
+
+def aggregate(runs):
+    """Mean and spread of rate and delivered fidelity over several runs."""
+    rates = np.array([run.rate for run in runs])
+    fidelities = np.concatenate([run.fidelities for run in runs])
+    return {
+        "rate": rates.mean(),
+        "rate_std": rates.std(),
+        "fidelity": fidelities.mean() if len(fidelities) else np.nan,
+        "fidelity_std": fidelities.std() if len(fidelities) else np.nan,
+        "deliveries": len(fidelities),
+        "events": sum(run.n_events for run in runs),
+    }
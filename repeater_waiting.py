@@ -0,0 +1,91 @@
+import numpy as np
+
+from link_sampling import link_probability
+
+# -----------------------------------------
+# EXACT WAITING TIMES OF 2^n-SEGMENT REPEATER CHAINS
+# -----------------------------------------
+# A chain of N = 2^n segments, each heralding per attempt with probability
+# p (q = 1 - p), swaps deterministically once its segments are ready. The
+# waiting time T counts elementary attempts:
+#     memoryless: all N in the same attempt,  P(T <= t) = 1 - (1 - p^N)^t
+#     memory:     each segment stores its success, T = max of N geometrics,
+#                 P(T <= t) = (1 - q^t)^N
+# The memory mean follows from the Markov chain on the number k of
+# segments still missing: from k, j stay missing with probability
+# C(k, j) p^(k-j) q^j, so
+#     E_k (1 - q^k) = 1 + sum_{j<k} C(k, j) p^(k-j) q^j E_j,    E_0 = 0
+# Every term is positive (no alternating binomial sum) and q^k is taken as
+# expm1(k log1p(-p)), so the recursion stays exact down to p ~ 1e-300 where
+# sampling is hopeless. One pass gives E_k for every k <= N, so all chain
+# levels n come out together. For p -> 0, E_N -> H_N / p (3 / (2p) for one
+# repeater) against 1 / p^N without memory.
+
+
+def _memory_means(p, n_segments):
+    """E_k for k = 0 .. n_segments (rows) and every p (columns)."""
+    k = np.arange(n_segments + 1)
+    log_fact = np.r_[0.0, np.cumsum(np.log(k[1:]))]
+    with np.errstate(divide="ignore", invalid="ignore"):    # p = 1: q^k = 0 for k >= 1
+        log_p, log_q = np.log(p), np.log1p(-p)
+        done = -np.expm1(np.multiply.outer(k, log_q))    # 1 - q^k
+
+    means = np.zeros((n_segments + 1, len(p)))
+    for m in range(1, n_segments + 1):
+        j = k[1:m]
+        log_weight = (
+            (log_fact[m] - log_fact[j] - log_fact[m - j])[:, None]
+            + np.multiply.outer(m - j, log_p)
+            + np.multiply.outer(j, log_q)
+        )
+        means[m] = (1 + np.sum(np.exp(log_weight) * means[1:m], axis=0)) / done[m]
+    return means
+
+
+def expected_waiting_time(p, n, memory=True):
+    """
+    Mean attempts until 2^n segments (each heralding with probability p) are all ready.
+
+    p and n broadcast against each other.
+    """
+    p, n = np.broadcast_arrays(np.asarray(p, dtype=float), np.asarray(n, dtype=int))
+    n_segments = 2 ** n
+    if not memory:
+        with np.errstate(divide="ignore", over="ignore"):
+            return np.exp(-n_segments * np.log(p))
+
+    flat_p, inverse = np.unique(p, return_inverse=True)
+    means = _memory_means(flat_p, int(n_segments.max()))
+    return means[n_segments.ravel(), inverse.ravel()].reshape(p.shape)
+
+
+def waiting_time_cdf(t, p, n, memory=True):
+    """P(T <= t) for attempts t; t, p and n broadcast against each other."""
+    t, p, n = np.broadcast_arrays(
+        np.asarray(t, dtype=float), np.asarray(p, dtype=float), np.asarray(n, dtype=int)
+    )
+    n_segments = 2.0 ** n
+    with np.errstate(divide="ignore", invalid="ignore"):    # p = 0 or 1
+        log_fail = np.log1p(-p) if memory else np.log1p(-np.exp(n_segments * np.log(p)))
+        stay = np.where(t > 0, t * log_fail, 0.0)    # log of q^t (memory) or (1 - p^N)^t
+        if memory:
+            return np.exp(n_segments * np.log1p(-np.exp(stay)))
+        return -np.expm1(stay)
+
+
+def waiting_time_pmf(p, n, t_max, memory=True):
+    """P(T = t) for t = 0 .. t_max along the last axis; p and n broadcast."""
+    t = np.arange(t_max + 1)
+    p, n = np.broadcast_arrays(np.asarray(p, dtype=float), np.asarray(n, dtype=int))
+    cdf = waiting_time_cdf(t, p[..., None], n[..., None], memory)
+    return np.diff(cdf, axis=-1, prepend=0.0)
+
+
+def effective_transmission(distance, n, memory=True, attenuation_length=22.0, efficiency=1.0):
+    """
+    1 / E[T] of a 2^n-segment chain spanning `distance`: the end-to-end success
+    probability per elementary attempt (n = 0 is direct transmission).
+    """
+    distance, n = np.broadcast_arrays(np.asarray(distance, dtype=float), np.asarray(n, dtype=int))
+    p = link_probability(distance / 2 ** n, attenuation_length, efficiency)
+    return 1 / expected_waiting_time(p, n, memory)
@@ -0,0 +1,127 @@
+import numpy as np
+
+# -----------------------------------------
+# SLOW LIGHT: GROUP INDEX, DELAY AND WINDOW BANDWIDTH
+# -----------------------------------------
+# With chi normalised to the two-level peak (as lambda_system returns it),
+# the medium's wave number is k = (w / c)(1 + chi_phys / 2) with
+# chi_phys = (alpha_0 c / w_0) chi, alpha_0 the resonant (two-level) intensity
+# absorption coefficient. Near resonance this gives
+#     n_g - 1 = (c alpha_0 / 2) d chi' / dD
+#     group delay over a length L with optical depth d = alpha_0 L:
+#     tau_g = (d / 2) d chi' / dD            (units of 1 / detuning unit)
+# The slope is taken by spectral differentiation (multiply by i k in
+# Fourier space) of the sampled dispersion, so analytic models and
+# Kramers-Kronig output are treated alike, and a whole (powers x detunings)
+# sweep is one FFT along the last axis. The transmission window width
+# exp(-d chi'') shrinks with optical depth, which is what caps the
+# delay-bandwidth product.
+
+SPEED_OF_LIGHT = 299_792_458.0
+
+
+def spectral_derivative(y, dx, pad=2):
+    """
+    d y / dx along the last axis of uniformly sampled y (FFT, i k multiplier).
+
+    The straight line through the two end points is removed first (and its
+    slope added back) so the periodic FFT sees no jump at the edges; pad
+    zero-pads to at least pad * N samples to keep the tails from wrapping.
+    """
+    y = np.asarray(y, dtype=float)
+    n = y.shape[-1]
+    ramp = (y[..., -1:] - y[..., :1]) / ((n - 1) * dx)
+    y = y - y[..., :1] - ramp * dx * np.arange(n)
+
+    n_fft = 1 << int(np.ceil(np.log2(max(pad, 1) * n)))
+    spectrum = np.fft.rfft(y, n=n_fft, axis=-1)
+    k = 2 * np.pi * np.fft.rfftfreq(n_fft, d=dx)
+    spectrum *= 1j * k
+    spectrum[..., -1] = 0     # Nyquist term has no consistent derivative
+    return np.fft.irfft(spectrum, n=n_fft, axis=-1)[..., :n] + ramp
+
+
+def _at(x, y, x0):
+    """Linear interpolation of every row of y at x0 (uniform x)."""
+    pos = (x0 - x[0]) / (x[1] - x[0])
+    i = int(np.clip(np.floor(pos), 0, len(x) - 2))
+    frac = pos - i
+    return (1 - frac) * y[..., i] + frac * y[..., i + 1]
+
+
+def _width_above(x, y, x0, level):
+    """
+    Width of the interval around x0 where y stays below `level` (per row),
+    with linear interpolation at both crossings; inf if y never reaches it.
+    """
+    i0 = int(np.argmin(np.abs(x - x0)))
+    above = y >= level[..., None]
+    dx = x[1] - x[0]
+    edges = []
+    for side, idx in ((1, np.arange(i0, len(x))), (-1, np.arange(i0, -1, -1))):
+        hit = above[..., idx]
+        j = np.argmax(hit, axis=-1)
+        found = hit.any(axis=-1) & (j > 0)
+        j = np.where(found, j, 1)
+        y_in = np.take_along_axis(y[..., idx], (j - 1)[..., None], axis=-1)[..., 0]
+        y_out = np.take_along_axis(y[..., idx], j[..., None], axis=-1)[..., 0]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            frac = np.clip((level - y_in) / (y_out - y_in), 0, 1)
+        edges.append(np.where(found, (j - 1 + frac) * dx, np.inf))
+    return edges[0] + edges[1]
+
+
+class SlowLight:
+    """Slow-light figures of merit for a stack of susceptibility curves."""
+
+    def __init__(self, slope, group_delay, window_width, transmission_width, transmission):
+        self.slope = slope                              # d chi' / dD at the window centre
+        self.group_delay = group_delay                  # (d / 2) slope
+        self.window_width = window_width                # FWHM of the absorption dip (single atom)
+        self.transmission_width = transmission_width    # FWHM of exp(-d chi'') through the medium
+        self.transmission = transmission                # exp(-d chi'') at the centre
+
+    @property
+    def delay_bandwidth(self):
+        """Group delay x transmission bandwidth: how many pulses fit in the medium."""
+        return self.group_delay * self.transmission_width
+
+    def group_index(self, absorption_coefficient, c=SPEED_OF_LIGHT):
+        """n_g = 1 + (c alpha_0 / 2) slope, slope in 1 / (angular frequency) units."""
+        return 1 + 0.5 * c * absorption_coefficient * self.slope
+
+    def group_velocity(self, absorption_coefficient, c=SPEED_OF_LIGHT):
+        return c / self.group_index(absorption_coefficient, c)
+
+    def table(self):
+        """(..., 5) array: slope, delay, window, transmission width, delay-bandwidth (for baking)."""
+        return np.stack([self.slope, self.group_delay, self.window_width,
+                         self.transmission_width, self.delay_bandwidth], axis=-1)
+
+
+def slow_light(detuning, chi, optical_depth=1.0, center=0.0, dispersion=None):
+    """
+    Slow-light figures of merit of chi (..., N) on the uniform detuning grid.
+
+    optical_depth: resonant two-level optical depth d of the medium
+    center:        detuning of the transparency window
+    dispersion:    real part to differentiate instead of chi.real (e.g. a
+                   Kramers-Kronig result with the same scaling as chi.imag)
+    """
+    detuning = np.asarray(detuning, dtype=float)
+    chi = np.asarray(chi)
+    absorption = chi.imag
+    dispersion = chi.real if dispersion is None else np.asarray(dispersion, dtype=float)
+
+    slope = _at(detuning, spectral_derivative(dispersion, detuning[1] - detuning[0]), center)
+    dip = _at(detuning, absorption, center)
+
+    # Window: dip up to half the height of the lower of the two side peaks
+    left = detuning < center
+    peaks = np.minimum(absorption[..., left].max(axis=-1), absorption[..., ~left].max(axis=-1))
+    window = _width_above(detuning, absorption, center, dip + 0.5 * (peaks - dip))
+    # Transmission falls to half its centre value where d chi'' grows by ln 2
+    transmitted = _width_above(detuning, absorption, center, dip + np.log(2) / optical_depth)
+
+    return SlowLight(slope, 0.5 * optical_depth * slope, window, transmitted,
+                     np.exp(-optical_depth * dip))
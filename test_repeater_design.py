@@ -0,0 +1,23 @@
+import numpy as np
+
+from link_sampling import link_probability
+from repeater_design import repeater_designs
+from repeater_waiting import expected_waiting_time
+
+
+def test_memory_budget_holds_for_direct_transmission():
+    designs = repeater_designs(30, levels=[0, 1, 2], memory_efficiency=[0.9],
+                               coherence_time=[1e-2], modes=[1, 10, 100, 1000])
+    # Direct transmission has no memory: extra modes must not raise its rate
+    assert np.all(designs.rate[0] == designs.rate[0, ..., :1])
+
+    # 10 memory modes only fit single-mode designs (4 M for one repeater, 8 M for three)
+    best = designs.optimal(max_memory_modes=10)
+    assert best["modes"] == 1
+    assert np.isclose(best["rate"], designs.rate[..., 0].max())
+
+
+def test_first_level_wait_is_exact():
+    designs = repeater_designs(100, [1], [1.0], [np.inf], [1], bsm="deterministic")
+    exact = 1 / (expected_waiting_time(link_probability(50, 22.0, 1.0), 1) * 50 / 2e5)
+    assert np.isclose(designs.rate.item(), exact)
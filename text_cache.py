@@ -0,0 +1,78 @@
+from collections import OrderedDict
+
+from manim import *
+
+# -----------------------------------------
+# MEMOIZED TEXT / MATHTEX FACTORY
+# -----------------------------------------
+# Building a Text (Pango) or MathTex (LaTeX) mobject is by far the most
+# expensive thing a simple updater can do. Most labels repeat the same few
+# strings, so each distinct (string, font, size, color) is built once and
+# every later request gets a cheap copy. The cache is a bounded LRU so
+# long scenes cannot grow it without limit; hits/misses show the savings.
+
+
+class TextCache:
+    """LRU cache of rendered Text/MathTex mobjects; always hands out copies (maxsize=0 disables it)."""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._store = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _fetch(self, key, build):
+        if key in self._store:
+            self._store.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+            if self.maxsize < 1:
+                # Caching disabled: nothing to store or evict
+                return build()
+            self._store[key] = build()
+            if len(self._store) > self.maxsize:
+                self._store.popitem(last=False)
+                self.evictions += 1
+        return self._store[key].copy()
+
+    def text(self, string, font="", font_size=DEFAULT_FONT_SIZE, color=WHITE, **kwargs):
+        """Cached Text(string, ...). Extra kwargs must be hashable; they join the key."""
+        key = ("text", string, font, font_size, ManimColor(color).to_hex(), tuple(sorted(kwargs.items())))
+        return self._fetch(
+            key,
+            lambda: Text(string, font=font, font_size=font_size, color=color, **kwargs),
+        )
+
+    def math_tex(self, *tex_strings, font_size=DEFAULT_FONT_SIZE, color=WHITE, **kwargs):
+        """Cached MathTex(*tex_strings, ...)."""
+        key = ("math_tex", tex_strings, font_size, ManimColor(color).to_hex(), tuple(sorted(kwargs.items())))
+        return self._fetch(
+            key,
+            lambda: MathTex(*tex_strings, font_size=font_size, color=color, **kwargs),
+        )
+
+    def clear(self):
+        self._store.clear()
+
+    def stats(self):
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._store),
+            "hit_rate": self.hits / requests if requests else 0.0,
+        }
+
+    def log_stats(self, name="Text cache"):
+        s = self.stats()
+        logger.info(
+            f"{name}: {s['hits']} hits / {s['misses']} misses "
+            f"({s['hit_rate']:.0%} hit rate, {s['evictions']} evicted, {s['size']} held)"
+        )
+
+
+# Shared default cache for all scenes
+text_cache = TextCache()